@@ -6,9 +6,120 @@
 
 import pandas as pd
 import os
+import atexit
 import glob
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime
 
+from excel_sidecar import read_sheet
+from change_journal import ChangeJournal, index_key, journal_signature, replay_journal
+from sqlite_store import SqliteStore, SqliteJournal
+from summary_stats import SummaryAggregator, compute_summary
+from id_allocator import IdAllocator
+
+# 파싱 결과 캐시 설정 (같은 파일을 매 요청마다 다시 파싱하지 않도록)
+EXCEL_CACHE_MAX_ENTRIES = int(os.environ.get("EXCEL_CACHE_MAX_ENTRIES", "16"))
+
+_excel_cache = OrderedDict()
+_excel_cache_lock = threading.Lock()
+_excel_cache_stats = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0}
+_data_versions = {}  # 카테고리별 게시된 스냅샷 버전 (새 파싱 결과가 나올 때마다 증가)
+
+# 대시보드 카테고리 병렬 로딩 설정
+DASHBOARD_PARALLELISM = int(os.environ.get("DASHBOARD_PARALLELISM", "4"))
+DASHBOARD_EXECUTOR = os.environ.get("DASHBOARD_EXECUTOR", "thread")  # thread | process
+DASHBOARD_LOAD_TIMEOUT = float(os.environ.get("DASHBOARD_LOAD_TIMEOUT", "30"))
+
+_dashboard_executors = {}
+_dashboard_executors_lock = threading.Lock()
+
+# 카테고리별 쓰기 잠금 (동시 요청이 같은 워크북을 겹쳐 쓰지 않도록)
+_write_locks = {}
+_write_locks_guard = threading.Lock()
+
+# 카테고리별 데이터 시트 이름 (읽기/쓰기 공용)
+SHEET_NAMES = {
+    'members': '회원목록',
+    'staff': 'Sheet1',
+    'hr': 'Sheet1',
+    'inventory': 'Sheet1'
+}
+
+# 카테고리별 기본키 열 / 이름 열 (수정 대상 조회용 해시 인덱스)
+KEY_COLUMNS = {
+    'members': ('회원번호', '이름'),
+    'staff': ('직원번호', '이름'),
+    'inventory': ('품목번호', '품목명')
+}
+RECORD_LABELS = {'members': '회원', 'staff': '직원', 'inventory': '품목'}
+
+# 카테고리별 필드 별칭 (채팅/요청에서 쓰는 이름 -> Excel 열 이름)
+FIELD_ALIASES = {
+    'members': {'멤버십': '멤버십타입'},
+    'staff': {},
+    'inventory': {'재고': '현재재고', '가격': '단가'}
+}
+
+# 숫자 열과 숫자로 바꿀 때 치환할 단위 표기 ("15만원" -> 150000)
+NUMERIC_FIELDS = {
+    'members': ('월회비',),
+    'staff': ('월급여', '시급'),
+    'inventory': ('현재재고', '최소재고', '최대재고', '단가')
+}
+NUMERIC_UNITS = {
+    'members': (('만원', '0000'), ('원', ''), (',', '')),
+    'staff': (('만원', '0000'), ('원', ''), (',', '')),
+    'inventory': (('개', ''), ('원', ''), (',', ''))
+}
+
+# 새 행 기본값 (입력되지 않은 열) 과 추가한 날짜를 넣을 열
+NEW_ROW_DEFAULTS = {
+    'members': {
+        '이름': '', '전화번호': '', '이메일': '', '멤버십타입': '일반', '만료일': '', '결제상태': '미완료',
+        '비상연락처': '', '특이사항': '', '나이': 0, '성별': '', '주소': '', '직업': '', '월회비': 80000
+    },
+    'staff': {
+        '이름': '', '나이': 0, '성별': '', '전화번호': '', '이메일': '', '직책': '', '부서': '',
+        '월급여': 0, '근무상태': '활성', '자격증': '', '특이사항': ''
+    },
+    # 재고 상태/총액은 수량과 단가로 계산
+    'inventory': {
+        '품목명': '', '카테고리': '', '현재재고': 0, '최소재고': 0, '최대재고': 0, '단가': 0,
+        '공급업체': '', '유통기한': '', '위치': ''
+    }
+}
+NEW_ROW_DATE_COLUMNS = {'members': '가입일', 'staff': '입사일', 'inventory': '입고일'}
+
+# 채팅에서 이름 뒤에 붙는 호칭 ("김철수님", "박회원님")
+HONORIFIC_SUFFIXES = ('회원님', '선생님', '님', '회원', '직원', '씨')
+
+# 저장소 종류: excel (워크북 + 변경 저널 파일) | sqlite (워크북을 SQLite 로 가져와 DB 에서 읽고 쓰기)
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "excel")
+SQLITE_DB_PATH = os.environ.get(
+    "SQLITE_DB_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app', 'data', 'gym.sqlite3')
+)
+_sqlite_store = SqliteStore(SQLITE_DB_PATH, KEY_COLUMNS) if STORAGE_BACKEND == 'sqlite' else None
+
+# 새 행 번호 발급기 (카테고리별 다음 번호를 파일에 기록)
+ID_SEQUENCE_PATH = os.environ.get(
+    "ID_SEQUENCE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app', 'data', 'id_sequences.json')
+)
+_id_allocator = IdAllocator(ID_SEQUENCE_PATH)
+
+# 단건 조회용 레코드 인덱스 (파싱 결과가 바뀔 때만 다시 만듦)
+_record_indexes = {}
+_record_indexes_lock = threading.Lock()
+
+# 카테고리별 변경 저널 (수정을 모아서 워크북에 저장)
+_change_journals = {}
+_change_journals_guard = threading.Lock()
+
 def get_latest_excel_file(category):
     """특정 카테고리의 가장 최신 Excel 파일 반환"""
     # 현재 스크립트의 디렉토리를 기준으로 상대 경로 설정
@@ -33,245 +144,546 @@ def get_latest_excel_file(category):
     latest_file = max(files, key=os.path.getctime)
     return latest_file
 
+def _file_signature(category, excel_file):
+    """캐시 키로 사용할 파일 식별자 (경로, 수정시각, 크기, 저널 상태 또는 SQLite 데이터 버전)"""
+    stat = os.stat(excel_file)
+    if _sqlite_store is not None:
+        return (excel_file, stat.st_mtime_ns, stat.st_size, _sqlite_store.version(category))
+    return (excel_file, stat.st_mtime_ns, stat.st_size, journal_signature(excel_file))
+
+def _cached_read(category, parser, empty_result):
+    """카테고리의 최신 Excel 파일을 파싱하되, 파일이 바뀌지 않았으면 캐시 결과 반환
+
+    캐시 항목은 버전이 붙은 불변 스냅샷이라 쓰기 잠금 없이 읽으며, 쓰기는 파일을
+    원자적으로 교체하므로 파싱 중에 반쯤 쓰인 워크북을 보는 일이 없습니다.
+    반환되는 리스트/딕셔너리는 캐시와 공유되므로 호출자는 읽기 전용으로 사용해야 합니다.
+    """
+    excel_file = get_latest_excel_file(category)
+    if not excel_file:
+        return empty_result
+
+    signature = _file_signature(category, excel_file)
+    with _excel_cache_lock:
+        entry = _excel_cache.get(category)
+        if entry is not None and entry[0] == signature:
+            _excel_cache.move_to_end(category)
+            _excel_cache_stats["hits"] += 1
+            return entry[1]
+        _excel_cache_stats["misses"] += 1
+
+    result = parser(excel_file)
+
+    with _excel_cache_lock:
+        _data_versions[category] = _data_versions.get(category, 0) + 1
+        _excel_cache[category] = (signature, result, _data_versions[category])
+        _excel_cache.move_to_end(category)
+        while len(_excel_cache) > max(EXCEL_CACHE_MAX_ENTRIES, 1):
+            _excel_cache.popitem(last=False)
+            _excel_cache_stats["evictions"] += 1
+    return result
+
+def invalidate_excel_cache(category=None):
+    """캐시 무효화 (category가 없으면 전체)"""
+    with _excel_cache_lock:
+        if category is None:
+            removed = len(_excel_cache)
+            _excel_cache.clear()
+        else:
+            removed = 1 if _excel_cache.pop(category, None) is not None else 0
+        _excel_cache_stats["invalidations"] += removed
+
+def get_data_version(category):
+    """카테고리 데이터 버전 (최신 워크북 경로/수정시각/크기 + 저널 상태 또는 SQLite 버전, 워크북이 없으면 None)
+
+    워크북이나 아직 저장되지 않은 변경분이 바뀔 때만 달라지므로 파생 결과(채팅 답변 등)의 캐시 키로 사용
+    """
+    excel_file = get_latest_excel_file(category)
+    if not excel_file:
+        return None
+    try:
+        return _file_signature(category, excel_file)
+    except FileNotFoundError:
+        return None
+
+def get_excel_cache_stats():
+    """캐시 적중/미스 통계 반환"""
+    with _excel_cache_lock:
+        stats = dict(_excel_cache_stats)
+        stats["entries"] = len(_excel_cache)
+        stats["max_entries"] = EXCEL_CACHE_MAX_ENTRIES
+        stats["versions"] = dict(_data_versions)
+    total = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / total, 4) if total else 0.0
+    return stats
+
+def get_storage_stats():
+    """저장소 종류와 (SQLite 사용 시) 카테고리별 상태"""
+    if _sqlite_store is None:
+        return {"backend": STORAGE_BACKEND}
+    return {"backend": STORAGE_BACKEND, **_sqlite_store.stats()}
+
+def get_excel_write_lock(category):
+    """카테고리 워크북 쓰기 잠금 반환 (같은 스레드에서 재진입 가능)"""
+    with _write_locks_guard:
+        lock = _write_locks.get(category)
+        if lock is None:
+            lock = _write_locks[category] = threading.RLock()
+    return lock
+
+def _serialized_write(category):
+    """읽기-수정-쓰기 구간 전체를 카테고리 쓰기 잠금으로 감싸는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_excel_write_lock(category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def _get_change_journal(category, excel_file):
+    """카테고리 변경 저널 반환 (최신 워크북이 바뀌었으면 이전 파일의 변경분부터 저장)"""
+    with _change_journals_guard:
+        journal = _change_journals.get(category)
+        if journal is not None and journal.excel_file != excel_file:
+            journal.flush()
+            journal = None
+        if journal is None and _sqlite_store is not None:
+            journal = _change_journals[category] = SqliteJournal(
+                category, excel_file, SHEET_NAMES[category], get_excel_write_lock(category),
+                _sqlite_store, functools.partial(read_sheet, excel_file, SHEET_NAMES[category]),
+                SummaryAggregator(category)
+            )
+        elif journal is None:
+            journal = _change_journals[category] = ChangeJournal(
+                category, excel_file, SHEET_NAMES[category], get_excel_write_lock(category),
+                SummaryAggregator(category)
+            )
+    return journal
+
+def _has_pending_changes(category, excel_file):
+    """워크북에 아직 반영되지 않은 변경분이 디스크(저널 파일 또는 SQLite)에 남아 있는지"""
+    if _sqlite_store is not None:
+        return _sqlite_store.has_pending(category)
+    signature = journal_signature(excel_file)
+    return bool(signature and signature[0])
+
+def flush_change_journals(category=None):
+    """저장 대기 중인 변경분을 워크북에 반영 (다운로드/미리보기/파일 교체 전에 호출)"""
+    with _change_journals_guard:
+        journals = list(_change_journals.values()) if category is None else [_change_journals.get(category)]
+    return sum(journal.flush() for journal in journals if journal is not None)
+
+# 정상 종료 시 남은 변경분 저장 (비정상 종료는 다음 시작 때 저널로 복구)
+atexit.register(flush_change_journals)
+
+def recover_change_journals():
+    """지난 실행에서 워크북에 반영되지 못한 저널이 있으면 다시 적용 후 저장 (서버 시작 시)"""
+    recovered = 0
+    for category in ('members', 'staff', 'inventory'):
+        excel_file = get_latest_excel_file(category)
+        if excel_file and _has_pending_changes(category, excel_file):
+            journal = _get_change_journal(category, excel_file)
+            journal.working_frame()
+            recovered += journal.flush()
+    return recovered
+
+def _load_sheet(category, excel_file):
+    """데이터 시트 읽기 (아직 워크북에 저장되지 않은 저널 변경분 포함)"""
+    journal = _change_journals.get(category)
+    if journal is not None and journal.excel_file == excel_file:
+        frame = journal.pending_frame()
+        if frame is not None:
+            return frame
+    
+    if _sqlite_store is not None:
+        # 워크북이 밖에서 바뀌었으면 SQLite 로 다시 가져온 뒤 DB 에서 읽음
+        return _sqlite_store.read_frame(category, excel_file, functools.partial(read_sheet, excel_file, SHEET_NAMES[category]))
+    
+    df = read_sheet(excel_file, SHEET_NAMES[category])
+    if _has_pending_changes(category, excel_file):
+        # 다른 프로세스(대시보드 프로세스 풀 등)에서도 디스크 저널로 같은 결과를 보도록
+        df = replay_journal(excel_file, df)
+    return df
+
+def _strip_honorific(name):
+    """이름 뒤 호칭 제거"""
+    for suffix in HONORIFIC_SUFFIXES:
+        if name.endswith(suffix) and len(name) > len(suffix):
+            return name[:-len(suffix)].strip()
+    return name
+
+def _resolve_row(journal, category, key):
+    """번호("3", "3번") 또는 이름으로 수정할 행 찾기 -> (행 라벨, 오류 메시지)"""
+    id_column, name_column = KEY_COLUMNS[category]
+    label = RECORD_LABELS[category]
+    text = str(key).strip()
+    
+    number = text[:-1] if text.endswith('번') else text
+    if number.isdigit():
+        rows = journal.lookup(id_column, int(number))
+        if rows:
+            return rows[0], None
+    
+    rows = journal.lookup(name_column, text) or journal.lookup(name_column, _strip_honorific(text))
+    if not rows:
+        return None, f"{key} {label}을 찾을 수 없습니다."
+    if len(rows) > 1:
+        # 동명이인은 임의로 모두 바꾸지 않고 번호로 다시 지정하도록 안내
+        ids = ', '.join(str(index_key(journal.frame.at[row, id_column])) for row in rows)
+        return None, f"'{text}' 이름의 {label}이 {len(rows)}건 있습니다 ({id_column}: {ids}). {id_column}로 지정해주세요."
+    return rows[0], None
+
+def _row_key(journal, category, row):
+    """저널 기록용 행 키 (동명이인이 있어도 재적용 결과가 같도록 기본키 우선)"""
+    id_column, name_column = KEY_COLUMNS[category]
+    key = journal.frame.at[row, id_column]
+    if pd.isna(key):
+        return name_column, journal.frame.at[row, name_column]
+    return id_column, index_key(key)
+
+def _record_change(journal, category, row, changes):
+    """행 하나의 변경을 저널에 기록"""
+    key_column, key = _row_key(journal, category, row)
+    journal.record(key_column, key, changes)
+
+def _normalize_change(category, columns, field, value):
+    """필드 이름/값 정규화 -> (Excel 열, 값, 오류 메시지)"""
+    excel_field = FIELD_ALIASES[category].get(field, field)
+    if excel_field not in columns:
+        return None, None, f"'{field}' 필드를 찾을 수 없습니다."
+    
+    if excel_field in NUMERIC_FIELDS[category]:
+        try:
+            # 15만원, 150000원, 1,000개 등 다양한 형태 처리
+            if isinstance(value, str):
+                for unit, replacement in NUMERIC_UNITS[category]:
+                    value = value.replace(unit, replacement)
+            value = int(value)
+        except (TypeError, ValueError):
+            return None, None, f"{field}는 숫자로 입력해주세요."
+    return excel_field, value, None
+
+def _derived_changes(category, current, changes):
+    """변경에 따라 함께 바뀌는 열 (재고 상태, 총액). current(열)은 변경 전 값"""
+    derived = {}
+    if category != 'inventory':
+        return derived
+    
+    # 재고 상태 자동 업데이트 (현재재고가 변경된 경우)
+    if '현재재고' in changes:
+        stock = changes['현재재고']
+        min_stock = changes.get('최소재고', current('최소재고'))
+        if stock <= 0:
+            derived['상태'] = '품절'
+        elif stock <= min_stock:
+            derived['상태'] = '부족'
+        else:
+            derived['상태'] = '정상'
+    
+    # 총액 재계산 (재고나 단가가 변경된 경우)
+    if '현재재고' in changes or '단가' in changes:
+        derived['총액'] = changes.get('현재재고', current('현재재고')) * changes.get('단가', current('단가'))
+    
+    # 요청에서 직접 지정한 값이 우선
+    return {column: value for column, value in derived.items() if column not in changes}
+
+def _str_values(df, column):
+    """열 전체를 str()로 변환 (기존 iterrows 방식과 동일하게 빈 값은 'nan')"""
+    return list(map(str, df[column].tolist()))
+
+def _int_values(df, column):
+    """열 전체를 int로 변환 (빈 값은 0)"""
+    return df[column].fillna(0).astype('int64').tolist()
+
+def _float_values(df, column):
+    """열 전체를 float로 변환 (빈 값은 0)"""
+    values = df[column].astype('float64')
+    return values.astype(object).where(values.notna(), 0).tolist()
+
+def _build_records(columns):
+    """{키: 값 리스트} 형태의 열 데이터를 레코드(dict) 리스트로 한 번에 변환"""
+    keys = list(columns.keys())
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
 def read_members_data():
     """회원 관리 Excel 데이터 읽기"""
     try:
-        excel_file = get_latest_excel_file('members')
-        if not excel_file:
-            return [], {}
-        
-        print(f"📖 회원 데이터 읽는 중: {excel_file}")
-        
-        # 회원 목록 읽기
-        members_df = pd.read_excel(excel_file, sheet_name='회원목록')
-        
-        members_list = []
-        for _, row in members_df.iterrows():
-            member = {
-                "id": int(row['회원번호']),
-                "name": str(row['이름']),
-                "phone": str(row['전화번호']),
-                "email": str(row['이메일']),
-                "membership_type": str(row['멤버십타입']),
-                "start_date": str(row['가입일']),
-                "end_date": str(row['만료일']),
-                "payment_status": "paid" if row['결제상태'] == "완료" else "unpaid",
-                "emergency_contact": str(row['비상연락처']),
-                "medical_notes": str(row['특이사항']),
-                "age": int(row['나이']) if str(row['나이']) != 'nan' else 0,
-                "gender": str(row['성별']),
-                "address": str(row['주소']),
-                "occupation": str(row['직업']),
-                "monthly_fee": int(row['월회비']) if str(row['월회비']) != 'nan' else 0
-            }
-            members_list.append(member)
-        
-        # 통계 계산
-        total_count = len(members_list)
-        premium_count = len([m for m in members_list if m['membership_type'] == '프리미엄'])
-        regular_count = len([m for m in members_list if m['membership_type'] == '일반'])
-        vip_count = len([m for m in members_list if m['membership_type'] == 'VIP'])
-        male_count = len([m for m in members_list if m['gender'] == '남'])
-        female_count = len([m for m in members_list if m['gender'] == '여'])
-        paid_count = len([m for m in members_list if m['payment_status'] == 'paid'])
-        total_revenue = sum([m['monthly_fee'] for m in members_list])
-        
-        summary = {
-            "총회원수": total_count,
-            "활성회원": paid_count,
-            "프리미엄": premium_count,
-            "일반": regular_count,
-            "VIP": vip_count,
-            "남성": male_count,
-            "여성": female_count,
-            "총월매출": total_revenue
-        }
-        
-        return members_list, summary
-        
+        return _cached_read('members', _parse_members_file, ([], {}))
     except Exception as e:
         print(f"❌ 회원 데이터 읽기 오류: {e}")
         return [], {}
 
+def _parse_members_file(excel_file):
+    """회원 관리 Excel 파일 파싱"""
+    print(f"📖 회원 데이터 읽는 중: {excel_file}")
+    
+    # 회원 목록 읽기
+    members_df = _load_sheet('members', excel_file)
+    
+    # 열 단위로 한 번에 타입 변환 후 레코드 생성
+    payment_status = ['paid' if paid else 'unpaid' for paid in (members_df['결제상태'] == "완료").tolist()]
+    monthly_fees = _int_values(members_df, '월회비')
+    members_list = _build_records({
+        "id": _int_values(members_df, '회원번호'),
+        "name": _str_values(members_df, '이름'),
+        "phone": _str_values(members_df, '전화번호'),
+        "email": _str_values(members_df, '이메일'),
+        "membership_type": _str_values(members_df, '멤버십타입'),
+        "start_date": _str_values(members_df, '가입일'),
+        "end_date": _str_values(members_df, '만료일'),
+        "payment_status": payment_status,
+        "emergency_contact": _str_values(members_df, '비상연락처'),
+        "medical_notes": _str_values(members_df, '특이사항'),
+        "age": _int_values(members_df, '나이'),
+        "gender": _str_values(members_df, '성별'),
+        "address": _str_values(members_df, '주소'),
+        "occupation": _str_values(members_df, '직업'),
+        "monthly_fee": monthly_fees
+    })
+    
+    # 통계 계산 (열 단위 집계, 이후 수정은 변경 저널에서 증감으로 갱신)
+    summary = compute_summary('members', members_df)
+    
+    return members_list, summary
+
 def read_staff_data():
     """직원 관리 Excel 데이터 읽기"""
     try:
-        excel_file = get_latest_excel_file('staff')
-        if not excel_file:
-            return [], {}
-        
-        print(f"📖 직원 데이터 읽는 중: {excel_file}")
-        
-        staff_df = pd.read_excel(excel_file, sheet_name='Sheet1')
-        
-        staff_list = []
-        for _, row in staff_df.iterrows():
-            staff = {
-                "id": int(row['직원번호']),
-                "name": str(row['이름']),
-                "age": int(row['나이']) if str(row['나이']) != 'nan' else 0,
-                "gender": str(row['성별']),
-                "phone": str(row['전화번호']),
-                "email": str(row['이메일']),
-                "position": str(row['직책']),
-                "department": str(row['부서']),
-                "hire_date": str(row['입사일']),
-                "status": str(row['근무상태']),
-                "certification": str(row['자격증']),
-                "notes": str(row['특이사항']),
-                "monthly_salary": int(row['월급여']) if str(row['월급여']) != 'nan' else 0
-            }
-            staff_list.append(staff)
-        
-        # 직원 통계 계산
-        total_staff = len(staff_list)
-        trainer_count = len([s for s in staff_list if s['position'] == '트레이너'])
-        manager_count = len([s for s in staff_list if s['position'] == '매니저'])
-        cleaner_count = len([s for s in staff_list if s['position'] == '청소원'])
-        instructor_count = len([s for s in staff_list if s['position'] == '수영강사'])
-        active_count = len([s for s in staff_list if s['status'] == '활성'])
-        total_payroll = sum([s['monthly_salary'] for s in staff_list])
-        
-        summary = {
-            "총직원수": total_staff,
-            "트레이너": trainer_count,
-            "매니저": manager_count,
-            "청소원": cleaner_count,
-            "수영강사": instructor_count,
-            "활성직원": active_count,
-            "총인건비": total_payroll
-        }
-        
-        return staff_list, summary
-        
+        return _cached_read('staff', _parse_staff_file, ([], {}))
     except Exception as e:
         print(f"❌ 직원 데이터 읽기 오류: {e}")
         return [], {}
 
+def _parse_staff_file(excel_file):
+    """직원 관리 Excel 파일 파싱"""
+    print(f"📖 직원 데이터 읽는 중: {excel_file}")
+    
+    staff_df = _load_sheet('staff', excel_file)
+    monthly_salaries = _int_values(staff_df, '월급여')
+    
+    staff_list = _build_records({
+        "id": _int_values(staff_df, '직원번호'),
+        "name": _str_values(staff_df, '이름'),
+        "age": _int_values(staff_df, '나이'),
+        "gender": _str_values(staff_df, '성별'),
+        "phone": _str_values(staff_df, '전화번호'),
+        "email": _str_values(staff_df, '이메일'),
+        "position": _str_values(staff_df, '직책'),
+        "department": _str_values(staff_df, '부서'),
+        "hire_date": _str_values(staff_df, '입사일'),
+        "status": _str_values(staff_df, '근무상태'),
+        "certification": _str_values(staff_df, '자격증'),
+        "notes": _str_values(staff_df, '특이사항'),
+        "monthly_salary": monthly_salaries
+    })
+    
+    # 직원 통계 계산
+    summary = compute_summary('staff', staff_df)
+    
+    return staff_list, summary
+
 def read_hr_data():
     """인사 관리 Excel 데이터 읽기"""
     try:
-        excel_file = get_latest_excel_file('hr')
-        if not excel_file:
-            return {}, {}
-        
-        print(f"📖 인사 데이터 읽는 중: {excel_file}")
-        
-        # 인사 관리 데이터 (Sheet1에서 읽기)
-        hr_df = pd.read_excel(excel_file, sheet_name='Sheet1')
-        
-        hr_list = []
-        for _, row in hr_df.iterrows():
-            hr_record = {
-                "employee_id": int(row['직원번호']),
-                "name": str(row['이름']),
-                "department": str(row['부서']),
-                "used_vacation": int(row['연차사용']) if str(row['연차사용']) != 'nan' else 0,
-                "total_vacation": int(row['총연차']) if str(row['총연차']) != 'nan' else 0,
-                "remaining_vacation": int(row['잔여연차']) if str(row['잔여연차']) != 'nan' else 0,
-                "monthly_hours": int(row['월근무시간']) if str(row['월근무시간']) != 'nan' else 0,
-                "overtime_hours": int(row['초과근무']) if str(row['초과근무']) != 'nan' else 0,
-                "night_hours": int(row['야간근무']) if str(row['야간근무']) != 'nan' else 0,
-                "evaluation_score": float(row['평가점수']) if str(row['평가점수']) != 'nan' else 0,
-                "rewards_penalties": str(row['상벌내역']),
-                "training_completed": str(row['교육이수'])
-            }
-            hr_list.append(hr_record)
-        
-        # 인사 통계
-        total_employees = len(hr_list)
-        total_used_vacation = sum([h['used_vacation'] for h in hr_list])
-        total_overtime = sum([h['overtime_hours'] for h in hr_list])
-        avg_evaluation = sum([h['evaluation_score'] for h in hr_list]) / total_employees if total_employees > 0 else 0
-        
-        summary = {
-            "총직원수": total_employees,
-            "총사용연차": total_used_vacation,
-            "총초과근무": total_overtime,
-            "평균평가점수": round(avg_evaluation, 2),
-            "연차완전사용자": len([h for h in hr_list if h['remaining_vacation'] == 0]),
-            "교육완료자": len([h for h in hr_list if h['training_completed'] != ''])
-        }
-        
-        hr_data = {
-            "hr_records": hr_list
-        }
-        
-        return hr_data, summary
-        
+        return _cached_read('hr', _parse_hr_file, ({}, {}))
     except Exception as e:
         print(f"❌ 인사 데이터 읽기 오류: {e}")
         return {}, {}
 
+def _parse_hr_file(excel_file):
+    """인사 관리 Excel 파일 파싱"""
+    print(f"📖 인사 데이터 읽는 중: {excel_file}")
+    
+    # 인사 관리 데이터 (Sheet1에서 읽기)
+    hr_df = _load_sheet('hr', excel_file)
+    used_vacations = _int_values(hr_df, '연차사용')
+    remaining_vacations = _int_values(hr_df, '잔여연차')
+    overtime_hours = _int_values(hr_df, '초과근무')
+    evaluation_scores = _float_values(hr_df, '평가점수')
+    training_completed = _str_values(hr_df, '교육이수')
+    
+    hr_list = _build_records({
+        "employee_id": _int_values(hr_df, '직원번호'),
+        "name": _str_values(hr_df, '이름'),
+        "department": _str_values(hr_df, '부서'),
+        "used_vacation": used_vacations,
+        "total_vacation": _int_values(hr_df, '총연차'),
+        "remaining_vacation": remaining_vacations,
+        "monthly_hours": _int_values(hr_df, '월근무시간'),
+        "overtime_hours": overtime_hours,
+        "night_hours": _int_values(hr_df, '야간근무'),
+        "evaluation_score": evaluation_scores,
+        "rewards_penalties": _str_values(hr_df, '상벌내역'),
+        "training_completed": training_completed
+    })
+    
+    # 인사 통계
+    summary = compute_summary('hr', hr_df)
+    
+    hr_data = {
+        "hr_records": hr_list
+    }
+    
+    return hr_data, summary
+
 def read_inventory_data():
     """재고 관리 Excel 데이터 읽기"""
     try:
-        excel_file = get_latest_excel_file('inventory')
-        if not excel_file:
-            return [], {}, []
-        
-        print(f"📖 재고 데이터 읽는 중: {excel_file}")
-        
-        inventory_df = pd.read_excel(excel_file, sheet_name='Sheet1')
-        
-        inventory_list = []
-        for _, row in inventory_df.iterrows():
-            # 총액 계산 (단가 * 현재재고)
-            unit_price = int(row['단가']) if str(row['단가']) != 'nan' else 0
-            current_stock = int(row['현재재고']) if str(row['현재재고']) != 'nan' else 0
-            total_value = unit_price * current_stock
-            
-            item = {
-                "id": int(row['품목번호']),
-                "item_name": str(row['품목명']),
-                "category": str(row['카테고리']),
-                "current_stock": current_stock,
-                "min_stock_level": int(row['최소재고']) if str(row['최소재고']) != 'nan' else 0,
-                "max_stock_level": int(row['최대재고']) if str(row['최대재고']) != 'nan' else 0,
-                "unit_price": unit_price,
-                "total_value": total_value,
-                "supplier": str(row['공급업체']),
-                "location": str(row['위치']),
-                "received_date": str(row['입고일']),
-                "expiry_date": str(row['유통기한']),
-                "status": str(row['상태']),
-                "is_active": True
-            }
-            inventory_list.append(item)
-        
-        # 재고 통계
-        total_items = len(inventory_list)
-        normal_items = len([i for i in inventory_list if i['status'] == '정상'])
-        low_stock_items = len([i for i in inventory_list if i['status'] == '부족'])
-        critical_items = len([i for i in inventory_list if i['status'] == '긴급부족'])
-        total_value = sum([i['total_value'] for i in inventory_list])
-        
-        # 부족 재고 아이템들 따로 추출
-        low_stock_list = [i for i in inventory_list if i['status'] in ['부족', '긴급부족']]
-        
-        summary = {
-            "총품목수": total_items,
-            "정상재고": normal_items,
-            "부족재고": low_stock_items,
-            "긴급부족": critical_items,
-            "총재고가치": total_value,
-            "부족품목수": len(low_stock_list)
-        }
-        
-        return inventory_list, summary, low_stock_list
-        
+        return _cached_read('inventory', _parse_inventory_file, ([], {}, []))
     except Exception as e:
         print(f"❌ 재고 데이터 읽기 오류: {e}")
         return [], {}, []
 
-def get_all_dashboard_data():
+def _parse_inventory_file(excel_file):
+    """재고 관리 Excel 파일 파싱"""
+    print(f"📖 재고 데이터 읽는 중: {excel_file}")
+    
+    inventory_df = _load_sheet('inventory', excel_file)
+    
+    # 총액 계산 (단가 * 현재재고)
+    unit_prices = _int_values(inventory_df, '단가')
+    current_stocks = _int_values(inventory_df, '현재재고')
+    total_values = [price * stock for price, stock in zip(unit_prices, current_stocks)]
+    statuses = _str_values(inventory_df, '상태')
+    
+    inventory_list = _build_records({
+        "id": _int_values(inventory_df, '품목번호'),
+        "item_name": _str_values(inventory_df, '품목명'),
+        "category": _str_values(inventory_df, '카테고리'),
+        "current_stock": current_stocks,
+        "min_stock_level": _int_values(inventory_df, '최소재고'),
+        "max_stock_level": _int_values(inventory_df, '최대재고'),
+        "unit_price": unit_prices,
+        "total_value": total_values,
+        "supplier": _str_values(inventory_df, '공급업체'),
+        "location": _str_values(inventory_df, '위치'),
+        "received_date": _str_values(inventory_df, '입고일'),
+        "expiry_date": _str_values(inventory_df, '유통기한'),
+        "status": statuses,
+        "is_active": [True] * len(inventory_df)
+    })
+    
+    # 부족 재고 아이템들 따로 추출
+    low_stock_list = [item for item, status in zip(inventory_list, statuses) if status in ('부족', '긴급부족')]
+    
+    # 재고 통계
+    summary = compute_summary('inventory', inventory_df)
+    
+    return inventory_list, summary, low_stock_list
+
+# 대시보드 카테고리별 로더와 실패 시 기본값
+_DASHBOARD_LOADERS = {
+    'members': (read_members_data, ([], {})),
+    'staff': (read_staff_data, ([], {})),
+    'hr': (read_hr_data, ({}, {})),
+    'inventory': (read_inventory_data, ([], {}, []))
+}
+
+# 단건 조회 API용 (카테고리 -> 목록 읽기 함수)
+_RECORD_READERS = {
+    'members': read_members_data,
+    'staff': read_staff_data,
+    'inventory': read_inventory_data
+}
+
+def get_record_by_id(category, record_id):
+    """번호로 레코드 한 건 조회 (없으면 None)"""
+    records = _RECORD_READERS[category]()[0]
+    with _record_indexes_lock:
+        entry = _record_indexes.get(category)
+        if entry is None or entry[0] is not records:
+            by_id = {}
+            for record in records:
+                by_id.setdefault(index_key(record.get('id')), record)
+            entry = _record_indexes[category] = (records, by_id)
+    return entry[1].get(index_key(record_id))
+
+def _journal_summary(category):
+    """수정 중인 시트의 증감으로 유지한 요약 통계 (없으면 None)"""
+    journal = _change_journals.get(category)
+    if journal is not None and journal.excel_file == get_latest_excel_file(category):
+        return journal.summary()
+    return None
+
+def get_category_summary(category):
+    """카테고리 요약 통계 (수정 중인 시트가 있으면 증감으로 유지한 값, 없으면 캐시된 파싱 결과)"""
+    summary = _journal_summary(category)
+    if summary is not None:
+        return summary
+    return _DASHBOARD_LOADERS[category][0]()[1]
+
+def _dashboard_summary(member_stats, staff_stats, inventory_stats):
+    """대시보드 상단 요약 숫자"""
+    return {
+        "총회원수": member_stats.get("총회원수", 0),
+        "총직원수": staff_stats.get("총직원수", 0),
+        "총품목수": inventory_stats.get("총품목수", 0),
+        "부족재고": inventory_stats.get("부족품목수", 0),
+        "월매출": member_stats.get("총월매출", 0),
+        "인건비": staff_stats.get("총인건비", 0)
+    }
+
+def get_dashboard_summary():
+    """대시보드 요약 숫자와 카테고리별 통계만 (전체 목록을 다시 만들지 않음)"""
+    stats = {category: get_category_summary(category) for category in _DASHBOARD_LOADERS}
+    return {
+        "summary": _dashboard_summary(stats['members'], stats['staff'], stats['inventory']),
+        "stats": stats
+    }
+
+def _get_dashboard_executor(kind, parallelism):
+    """대시보드 로딩용 실행기 (프로세스 풀은 워커마다 자체 캐시를 유지)"""
+    key = (kind, parallelism)
+    with _dashboard_executors_lock:
+        executor = _dashboard_executors.get(key)
+        if executor is None:
+            if kind == 'process':
+                executor = ProcessPoolExecutor(max_workers=parallelism)
+            else:
+                executor = ThreadPoolExecutor(max_workers=parallelism, thread_name_prefix='dashboard')
+            _dashboard_executors[key] = executor
+    return executor
+
+def _load_dashboard_categories(parallelism=None, executor_kind=None, timeout=None):
+    """네 카테고리를 동시에 읽음 (느리거나 실패한 카테고리는 기본값으로 대체)"""
+    parallelism = DASHBOARD_PARALLELISM if parallelism is None else parallelism
+    executor_kind = executor_kind or DASHBOARD_EXECUTOR
+    timeout = DASHBOARD_LOAD_TIMEOUT if timeout is None else timeout
+    
+    if parallelism <= 1:
+        return {category: loader() for category, (loader, _) in _DASHBOARD_LOADERS.items()}
+    
+    executor = _get_dashboard_executor(executor_kind, parallelism)
+    futures = {category: executor.submit(loader) for category, (loader, _) in _DASHBOARD_LOADERS.items()}
+    
+    results = {}
+    for category, future in futures.items():
+        default = _DASHBOARD_LOADERS[category][1]
+        try:
+            results[category] = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            print(f"⚠️ 대시보드 {category} 데이터 로딩 시간 초과 ({timeout}초)")
+            results[category] = default
+        except Exception as e:
+            print(f"❌ 대시보드 {category} 데이터 로딩 오류: {e}")
+            results[category] = default
+    return results
+
+def get_all_dashboard_data(parallelism=None):
     """대시보드용 전체 데이터 통합"""
     try:
-        # 모든 데이터 읽기
-        members, member_stats = read_members_data()
-        staff, staff_stats = read_staff_data()
-        hr_data, hr_stats = read_hr_data()
-        inventory, inventory_stats, low_stock = read_inventory_data()
+        # 모든 데이터 읽기 (카테고리별 병렬)
+        results = _load_dashboard_categories(parallelism)
+        members, member_stats = results['members']
+        staff, staff_stats = results['staff']
+        hr_data, hr_stats = results['hr']
+        inventory, inventory_stats, low_stock = results['inventory']
+        
+        # 통계/요약 숫자는 /dashboard/summary 와 같게 요약 통계 집계기 값을 우선 사용
+        member_stats = _journal_summary('members') or member_stats
+        staff_stats = _journal_summary('staff') or staff_stats
+        hr_stats = _journal_summary('hr') or hr_stats
+        inventory_stats = _journal_summary('inventory') or inventory_stats
         
         # 통합 대시보드 데이터
         dashboard_data = {
@@ -295,14 +707,7 @@ def get_all_dashboard_data():
                 "low_stock": low_stock,
                 "count": len(inventory)
             },
-            "summary": {
-                "총회원수": member_stats.get("총회원수", 0),
-                "총직원수": staff_stats.get("총직원수", 0),
-                "총품목수": inventory_stats.get("총품목수", 0),
-                "부족재고": inventory_stats.get("부족품목수", 0),
-                "월매출": member_stats.get("총월매출", 0),
-                "인건비": staff_stats.get("총인건비", 0)
-            }
+            "summary": _dashboard_summary(member_stats, staff_stats, inventory_stats)
         }
         
         return dashboard_data
@@ -311,6 +716,7 @@ def get_all_dashboard_data():
         print(f"❌ 대시보드 데이터 통합 오류: {e}")
         return {}
 
+@_serialized_write('members')
 def update_member_data(member_name, field, new_value):
     """회원 데이터 수정"""
     try:
@@ -320,48 +726,23 @@ def update_member_data(member_name, field, new_value):
         
         print(f"📝 회원 데이터 수정 중: {member_name}의 {field}를 {new_value}로 변경")
         
-        # Excel 파일 읽기
-        df = pd.read_excel(excel_file, sheet_name='회원목록')
-        
-        # 해당 회원 찾기
-        member_row = df[df['이름'] == member_name]
-        if member_row.empty:
-            return False, f"{member_name} 회원을 찾을 수 없습니다."
-        
-        # 필드명 매핑
-        field_mapping = {
-            '월회비': '월회비',
-            '전화번호': '전화번호',
-            '이메일': '이메일',
-            '멤버십': '멤버십타입',
-            '멤버십타입': '멤버십타입',
-            '주소': '주소',
-            '직업': '직업',
-            '결제상태': '결제상태',
-            '특이사항': '특이사항',
-            '비상연락처': '비상연락처'
-        }
-        
-        excel_field = field_mapping.get(field, field)
-        if excel_field not in df.columns:
-            return False, f"'{field}' 필드를 찾을 수 없습니다."
+        # 작업용 시트 (워크북 + 아직 저장되지 않은 변경분)
+        journal = _get_change_journal('members', excel_file)
+        df = journal.working_frame()
         
-        # 데이터 타입 변환
-        if excel_field == '월회비':
-            try:
-                # 15만원, 150000원, 150000 등 다양한 형태 처리
-                if isinstance(new_value, str):
-                    new_value = new_value.replace('만원', '0000').replace('원', '').replace(',', '')
-                new_value = int(new_value)
-            except:
-                return False, "월회비는 숫자로 입력해주세요."
+        # 해당 회원 찾기 (회원번호/이름 해시 인덱스)
+        row, error = _resolve_row(journal, 'members', member_name)
+        if error:
+            return False, error
+        member_name = df.at[row, '이름']
         
-        # 데이터 수정
-        df.loc[df['이름'] == member_name, excel_field] = new_value
+        # 필드명/값 정규화
+        excel_field, new_value, error = _normalize_change('members', df.columns, field, new_value)
+        if error:
+            return False, error
         
-        # Excel 파일 저장
-        with pd.ExcelWriter(excel_file, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
-            df.to_excel(writer, sheet_name='회원목록', index=False)
+        # 데이터 수정 (저널에 기록, 워크북 저장은 모아서 한 번에)
+        _record_change(journal, 'members', row, {excel_field: new_value})
         
         print(f"✅ {member_name} 회원의 {field} 수정 완료: {new_value}")
         return True, f"{member_name} 회원의 {field}가 {new_value}로 수정되었습니다."
@@ -370,6 +751,7 @@ def update_member_data(member_name, field, new_value):
         print(f"❌ 회원 데이터 수정 오류: {e}")
         return False, f"데이터 수정 중 오류가 발생했습니다: {str(e)}"
 
+@_serialized_write('staff')
 def update_staff_data(staff_name, field, new_value):
     """직원 데이터 수정"""
     try:
@@ -379,45 +761,23 @@ def update_staff_data(staff_name, field, new_value):
         
         print(f"📝 직원 데이터 수정 중: {staff_name}의 {field}를 {new_value}로 변경")
         
-        # Excel 파일 읽기
-        df = pd.read_excel(excel_file, sheet_name='직원목록')
-        
-        # 해당 직원 찾기
-        staff_row = df[df['이름'] == staff_name]
-        if staff_row.empty:
-            return False, f"{staff_name} 직원을 찾을 수 없습니다."
-        
-        # 필드명 매핑
-        field_mapping = {
-            '월급여': '월급여',
-            '시급': '시급',
-            '전화번호': '전화번호',
-            '이메일': '이메일',
-            '직책': '직책',
-            '부서': '부서',
-            '근무상태': '근무상태',
-            '담당구역': '담당구역'
-        }
-        
-        excel_field = field_mapping.get(field, field)
-        if excel_field not in df.columns:
-            return False, f"'{field}' 필드를 찾을 수 없습니다."
+        # 작업용 시트 (워크북 + 아직 저장되지 않은 변경분)
+        journal = _get_change_journal('staff', excel_file)
+        df = journal.working_frame()
         
-        # 데이터 타입 변환
-        if excel_field in ['월급여', '시급']:
-            try:
-                if isinstance(new_value, str):
-                    new_value = new_value.replace('만원', '0000').replace('원', '').replace(',', '')
-                new_value = int(new_value)
-            except:
-                return False, f"{field}는 숫자로 입력해주세요."
+        # 해당 직원 찾기 (직원번호/이름 해시 인덱스)
+        row, error = _resolve_row(journal, 'staff', staff_name)
+        if error:
+            return False, error
+        staff_name = df.at[row, '이름']
         
-        # 데이터 수정
-        df.loc[df['이름'] == staff_name, excel_field] = new_value
+        # 필드명/값 정규화
+        excel_field, new_value, error = _normalize_change('staff', df.columns, field, new_value)
+        if error:
+            return False, error
         
-        # Excel 파일 저장
-        with pd.ExcelWriter(excel_file, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
-            df.to_excel(writer, sheet_name='직원목록', index=False)
+        # 데이터 수정 (저널에 기록, 워크북 저장은 모아서 한 번에)
+        _record_change(journal, 'staff', row, {excel_field: new_value})
         
         print(f"✅ {staff_name} 직원의 {field} 수정 완료: {new_value}")
         return True, f"{staff_name} 직원의 {field}가 {new_value}로 수정되었습니다."
@@ -426,6 +786,7 @@ def update_staff_data(staff_name, field, new_value):
         print(f"❌ 직원 데이터 수정 오류: {e}")
         return False, f"데이터 수정 중 오류가 발생했습니다: {str(e)}"
 
+@_serialized_write('inventory')
 def update_inventory_data(item_name, field, new_value):
     """재고 데이터 수정"""
     try:
@@ -435,62 +796,27 @@ def update_inventory_data(item_name, field, new_value):
         
         print(f"📝 재고 데이터 수정 중: {item_name}의 {field}를 {new_value}로 변경")
         
-        # Excel 파일 읽기
-        df = pd.read_excel(excel_file, sheet_name='재고목록')
-        
-        # 해당 품목 찾기
-        item_row = df[df['품목명'] == item_name]
-        if item_row.empty:
-            return False, f"{item_name} 품목을 찾을 수 없습니다."
-        
-        # 필드명 매핑
-        field_mapping = {
-            '현재재고': '현재재고',
-            '재고': '현재재고',
-            '최소재고': '최소재고',
-            '최대재고': '최대재고',
-            '단가': '단가',
-            '가격': '단가',
-            '공급업체': '공급업체',
-            '위치': '위치',
-            '상태': '상태'
-        }
+        # 작업용 시트 (워크북 + 아직 저장되지 않은 변경분)
+        journal = _get_change_journal('inventory', excel_file)
+        df = journal.working_frame()
         
-        excel_field = field_mapping.get(field, field)
-        if excel_field not in df.columns:
-            return False, f"'{field}' 필드를 찾을 수 없습니다."
-        
-        # 데이터 타입 변환
-        if excel_field in ['현재재고', '최소재고', '최대재고', '단가']:
-            try:
-                if isinstance(new_value, str):
-                    new_value = new_value.replace('개', '').replace('원', '').replace(',', '')
-                new_value = int(new_value)
-            except:
-                return False, f"{field}는 숫자로 입력해주세요."
-        
-        # 데이터 수정
-        df.loc[df['품목명'] == item_name, excel_field] = new_value
-        
-        # 재고 상태 자동 업데이트 (현재재고가 변경된 경우)
-        if excel_field == '현재재고':
-            min_stock = df.loc[df['품목명'] == item_name, '최소재고'].iloc[0]
-            if new_value <= 0:
-                df.loc[df['품목명'] == item_name, '상태'] = '품절'
-            elif new_value <= min_stock:
-                df.loc[df['품목명'] == item_name, '상태'] = '부족'
-            else:
-                df.loc[df['품목명'] == item_name, '상태'] = '정상'
+        # 해당 품목 찾기 (품목번호/품목명 해시 인덱스)
+        row, error = _resolve_row(journal, 'inventory', item_name)
+        if error:
+            return False, error
+        item_name = df.at[row, '품목명']
+        
+        # 필드명/값 정규화
+        excel_field, new_value, error = _normalize_change('inventory', df.columns, field, new_value)
+        if error:
+            return False, error
         
-        # 총액 재계산 (재고나 단가가 변경된 경우)
-        if excel_field in ['현재재고', '단가']:
-            current_stock = df.loc[df['품목명'] == item_name, '현재재고'].iloc[0]
-            unit_price = df.loc[df['품목명'] == item_name, '단가'].iloc[0]
-            df.loc[df['품목명'] == item_name, '총액'] = current_stock * unit_price
+        # 데이터 수정 (재고 상태/총액 같은 파생 값까지 함께 기록해야 저널 재적용 결과가 같음)
+        changes = {excel_field: new_value}
+        changes.update(_derived_changes('inventory', lambda column: df.at[row, column], changes))
         
-        # Excel 파일 저장
-        with pd.ExcelWriter(excel_file, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
-            df.to_excel(writer, sheet_name='재고목록', index=False)
+        # 저널에 기록, 워크북 저장은 모아서 한 번에
+        _record_change(journal, 'inventory', row, changes)
         
         print(f"✅ {item_name} 품목의 {field} 수정 완료: {new_value}")
         return True, f"{item_name} 품목의 {field}가 {new_value}로 수정되었습니다."
@@ -499,54 +825,197 @@ def update_inventory_data(item_name, field, new_value):
         print(f"❌ 재고 데이터 수정 오류: {e}")
         return False, f"데이터 수정 중 오류가 발생했습니다: {str(e)}"
 
-def add_new_member(member_data):
-    """새 회원 추가"""
+def _new_row(category, fields):
+    """새 행의 열 값 (입력되지 않은 열은 기본값, 등록일은 오늘). 번호 열은 저널 항목 키로 들어감"""
+    row = dict(NEW_ROW_DEFAULTS[category])
+    row[NEW_ROW_DATE_COLUMNS[category]] = pd.Timestamp.now().strftime('%Y-%m-%d')
+    row.update(fields)
+    row.update(_derived_changes(category, lambda column: 0, row))
+    return row
+
+def _allocate_ids(journal, category, count, reserved=()):
+    """새 행 번호 발급 (시트나 같은 요청에 이미 있는 번호는 건너뜀)"""
+    id_column = KEY_COLUMNS[category][0]
+    
+    def initial():
+        # 발급 기록이 없을 때 한 번만 기존 최댓값 계산
+        ids = [index_key(value) for value in journal.frame[id_column].dropna().tolist()]
+        return max([value for value in ids if isinstance(value, int)], default=0) + 1
+    
+    return _id_allocator.allocate(
+        category, count,
+        taken=lambda value: value in reserved or bool(journal.lookup(id_column, value)),
+        initial=initial
+    )
+
+def _normalize_fields(category, columns, fields):
+    """{필드: 값} 전체 정규화 -> ({Excel 열: 값}, 오류 메시지 목록)"""
+    changes, errors = {}, []
+    for field, value in fields.items():
+        excel_field, value, error = _normalize_change(category, columns, field, value)
+        if error:
+            errors.append(error)
+        else:
+            changes[excel_field] = value
+    return changes, errors
+
+def apply_bulk_changes(category, operations, partial=False):
+    """여러 행의 수정/추가를 한 번의 로드-수정-저장으로 처리
+
+    operations 항목 형식:
+      {"op": "patch", "key": 번호 또는 이름, "changes": {필드: 값}}
+      {"op": "upsert", "row": {열: 값}}  (기본키 열 값으로 기존 행을 찾아 수정, 없으면 추가)
+    전체를 먼저 검증하고, 하나라도 실패하면 partial=True 가 아닌 이상 아무것도 반영하지 않음
+    반환: {"success", "applied", "results": [행별 결과]}
+    """
+    if category not in KEY_COLUMNS:
+        raise ValueError(f"지원하지 않는 카테고리: {category}")
+    
+    excel_file = get_latest_excel_file(category)
+    if not excel_file:
+        return {"success": False, "applied": 0, "results": [], "error": f"{RECORD_LABELS[category]} Excel 파일을 찾을 수 없습니다."}
+    
+    id_column, name_column = KEY_COLUMNS[category]
+    
+    with get_excel_write_lock(category):
+        journal = _get_change_journal(category, excel_file)
+        df = journal.working_frame()
+        
+        staged = {}  # 행 라벨 -> 이번 요청에서 앞서 바뀐 값 (파생 값 계산용)
+        new_ids = set()
+        auto_ids = []  # 번호를 발급받을 새 행 (items 위치, 결과)
+        items, results = [], []
+        
+        for index, operation in enumerate(operations):
+            result = {"index": index}
+            results.append(result)
+            op = operation.get('op', 'patch') if isinstance(operation, dict) else None
+            
+            if op == 'patch':
+                fields = operation.get('changes')
+                if not isinstance(fields, dict) or not fields:
+                    result.update(status="error", error="changes 가 비어 있습니다.")
+                    continue
+                row, error = _resolve_row(journal, category, operation.get('key', ''))
+                if error:
+                    result.update(status="error", error=error)
+                    continue
+                changes, errors = _normalize_fields(category, df.columns, fields)
+                insert = False
+            
+            elif op == 'upsert':
+                fields = operation.get('row')
+                if not isinstance(fields, dict) or not fields:
+                    result.update(status="error", error="row 가 비어 있습니다.")
+                    continue
+                changes, errors = _normalize_fields(category, df.columns, fields)
+                key = index_key(changes.pop(id_column, None))
+                rows = journal.lookup(id_column, key) if key is not None else []
+                insert = not rows
+                row = rows[0] if rows else None
+                
+                if insert and not errors:
+                    if not changes.get(name_column):
+                        errors.append(f"새 행에는 '{name_column}' 값이 필요합니다.")
+                    elif key is not None and key in new_ids:
+                        errors.append(f"같은 {id_column}({key})가 요청 안에 중복되었습니다.")
+                    else:
+                        if key is not None:
+                            new_ids.add(key)
+                        changes = _new_row(category, changes)
+            else:
+                result.update(status="error", error="op 는 'patch' 또는 'upsert' 여야 합니다.")
+                continue
+            
+            if errors:
+                result.update(status="error", error=" ".join(errors))
+                continue
+            
+            if insert:
+                if key is None:
+                    auto_ids.append((len(items), result))
+                items.append((id_column, key, changes, True))
+                result.update(status="inserted", id=key)
+            else:
+                previous = staged.setdefault(row, {})
+                changes.update(_derived_changes(category, lambda column: previous.get(column, df.at[row, column]), changes))
+                previous.update(changes)
+                key_column, row_key = _row_key(journal, category, row)
+                items.append((key_column, row_key, changes, False))
+                result.update(status="updated", id=index_key(df.at[row, id_column]))
+        
+        failed = sum(1 for result in results if result["status"] == "error")
+        if failed and not partial:
+            return {"success": False, "applied": 0, "failed": failed, "results": results}
+        
+        if auto_ids:
+            # 번호는 검증을 통과한 뒤에 한 번에 발급 (실패한 요청이 번호를 소모하지 않도록)
+            for (position, result), new_id in zip(auto_ids, _allocate_ids(journal, category, len(auto_ids), new_ids)):
+                items[position] = (id_column, new_id) + items[position][2:]
+                result["id"] = new_id
+        
+        if items:
+            # 한 번의 저널 기록 후 바로 워크북 저장 (수백 건이어도 파일 쓰기는 한 번)
+            journal.record_batch(items)
+            journal.flush()
+        
+        print(f"📦 {category} 일괄 처리: {len(items)}건 반영, {failed}건 실패")
+        return {"success": True, "applied": len(items), "failed": failed, "results": results}
+
+def add_new_record(category, fields):
+    """새 행 추가 -> (성공 여부, 메시지, 새 번호)
+
+    번호는 번호 발급기에서 받고(시트 전체 최댓값 계산 없음), 행은 변경 저널에 insert 항목으로
+    기록해서 메모리 시트와 워크북 끝에 덧붙임 (기존 행은 다시 읽거나 다시 쓰지 않음)
+    """
+    if category not in KEY_COLUMNS:
+        raise ValueError(f"지원하지 않는 카테고리: {category}")
+    id_column, name_column = KEY_COLUMNS[category]
+    label = RECORD_LABELS[category]
+    
     try:
-        excel_file = get_latest_excel_file('members')
+        excel_file = get_latest_excel_file(category)
         if not excel_file:
-            return False, "회원 Excel 파일을 찾을 수 없습니다."
+            return False, f"{label} Excel 파일을 찾을 수 없습니다.", None
         
-        print(f"📝 새 회원 추가 중: {member_data.get('이름', 'Unknown')}")
-        
-        # Excel 파일 읽기
-        df = pd.read_excel(excel_file, sheet_name='회원목록')
-        
-        # 새 회원번호 생성 (기존 최대값 + 1)
-        max_id = df['회원번호'].max() if not df.empty else 0
-        new_id = max_id + 1
-        
-        # 기본값 설정
-        new_member = {
-            '회원번호': new_id,
-            '이름': member_data.get('이름', ''),
-            '전화번호': member_data.get('전화번호', ''),
-            '이메일': member_data.get('이메일', ''),
-            '멤버십타입': member_data.get('멤버십타입', '일반'),
-            '가입일': member_data.get('가입일', pd.Timestamp.now().strftime('%Y-%m-%d')),
-            '만료일': member_data.get('만료일', ''),
-            '결제상태': member_data.get('결제상태', '미완료'),
-            '비상연락처': member_data.get('비상연락처', ''),
-            '특이사항': member_data.get('특이사항', ''),
-            '나이': member_data.get('나이', 0),
-            '성별': member_data.get('성별', ''),
-            '주소': member_data.get('주소', ''),
-            '직업': member_data.get('직업', ''),
-            '월회비': member_data.get('월회비', 80000)
-        }
-        
-        # 새 행 추가
-        df = pd.concat([df, pd.DataFrame([new_member])], ignore_index=True)
+        print(f"📝 새 {label} 추가 중: {fields.get(name_column, 'Unknown')}")
         
-        # Excel 파일 저장
-        with pd.ExcelWriter(excel_file, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
-            df.to_excel(writer, sheet_name='회원목록', index=False)
+        with get_excel_write_lock(category):
+            journal = _get_change_journal(category, excel_file)
+            df = journal.working_frame()
+            
+            # 필드명/값 정규화 (번호는 발급기에서 받으므로 입력값 무시)
+            changes, errors = _normalize_fields(category, set(df.columns) | set(NEW_ROW_DEFAULTS[category]) | {NEW_ROW_DATE_COLUMNS[category]}, fields)
+            if errors:
+                return False, " ".join(errors), None
+            changes.pop(id_column, None)
+            if not changes.get(name_column):
+                return False, f"새 {label}에는 '{name_column}' 값이 필요합니다.", None
+            
+            new_id = _allocate_ids(journal, category, 1)[0]
+            journal.record(id_column, new_id, _new_row(category, changes), insert=True)
         
-        print(f"✅ 새 회원 추가 완료: {member_data.get('이름')} (회원번호: {new_id})")
-        return True, f"{member_data.get('이름')} 회원이 성공적으로 추가되었습니다. (회원번호: {new_id})"
+        print(f"✅ 새 {label} 추가 완료: {changes[name_column]} ({id_column}: {new_id})")
+        return True, f"{changes[name_column]} {label}이 성공적으로 추가되었습니다. ({id_column}: {new_id})", new_id
         
     except Exception as e:
-        print(f"❌ 새 회원 추가 오류: {e}")
-        return False, f"회원 추가 중 오류가 발생했습니다: {str(e)}"
+        print(f"❌ 새 {label} 추가 오류: {e}")
+        return False, f"{label} 추가 중 오류가 발생했습니다: {str(e)}", None
+
+def add_new_member(member_data):
+    """새 회원 추가"""
+    success, message, _ = add_new_record('members', member_data)
+    return success, message
+
+def add_new_staff(staff_data):
+    """새 직원 추가"""
+    success, message, _ = add_new_record('staff', staff_data)
+    return success, message
+
+def add_new_item(item_data):
+    """새 재고 품목 추가"""
+    success, message, _ = add_new_record('inventory', item_data)
+    return success, message
 
 if __name__ == "__main__":
     print("🏋️ 통합 Excel 데이터 리더 테스트")
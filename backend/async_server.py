@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+asyncio 기반 서버 진입점
+basic_server.APIHandler 로직을 그대로 재사용하면서, OpenAI 호출은 await 하고
+Excel 파싱/파일 I/O 는 executor 스레드로 넘겨 이벤트 루프를 막지 않음
+"""
+
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import openai
+
+from basic_server import APIHandler, CHAT_RESPONSE_CACHE, CHAT_ROUTES, CHAT_STREAM_ROUTES, EXCEL_AVAILABLE, OPENAI_API_KEY, OPENAI_AVAILABLE, UPLOAD_ROUTE_PATTERN, _sse_event, prepare_data_store
+
+# 블로킹 작업(Excel 파싱, 파일 I/O)을 처리할 스레드 수
+ASYNC_EXECUTOR_WORKERS = int(os.environ.get("ASYNC_EXECUTOR_WORKERS", "8"))
+# 요청 헤더/본문 최대 크기 (스트리밍 업로드는 basic_server.UPLOAD_MAX_BYTES 로 따로 제한)
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = int(os.environ.get("MAX_REQUEST_BODY_BYTES", str(64 * 1024 * 1024)))
+
+# 비동기 OpenAI 클라이언트 초기화
+try:
+    async_openai_client = openai.AsyncOpenAI(api_key=OPENAI_API_KEY)
+    ASYNC_OPENAI_AVAILABLE = OPENAI_AVAILABLE
+except Exception as e:
+    print(f"⚠️  비동기 OpenAI 클라이언트 초기화 실패: {e}")
+    async_openai_client = None
+    ASYNC_OPENAI_AVAILABLE = False
+
+class BufferedAPIHandler(APIHandler):
+    """소켓 대신 메모리 버퍼로 요청을 읽고 응답을 쓰는 APIHandler"""
+    
+    def __init__(self, raw_request, client_address):
+        # BaseRequestHandler.__init__ 은 바로 소켓 처리를 시작하므로 호출하지 않음
+        self.request = None
+        self.server = None
+        self.client_address = client_address
+        self.rfile = BytesIO(raw_request)
+        self.wfile = BytesIO()
+        self.close_connection = True
+        self.file_body = None  # 다운로드 본문 (파일, 시작 위치, 길이): 응답 헤더를 보낸 뒤 이벤트 루프가 전송
+    
+    def parse(self):
+        """요청 줄/헤더 파싱 (실패하면 오류 응답이 이미 wfile에 기록됨)"""
+        self.raw_requestline = self.rfile.readline(65537)
+        return self.parse_request()
+    
+    def dispatch(self):
+        """기존 do_GET/do_POST 흐름을 그대로 실행하고 응답 바이트 반환"""
+        method = getattr(self, 'do_' + self.command, None)
+        if method is None:
+            self.send_error(501, f"Unsupported method ({self.command!r})")
+        else:
+            method()
+        return self.response_bytes()
+    
+    def response_bytes(self):
+        """지금까지 기록된 HTTP 응답 바이트"""
+        self.wfile.flush()
+        return self.wfile.getvalue()
+    
+    def _send_file_body(self, f, offset, count):
+        """파일 내용은 버퍼에 쓰지 않고 남겨 둠 (핸들러가 파일을 닫아도 쓸 수 있게 fd 를 복제)"""
+        self.file_body = (os.fdopen(os.dup(f.fileno()), 'rb'), offset, count)
+
+class BlockingStreamReader:
+    """executor 스레드에서 asyncio StreamReader 를 일반 파일처럼 읽기 위한 래퍼 (스트리밍 업로드용)"""
+    
+    def __init__(self, reader, loop):
+        self.reader = reader
+        self.loop = loop
+    
+    def read(self, size=-1):
+        return asyncio.run_coroutine_threadsafe(self.reader.read(size), self.loop).result()
+
+async def _get_openai_response_async(handler, user_message, agent_type, context_data, use_cache=True, data_version=None):
+    """OpenAI 응답을 이벤트 루프를 막지 않고 기다림 (같은 질문/데이터 버전의 답변은 캐시에서)"""
+    cache_key = CHAT_RESPONSE_CACHE.key(agent_type, user_message, data_version)
+    cached = CHAT_RESPONSE_CACHE.get(cache_key, bypass=not use_cache)
+    if cached is not None:
+        print(f"⚡ {agent_type} 캐시된 응답 사용")
+        return cached
+    
+    try:
+        response = await async_openai_client.chat.completions.create(
+            **handler._build_openai_request(user_message, agent_type, context_data)
+        )
+        CHAT_RESPONSE_CACHE.put(cache_key, response.choices[0].message.content)
+        return response.choices[0].message.content
+    except Exception as e:
+        print(f"❌ OpenAI API 호출 오류: {e}")
+        return f"죄송합니다. AI 응답을 생성하는 중 오류가 발생했습니다. 다시 시도해 주세요. (오류: {str(e)})"
+
+async def _stream_openai_response_async(handler, user_message, agent_type, context_data, use_cache=True, data_version=None):
+    """OpenAI 응답을 도착하는 조각(토큰) 단위로 비동기 생성 (오류가 나면 안내 문구를 마지막 조각으로)"""
+    cache_key = CHAT_RESPONSE_CACHE.key(agent_type, user_message, data_version)
+    cached = CHAT_RESPONSE_CACHE.get(cache_key, bypass=not use_cache)
+    if cached is not None:
+        print(f"⚡ {agent_type} 캐시된 응답 사용")
+        yield cached
+        return
+    
+    stream = None
+    try:
+        stream = await async_openai_client.chat.completions.create(
+            **handler._build_openai_request(user_message, agent_type, context_data),
+            stream=True
+        )
+        parts = []
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                yield delta
+        CHAT_RESPONSE_CACHE.put(cache_key, ''.join(parts))
+    except Exception as e:
+        print(f"❌ OpenAI 스트리밍 호출 오류: {e}")
+        yield f"죄송합니다. AI 응답을 생성하는 중 오류가 발생했습니다. 다시 시도해 주세요. (오류: {str(e)})"
+    finally:
+        if stream is not None:
+            await stream.close()
+
+async def _handle_chat(handler, agent_type, body, executor):
+    """채팅 요청 처리 (APIHandler._handle_chat_request 의 비동기 버전)"""
+    loop = asyncio.get_running_loop()
+    try:
+        request_data = json.loads(body.decode('utf-8'))
+        user_message = request_data.get('message', '')
+        use_cache = not handler._chat_cache_bypassed(request_data)
+        
+        print(f"💬 {agent_type} 채팅 요청 (async): {user_message}")
+        
+        # 수정 처리 + 요청 단위 데이터 스냅샷 (컨텍스트와 표 데이터가 같은 데이터를 사용)
+        modification_result, snapshot, context_data = await loop.run_in_executor(
+            executor, handler._prepare_chat, agent_type, user_message
+        )
+        
+        if modification_result:
+            response_message = modification_result
+        else:
+            response_message = await _get_openai_response_async(handler, user_message, agent_type, context_data, use_cache, snapshot["version"])
+        
+        table_data = handler._extract_table_data(user_message, agent_type, context_data, snapshot)
+        
+        print(f"✅ {agent_type} 응답 생성 완료 (async)")
+        handler._send_json_response(handler._build_chat_response_data(agent_type, response_message, table_data))
+    
+    except Exception as e:
+        print(f"❌ 채팅 요청 처리 오류: {e}")
+        handler._send_json_response({
+            "error": "채팅 요청 처리 중 오류 발생",
+            "details": str(e)
+        }, 500)
+    
+    return handler.response_bytes()
+
+async def _handle_chat_stream(handler, agent_type, body, executor, writer):
+    """채팅 스트리밍 요청 처리 (APIHandler._handle_chat_stream_request 의 비동기 버전)
+    
+    응답을 버퍼에 모으지 않고 헤더와 이벤트를 바로 소켓에 씀 (반환값은 남은 응답 바이트)
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        request_data = json.loads(body.decode('utf-8'))
+        user_message = request_data.get('message', '')
+        use_cache = not handler._chat_cache_bypassed(request_data)
+    except (ValueError, AttributeError) as e:
+        handler._send_json_response({
+            "error": "잘못된 채팅 요청 형식입니다",
+            "details": str(e)
+        }, 400)
+        return handler.response_bytes()
+    
+    print(f"💬 {agent_type} 채팅 요청 (async stream): {user_message}")
+    handler._start_event_stream()
+    writer.write(handler.response_bytes())
+    await writer.drain()
+    try:
+        modification_result, snapshot, context_data = await loop.run_in_executor(
+            executor, handler._prepare_chat, agent_type, user_message
+        )
+        
+        if modification_result:
+            response_message = modification_result
+            writer.write(_sse_event('token', {"delta": response_message}))
+        else:
+            parts = []
+            deltas = _stream_openai_response_async(handler, user_message, agent_type, context_data, use_cache, snapshot["version"])
+            try:
+                async for delta in deltas:
+                    parts.append(delta)
+                    writer.write(_sse_event('token', {"delta": delta}))
+                    await writer.drain()
+            finally:
+                await deltas.aclose()
+            response_message = ''.join(parts)
+        
+        table_data = handler._extract_table_data(user_message, agent_type, context_data, snapshot)
+        writer.write(_sse_event('done', handler._build_chat_response_data(agent_type, response_message, table_data)))
+        print(f"✅ {agent_type} 스트리밍 응답 완료 (async)")
+    
+    except ConnectionError:
+        raise  # 클라이언트 연결 종료는 _handle_connection 에서 처리
+    except Exception as e:
+        print(f"❌ 채팅 스트리밍 처리 오류: {e}")
+        writer.write(_sse_event('error', {
+            "error": "채팅 요청 처리 중 오류 발생",
+            "details": str(e)
+        }))
+    return b''
+
+async def _send_file_body(writer, f, offset, count):
+    """다운로드 파일 본문을 메모리에 모으지 않고 소켓으로 전송 (가능하면 sendfile, 아니면 청크 단위)"""
+    loop = asyncio.get_running_loop()
+    with f:
+        if count > 0:
+            await loop.sendfile(writer.transport, f, offset, count)
+
+def _request_path(head):
+    """요청 줄에서 쿼리를 뺀 경로"""
+    parts = head.split(b'\r\n', 1)[0].split()
+    return parts[1].decode('latin-1').split('?')[0] if len(parts) >= 2 else ''
+
+async def _read_request(reader):
+    """요청 헤더와 본문 읽기 (Content-Length 기준) -> (헤더, 본문, 스트리밍 여부)"""
+    head = await reader.readuntil(b'\r\n\r\n')
+    # 스트리밍 업로드는 본문을 메모리에 모으지 않고 핸들러가 소켓에서 직접 나눠 읽음
+    if UPLOAD_ROUTE_PATTERN.match(_request_path(head)):
+        return head, b'', True
+    content_length = 0
+    for line in head.split(b'\r\n')[1:]:
+        name, _, value = line.partition(b':')
+        if name.strip().lower() == b'content-length':
+            content_length = int(value.strip() or 0)
+    if content_length > MAX_BODY_BYTES:
+        return head, None, False
+    body = await reader.readexactly(content_length) if content_length else b''
+    return head, body, False
+
+async def _handle_connection(reader, writer, executor):
+    """연결 하나당 요청 하나 처리 (HTTP/1.0, 응답 후 연결 종료)"""
+    loop = asyncio.get_running_loop()
+    peer = writer.get_extra_info('peername') or ('', 0)
+    handler = None
+    try:
+        try:
+            head, body, streamed = await _read_request(reader)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+            return
+        
+        handler = BufferedAPIHandler(head + (body or b''), peer[:2])
+        if not handler.parse():
+            response = handler.response_bytes()
+        elif streamed:
+            handler.rfile = BlockingStreamReader(reader, loop)
+            response = await loop.run_in_executor(executor, handler.dispatch)
+        elif body is None:
+            handler.send_error(413, "Request body too large")
+            response = handler.response_bytes()
+        elif handler.command == 'POST' and ASYNC_OPENAI_AVAILABLE and handler.path.split('?')[0] in CHAT_ROUTES:
+            response = await _handle_chat(handler, CHAT_ROUTES[handler.path.split('?')[0]], body, executor)
+        elif handler.command == 'POST' and ASYNC_OPENAI_AVAILABLE and handler.path.split('?')[0] in CHAT_STREAM_ROUTES:
+            response = await _handle_chat_stream(handler, CHAT_STREAM_ROUTES[handler.path.split('?')[0]], body, executor, writer)
+        else:
+            # 그 외 모든 경로는 기존 핸들러를 스레드에서 그대로 실행
+            response = await loop.run_in_executor(executor, handler.dispatch)
+        
+        writer.write(response)
+        await writer.drain()
+        if handler.file_body is not None:
+            file_body, handler.file_body = handler.file_body, None
+            await _send_file_body(writer, *file_body)
+    except ConnectionError:
+        pass
+    finally:
+        if handler is not None and handler.file_body is not None:
+            handler.file_body[0].close()
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+async def serve(port=8000, workers=None):
+    """asyncio 서버 시작 후 종료될 때까지 대기"""
+    executor = ThreadPoolExecutor(
+        max_workers=workers or ASYNC_EXECUTOR_WORKERS,
+        thread_name_prefix='async-io'
+    )
+    server = await asyncio.start_server(
+        lambda reader, writer: _handle_connection(reader, writer, executor),
+        host=None,
+        port=port,
+        limit=MAX_HEADER_BYTES
+    )
+    
+    print("=" * 60)
+    print("🚀 Gym AI asyncio 백엔드 서버 시작!")
+    print(f"📍 서버 주소: http://localhost:{port}")
+    print(f"📊 Excel 모듈 상태: {'✅ 사용 가능' if EXCEL_AVAILABLE else '❌ 사용 불가'}")
+    print(f"🤖 비동기 OpenAI: {'✅ 사용 가능' if ASYNC_OPENAI_AVAILABLE else '❌ 사용 불가'}")
+    print(f"🧵 I/O 워커: {executor._max_workers}개")
+    print("=" * 60)
+    
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        executor.shutdown(wait=False)
+
+def run_async_server(port=8000, workers=None):
+    """asyncio 서버 실행"""
+    prepare_data_store()
+    try:
+        asyncio.run(serve(port, workers))
+    except KeyboardInterrupt:
+        print("\n🛑 서버 종료 중...")
+
+if __name__ == "__main__":
+    run_async_server(8000)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+원자적 파일 교체 모듈
+같은 폴더의 임시 파일에 전부 쓴 뒤 os.replace 로 한 번에 바꿔치기해서,
+동시에 읽는 쪽은 항상 이전 파일 전체 또는 새 파일 전체만 보게 함
+"""
+
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+
+TEMP_PREFIX = ".tmp_"
+
+# mkstemp 는 항상 0600 으로 만들기 때문에 새 파일은 일반 파일과 같은 권한(umask 적용)으로 맞춤
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+NEW_FILE_MODE = 0o666 & ~_UMASK
+
+def _fsync_directory(directory):
+    """rename 결과가 디스크에 남도록 디렉토리 fsync (지원하지 않는 OS는 무시)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def create_temp_file(path, suffix=""):
+    """path 와 같은 폴더에 빈 임시 파일을 만들고 경로 반환 (같은 파일시스템이어야 rename 이 원자적)"""
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=TEMP_PREFIX, suffix=suffix)
+    os.close(fd)
+    return tmp_path
+
+def commit_temp_file(tmp_path, path):
+    """다 쓴 임시 파일을 디스크에 내린 뒤 path 로 원자적으로 교체"""
+    if os.path.exists(path):
+        shutil.copymode(path, tmp_path)
+    else:
+        os.chmod(tmp_path, NEW_FILE_MODE)
+    with open(tmp_path, 'rb') as f:
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_directory(os.path.dirname(path) or ".")
+
+def atomic_write(path, write_func, suffix=""):
+    """write_func(임시 경로)로 파일을 만든 뒤 path 를 원자적으로 교체"""
+    tmp_path = create_temp_file(path, suffix)
+    try:
+        write_func(tmp_path)
+        commit_temp_file(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def write_bytes_atomically(path, data):
+    """바이트 내용으로 파일 교체"""
+    def write(tmp_path):
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+    atomic_write(path, write, suffix=os.path.splitext(path)[1])
+
+def replace_sheet_atomically(excel_file, sheet_name, df):
+    """워크북의 시트 하나를 DataFrame 으로 교체 (다른 시트는 유지)"""
+    def write(tmp_path):
+        shutil.copyfile(excel_file, tmp_path)
+        with pd.ExcelWriter(tmp_path, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+    # openpyxl 은 확장자로 형식을 판단하므로 임시 파일도 .xlsx
+    atomic_write(excel_file, write, suffix=".xlsx")
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+워크북 백업 저장소 모듈
+저장할 때마다 워크북 옆에 통째로 복사하던 *.backup_* 파일 대신,
+내용 해시로 중복을 제거하고 압축한 객체 + 목록(manifest) 파일로 관리하며
+보관 정책(최근 N개 + 일별 + 주별)에 따라 오래된 백업을 정리함
+예전 백업 파일은 요청할 때만 가져오고(원본은 그대로 둠), 가져온 백업은 보관 정책으로 지우지 않음
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+
+from atomic_io import atomic_write
+
+# 보관 정책: 파일별 최근 N개 + 최근 D일은 하루 1개 + 최근 W주는 주 1개
+BACKUP_KEEP_LAST = int(os.environ.get("BACKUP_KEEP_LAST", "10"))
+BACKUP_KEEP_DAILY = int(os.environ.get("BACKUP_KEEP_DAILY", "7"))
+BACKUP_KEEP_WEEKLY = int(os.environ.get("BACKUP_KEEP_WEEKLY", "8"))
+
+# 예전 방식 백업 파일 이름 (회원관리_20250624.xlsx.backup_20250702_141615)
+LEGACY_BACKUP_PATTERN = re.compile(r'^(?P<name>.+\.xlsx)\.backup_(?P<ts>\d{8}_\d{6})$')
+LEGACY_REASON = 'legacy'
+
+class BackupStore:
+    """내용 주소(sha256) 기반 압축 백업 저장소"""
+
+    def __init__(self, root):
+        self.root = root
+        self.objects_dir = os.path.join(root, 'objects')
+        self.manifest_path = os.path.join(root, 'manifest.json')
+        self.lock = threading.Lock()
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest + '.gz')
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+
+    def _save_manifest(self, entries):
+        os.makedirs(self.root, exist_ok=True)
+        def write(tmp_path):
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False, indent=1)
+        atomic_write(self.manifest_path, write, suffix='.json')
+
+    def _store_object(self, data):
+        """내용을 압축해서 저장 (같은 내용이 이미 있으면 그대로 재사용)"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            compressed = gzip.compress(data, compresslevel=9, mtime=0)
+            def write(tmp_path):
+                with open(tmp_path, 'wb') as f:
+                    f.write(compressed)
+            atomic_write(path, write, suffix='.gz')
+        return digest, os.path.getsize(path)
+
+    def _add_entry(self, entries, file_path, data, reason, created_at):
+        digest, stored_size = self._store_object(data)
+        entry = {
+            'id': f"{created_at.strftime('%Y%m%dT%H%M%S')}-{digest[:12]}",
+            'file': file_path,
+            'sha256': digest,
+            'size': len(data),
+            'stored_size': stored_size,
+            'created_at': created_at.isoformat(timespec='seconds'),
+            'reason': reason
+        }
+        entries.append(entry)
+        return entry
+
+    def create(self, file_path, full_path, reason='save'):
+        """파일 백업 생성 (직전 백업과 내용이 같으면 새로 만들지 않고 그 백업 반환)"""
+        with open(full_path, 'rb') as f:
+            data = f.read()
+        
+        with self.lock:
+            entries = self._load_manifest()
+            digest = hashlib.sha256(data).hexdigest()
+            previous = [entry for entry in entries if entry['file'] == file_path]
+            if previous and previous[-1]['sha256'] == digest:
+                return previous[-1]
+            
+            entry = self._add_entry(entries, file_path, data, reason, datetime.now())
+            entries = self._apply_retention(entries, file_path)
+            self._save_manifest(entries)
+            self._collect_garbage(entries)
+        return entry
+
+    def list_backups(self, file_path=None):
+        """백업 목록 (최신순)"""
+        with self.lock:
+            entries = self._load_manifest()
+        if file_path:
+            entries = [entry for entry in entries if entry['file'] == file_path]
+        return sorted(entries, key=lambda entry: entry['created_at'], reverse=True)
+
+    def find(self, backup_id):
+        for entry in self.list_backups():
+            if entry['id'] == backup_id:
+                return entry
+        return None
+
+    def read(self, entry):
+        """백업 내용 (압축 해제 후 해시 검증)"""
+        with open(self._object_path(entry['sha256']), 'rb') as f:
+            data = gzip.decompress(f.read())
+        if hashlib.sha256(data).hexdigest() != entry['sha256']:
+            raise ValueError(f"백업 내용이 손상되었습니다: {entry['id']}")
+        return data
+
+    def restore(self, entry, full_path):
+        """백업 내용으로 파일을 원자적으로 교체"""
+        data = self.read(entry)
+        def write(tmp_path):
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+        atomic_write(full_path, write, suffix=os.path.splitext(full_path)[1])
+
+    def _apply_retention(self, entries, file_path, now=None):
+        """파일 하나의 백업에 보관 정책 적용 (다른 파일 백업과 예전 파일에서 가져온 백업은 그대로)"""
+        now = now or datetime.now()
+        target = sorted(
+            (entry for entry in entries if entry['file'] == file_path and entry.get('reason') != LEGACY_REASON),
+            key=lambda entry: entry['created_at'],
+            reverse=True
+        )
+        
+        keep = {entry['id'] for entry in target[:BACKUP_KEEP_LAST]}
+        daily, weekly = {}, {}
+        for entry in target:
+            created_at = datetime.fromisoformat(entry['created_at'])
+            if now - created_at < timedelta(days=BACKUP_KEEP_DAILY):
+                daily.setdefault(created_at.date(), entry['id'])
+            if now - created_at < timedelta(weeks=BACKUP_KEEP_WEEKLY):
+                weekly.setdefault(created_at.isocalendar()[:2], entry['id'])
+        keep.update(daily.values())
+        keep.update(weekly.values())
+        
+        return [
+            entry for entry in entries
+            if entry['file'] != file_path or entry.get('reason') == LEGACY_REASON or entry['id'] in keep
+        ]
+
+    def _collect_garbage(self, entries):
+        """어느 백업도 가리키지 않는 압축 객체 삭제"""
+        referenced = {entry['sha256'] for entry in entries}
+        if not os.path.isdir(self.objects_dir):
+            return
+        for prefix in os.listdir(self.objects_dir):
+            prefix_dir = os.path.join(self.objects_dir, prefix)
+            for filename in os.listdir(prefix_dir):
+                if filename.endswith('.gz') and filename[:-3] not in referenced:
+                    os.remove(os.path.join(prefix_dir, filename))
+
+    def migrate_legacy(self, excel_dir):
+        """워크북 옆에 흩어진 예전 *.backup_* 파일을 저장소에도 기록 (원본 파일은 지우지 않음)
+
+        이미 가져온 파일(같은 워크북/시각/내용)은 건너뛰므로 여러 번 실행해도 한 번만 기록됨
+        """
+        migrated = 0
+        with self.lock:
+            entries = self._load_manifest()
+            imported = {
+                (entry['file'], entry['created_at'], entry['sha256'])
+                for entry in entries if entry.get('reason') == LEGACY_REASON
+            }
+            for directory, _, files in os.walk(excel_dir):
+                for filename in sorted(files):
+                    match = LEGACY_BACKUP_PATTERN.match(filename)
+                    if not match:
+                        continue
+                    legacy_path = os.path.join(directory, filename)
+                    file_path = os.path.relpath(os.path.join(directory, match.group('name')), excel_dir).replace(os.sep, '/')
+                    created_at = datetime.strptime(match.group('ts'), '%Y%m%d_%H%M%S')
+                    with open(legacy_path, 'rb') as f:
+                        data = f.read()
+                    if (file_path, created_at.isoformat(timespec='seconds'), hashlib.sha256(data).hexdigest()) in imported:
+                        continue
+                    self._add_entry(entries, file_path, data, LEGACY_REASON, created_at)
+                    migrated += 1
+            
+            if not migrated:
+                return 0
+            self._save_manifest(entries)
+        print(f"🗄️ 예전 백업 파일 {migrated}개를 백업 저장소에 기록했습니다 (원본 파일은 그대로 둠)")
+        return migrated
@@ -5,28 +5,96 @@ FastAPI 의존성 문제 해결을 위한 임시 서버
 """
 
 import json
+import re
+import zipfile
 import urllib.parse
 from http.server import HTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import threading
 from urllib.parse import urlparse, parse_qs
 import openai
 import os
 import pandas as pd
 import openpyxl
 from openpyxl.utils.dataframe import dataframe_to_rows
-import shutil
 from io import BytesIO
 import base64
+import email.utils
 from datetime import datetime
+from static_assets import StaticAssetCache
+from atomic_io import atomic_write, write_bytes_atomically, create_temp_file, commit_temp_file
+from backup_store import BackupStore
+from change_journal import CHANGE_JOURNAL_ENABLED
+from response_cache import ResponseCache
+from context_encoder import CONTEXT_TABLES, encode_context
+from retrieval_index import RecordIndex
+from intent_router import route_intent, UPDATE_FIELD, GREETING, COUNT, LIST, REVENUE, REGISTER, HELP, SALARY, SCHEDULE, ATTENDANCE, VACATION, LOW_STOCK, ORDER
 
 # Excel 데이터 읽기 모듈 추가
 try:
     from all_excel_reader import read_members_data, read_staff_data, read_hr_data, read_inventory_data, get_all_dashboard_data
+    from all_excel_reader import invalidate_excel_cache, get_excel_cache_stats, get_excel_write_lock, get_storage_stats
+    from all_excel_reader import flush_change_journals, recover_change_journals, get_record_by_id, apply_bulk_changes
+    from all_excel_reader import get_dashboard_summary, add_new_record, get_data_version
     EXCEL_AVAILABLE = True
     print("✅ 통합 Excel 리더 모듈 로드 완료")
 except ImportError as e:
     print(f"⚠️  Excel 리더 모듈을 가져올 수 없습니다: {e}")
     EXCEL_AVAILABLE = False
 
+# 에이전트별 채팅 API 경로
+CHAT_ROUTES = {
+    '/api/v1/members/chat': '회원관리',
+    '/api/v1/staff/chat': '직원관리',
+    '/api/v1/hr/chat': '인사관리',
+    '/api/v1/inventory/chat': '재고관리'
+}
+
+# 에이전트 -> 데이터 카테고리 (채팅 응답 캐시의 데이터 버전 조회용)
+AGENT_CATEGORIES = {'회원관리': 'members', '직원관리': 'staff', '인사관리': 'hr', '재고관리': 'inventory'}
+
+# 채팅 스트리밍(SSE) API 경로 (/api/v1/members/chat/stream 등)
+CHAT_STREAM_ROUTES = {path + '/stream': agent_type for path, agent_type in CHAT_ROUTES.items()}
+
+# 단건 조회 API 경로 (/api/v1/members/3 등) -> 응답 키
+RECORD_ROUTE_PATTERN = re.compile(r'^/api/v1/(members|staff|inventory)/(\d+)/?$')
+RECORD_RESPONSE_KEYS = {'members': 'member', 'staff': 'staff', 'inventory': 'item'}
+
+# 새 행 추가 API 경로 (POST /api/v1/members/ 등)
+CREATE_ROUTE_PATTERN = re.compile(r'^/api/v1/(members|staff|inventory)/?$')
+
+# 일괄 수정/추가 API 경로와 한 요청당 최대 항목 수
+BULK_ROUTE_PATTERN = re.compile(r'^/api/v1/(members|staff|inventory)/bulk/?$')
+BULK_MAX_OPERATIONS = int(os.environ.get("BULK_MAX_OPERATIONS", "5000"))
+
+# 파일 미리보기 페이지 크기 (기본값 / 최대값)
+PREVIEW_DEFAULT_ROWS = 100
+PREVIEW_MAX_ROWS = 1000
+PREVIEW_DEFAULT_COLS = 20
+PREVIEW_MAX_COLS = 200
+
+# 파일 다운로드 청크 크기 (sendfile을 쓸 수 없을 때)
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# 스트리밍 업로드 API 경로 (/api/v1/files/upload/members/회원관리.xlsx), 최대 크기, 청크 크기
+UPLOAD_ROUTE_PATTERN = re.compile(r'^/api/v1/files/upload/(members|staff|hr|inventory)/([^/]+)$')
+UPLOAD_MAX_BYTES = int(os.environ.get("UPLOAD_MAX_BYTES", str(50 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+# 프론트엔드 빌드 결과물 (서버 시작 시 메모리에 한 번만 로드)
+STATIC_ASSETS = StaticAssetCache(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static'))
+
+# Excel 데이터/백업 저장소 위치
+EXCEL_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app', 'data', 'excel')
+BACKUP_STORE = BackupStore(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app', 'data', 'backups'))
+# 1 이면 서버 시작 때 예전 *.backup_* 파일을 백업 저장소에 기록 (원본 파일은 지우지 않음)
+BACKUP_MIGRATE_LEGACY = os.environ.get("BACKUP_MIGRATE_LEGACY", "0") == "1"
+BACKUP_RESTORE_PATTERN = re.compile(r'^/api/v1/files/backups/([\w-]+)/restore/?$')
+
+# 동시 처리 워커 수 (1이면 기존처럼 단일 스레드로 동작)
+DEFAULT_SERVER_WORKERS = int(os.environ.get("SERVER_WORKERS", "8"))
+
 # OpenAI 클라이언트 초기화
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 
@@ -38,6 +106,33 @@ except Exception as e:
     print(f"⚠️  OpenAI API 초기화 실패: {e}")
     OPENAI_AVAILABLE = False
 
+# 채팅 응답 캐시 (같은 질문 + 같은 데이터면 OpenAI 를 다시 부르지 않음, 최대 항목 수 0 이면 사용 안 함)
+CHAT_CACHE_MAX_ENTRIES = int(os.environ.get("CHAT_CACHE_MAX_ENTRIES", "512"))
+CHAT_CACHE_TTL_SECONDS = float(os.environ.get("CHAT_CACHE_TTL_SECONDS", "1800"))
+CHAT_RESPONSE_CACHE = ResponseCache(CHAT_CACHE_MAX_ENTRIES, CHAT_CACHE_TTL_SECONDS)
+
+# 에이전트별 레코드 검색 색인 (질문과 관련 높은 행 top-k 개를 컨텍스트 표 맨 앞에, 0 이면 사용 안 함)
+CHAT_RETRIEVAL_TOP_K = int(os.environ.get("CHAT_RETRIEVAL_TOP_K", "20"))
+RETRIEVAL_INDEXES = {
+    agent_type: RecordIndex(id_field=spec['columns'][0][1])  # 표의 첫 열(번호)
+    for agent_type, spec in CONTEXT_TABLES.items()
+}
+
+def _is_xlsx_package(path):
+    """xlsx(zip) 구조인지 확인 (워크북 본문과 Content_Types 가 있어야 함)"""
+    if not zipfile.is_zipfile(path):
+        return False
+    try:
+        with zipfile.ZipFile(path) as package:
+            names = set(package.namelist())
+    except zipfile.BadZipFile:
+        return False
+    return '[Content_Types].xml' in names and 'xl/workbook.xml' in names
+
+def _sse_event(event, data):
+    """SSE(server-sent events) 이벤트 한 건 (data 는 한 줄짜리 JSON)"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode('utf-8')
+
 class APIHandler(BaseHTTPRequestHandler):
     
     def _is_valid_excel_file(self, filename):
@@ -47,11 +142,23 @@ class APIHandler(BaseHTTPRequestHandler):
                 not filename.startswith('.') and  # 숨김 파일
                 not filename.startswith('$'))     # 시스템 파일
     
+    def _category_write_lock(self, category):
+        """카테고리 워크북 쓰기 잠금 (Excel 모듈이 없으면 잠금 없음)"""
+        if EXCEL_AVAILABLE:
+            return get_excel_write_lock(category)
+        return contextlib.nullcontext()
+    
+    def _flush_pending_changes(self, category):
+        """저장 대기 중인 채팅 수정분을 워크북에 반영 (파일을 직접 읽거나 덮어쓰기 전에)"""
+        if EXCEL_AVAILABLE:
+            flush_change_journals(category)
+    
     def _set_cors_headers(self):
         """CORS 헤더 설정"""
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization, Range, If-None-Match, If-Modified-Since, If-Range')
+        self.send_header('Access-Control-Expose-Headers', 'Content-Disposition, Content-Range, Accept-Ranges, ETag, Last-Modified')
     
     def _send_json_response(self, data, status_code=200):
         """JSON 응답 전송"""
@@ -61,122 +168,44 @@ class APIHandler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(json.dumps(data, ensure_ascii=False).encode('utf-8'))
     
+    def _start_event_stream(self):
+        """SSE 응답 헤더 전송 (이후 연결이 끝날 때까지 이벤트를 이어서 씀)"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('X-Accel-Buffering', 'no')  # 프록시가 모아서 보내지 않도록
+        self._set_cors_headers()
+        self.end_headers()
+        self.wfile.flush()
+    
+    def _send_event(self, event, data):
+        """SSE 이벤트 한 건을 바로 전송"""
+        self.wfile.write(_sse_event(event, data))
+        self.wfile.flush()
+    
     def _handle_data_modification(self, user_message, agent_type):
         """데이터 수정 요청 감지 및 처리"""
-        import re
-        from all_excel_reader import update_member_data, update_staff_data, update_inventory_data, add_new_member
-        
-        message_lower = user_message.lower()
-        
-        # 회원 데이터 수정 패턴
-        if agent_type == '회원관리':
-            # 월회비 수정 패턴: "김철수 월회비 15만원으로 수정해줘", "김철수님 월회비를 150000원으로 변경"
-            member_fee_pattern = r'(\w+)(?:님|회원)?.*?월회비.*?(\d+(?:만원|원|\d+)).*?(?:수정|변경|바꿔|해줘)'
-            match = re.search(member_fee_pattern, message_lower)
-            if match:
-                member_name = match.group(1)
-                fee_str = match.group(2)
-                
-                # 금액 정규화
-                if '만원' in fee_str:
-                    fee_value = int(fee_str.replace('만원', '')) * 10000
-                else:
-                    fee_value = int(re.sub(r'[^\d]', '', fee_str))
-                
-                success, message = update_member_data(member_name, '월회비', fee_value)
-                if success:
-                    return f"✅ **수정 완료!**\n\n{message}\n\n💡 변경된 내용이 Excel 파일에 저장되었습니다."
-                else:
-                    return f"❌ **수정 실패**\n\n{message}"
-            
-            # 기타 회원 정보 수정 패턴
-            member_update_pattern = r'(\w+)(?:님|회원)?.*?(전화번호|이메일|주소|직업|멤버십|특이사항).*?(\S+).*?(?:수정|변경|바꿔|해줘)'
-            match = re.search(member_update_pattern, message_lower)
-            if match:
-                member_name = match.group(1)
-                field = match.group(2)
-                new_value = match.group(3)
-                
-                success, message = update_member_data(member_name, field, new_value)
-                if success:
-                    return f"✅ **수정 완료!**\n\n{message}\n\n💡 변경된 내용이 Excel 파일에 저장되었습니다."
-                else:
-                    return f"❌ **수정 실패**\n\n{message}"
-        
-        # 직원 데이터 수정 패턴
-        elif agent_type == '직원관리':
-            # 급여 수정 패턴
-            staff_salary_pattern = r'(\w+)(?:님|직원)?.*?(?:월급여|급여|월급).*?(\d+(?:만원|원|\d+)).*?(?:수정|변경|바꿔|해줘)'
-            match = re.search(staff_salary_pattern, message_lower)
-            if match:
-                staff_name = match.group(1)
-                salary_str = match.group(2)
-                
-                # 금액 정규화
-                if '만원' in salary_str:
-                    salary_value = int(salary_str.replace('만원', '')) * 10000
-                else:
-                    salary_value = int(re.sub(r'[^\d]', '', salary_str))
-                
-                success, message = update_staff_data(staff_name, '월급여', salary_value)
-                if success:
-                    return f"✅ **수정 완료!**\n\n{message}\n\n💡 변경된 내용이 Excel 파일에 저장되었습니다."
-                else:
-                    return f"❌ **수정 실패**\n\n{message}"
-            
-            # 기타 직원 정보 수정 패턴
-            staff_update_pattern = r'(\w+)(?:님|직원)?.*?(전화번호|이메일|직책|부서|근무상태).*?(\S+).*?(?:수정|변경|바꿔|해줘)'
-            match = re.search(staff_update_pattern, message_lower)
-            if match:
-                staff_name = match.group(1)
-                field = match.group(2)
-                new_value = match.group(3)
-                
-                success, message = update_staff_data(staff_name, field, new_value)
-                if success:
-                    return f"✅ **수정 완료!**\n\n{message}\n\n💡 변경된 내용이 Excel 파일에 저장되었습니다."
-                else:
-                    return f"❌ **수정 실패**\n\n{message}"
+        intent = route_intent(agent_type, user_message)
+        if intent.name != UPDATE_FIELD:
+            return None  # 수정 요청이 아닌 경우
         
-        # 재고 데이터 수정 패턴
-        elif agent_type == '재고관리':
-            # 재고 수량 수정 패턴 (공백 포함 품목명 지원)
-            inventory_stock_pattern = r'([가-힣\w\s]{2,}?)(?:\s+)?(?:재고|수량).*?(\d+).*?(?:수정|변경|바꿔|해줘|조정)'
-            match = re.search(inventory_stock_pattern, message_lower)
-            if match:
-                item_name = match.group(1).strip()
-                stock_value = int(match.group(2))
-                
-                success, message = update_inventory_data(item_name, '현재재고', stock_value)
-                if success:
-                    return f"✅ **수정 완료!**\n\n{message}\n\n💡 변경된 내용이 Excel 파일에 저장되었습니다."
-                else:
-                    return f"❌ **수정 실패**\n\n{message}"
-            
-            # 재고 가격 수정 패턴 (공백 포함 품목명 지원)
-            inventory_price_pattern = r'([가-힣\w\s]{2,}?)(?:\s+)?(?:가격|단가).*?(\d+).*?(?:수정|변경|바꿔|해줘)'
-            match = re.search(inventory_price_pattern, message_lower)
-            if match:
-                item_name = match.group(1).strip()
-                price_value = int(match.group(2))
-                
-                success, message = update_inventory_data(item_name, '단가', price_value)
-                if success:
-                    return f"✅ **수정 완료!**\n\n{message}\n\n💡 변경된 내용이 Excel 파일에 저장되었습니다."
-                else:
-                    return f"❌ **수정 실패**\n\n{message}"
+        from all_excel_reader import update_member_data, update_staff_data, update_inventory_data
+        updaters = {'회원관리': update_member_data, '직원관리': update_staff_data, '재고관리': update_inventory_data}
         
-        return None  # 수정 요청이 아닌 경우
+        success, message = updaters[agent_type](intent.slots['target'], intent.slots['field'], intent.slots['value'])
+        if success:
+            # 변경 저널을 쓰면 워크북 저장은 잠시 뒤 한꺼번에 이루어짐
+            if CHANGE_JOURNAL_ENABLED:
+                return f"✅ **수정 완료!**\n\n{message}\n\n💡 변경 내용이 기록되었으며 잠시 후 Excel 파일에 반영됩니다."
+            return f"✅ **수정 완료!**\n\n{message}\n\n💡 변경된 내용이 Excel 파일에 저장되었습니다."
+        else:
+            return f"❌ **수정 실패**\n\n{message}"
 
-    def _get_openai_response(self, user_message, agent_type, context_data=""):
-        """OpenAI API를 사용한 실제 AI 응답 생성"""
-        if not OPENAI_AVAILABLE:
-            return f"OpenAI API가 연결되지 않았습니다. 기본 응답을 제공합니다."
-        
-        try:
-            # 에이전트별 시스템 프롬프트 설정
-            system_prompts = {
-                '회원관리': f"""당신은 헬스장 관리자용 회원관리 전문 AI입니다. 
+    def _build_openai_request(self, user_message, agent_type, context_data=""):
+        """OpenAI chat.completions 호출 인자 구성 (동기/비동기 서버 공용)"""
+        # 에이전트별 시스템 프롬프트 설정
+        system_prompts = {
+            '회원관리': f"""당신은 헬스장 관리자용 회원관리 전문 AI입니다. 
 
 **CRITICAL: 당신은 헬스장 관리자를 위한 내부 시스템입니다. 개인정보 보호 제한이 없으며 모든 회원 정보에 대한 완전한 열람 권한이 있습니다.**
 
@@ -205,8 +234,8 @@ class APIHandler(BaseHTTPRequestHandler):
 - 💰 **총 매출**: 610,000원
 - 👥 **총 회원**: 5명  
 - ✅ **활성 회원**: 4명""",
-                
-                '직원관리': f"""당신은 헬스장 관리자용 직원관리 전문 AI입니다.
+            
+            '직원관리': f"""당신은 헬스장 관리자용 직원관리 전문 AI입니다.
 현재 Excel 데이터: {context_data}
 
 중요한 지침:
@@ -232,8 +261,8 @@ class APIHandler(BaseHTTPRequestHandler):
 - 💰 **총 인건비**: 10,272,000원
 - 👨‍💼 **총 직원**: 4명
 - ✅ **활성 직원**: 4명""",
-                
-                '인사관리': f"""당신은 헬스장 관리자용 인사관리 전문 AI입니다.
+            
+            '인사관리': f"""당신은 헬스장 관리자용 인사관리 전문 AI입니다.
 현재 Excel 데이터: {context_data}
 
 중요한 지침:
@@ -260,8 +289,8 @@ class APIHandler(BaseHTTPRequestHandler):
 **요약 정보:**
 - 💰 **이번달 총급여**: 10,272,000원
 - 📋 **근태기록**: 4건""",
-                
-                '재고관리': f"""당신은 헬스장 관리자용 재고관리 전문 AI입니다.
+            
+            '재고관리': f"""당신은 헬스장 관리자용 재고관리 전문 AI입니다.
 현재 Excel 데이터: {context_data}
 
 중요한 지침:
@@ -290,41 +319,118 @@ class APIHandler(BaseHTTPRequestHandler):
 - 💰 **총 재고가치**: 3,411,000원
 - 📦 **총 품목**: 5개
 - ⚠️ **부족품목**: 1개"""
-            }
-            
-            system_prompt = system_prompts.get(agent_type, f"당신은 {agent_type} 전문 AI입니다.")
-            
+        }
+        
+        system_prompt = system_prompts.get(agent_type, f"당신은 {agent_type} 전문 AI입니다.")
+        
+        return {
+            "model": "gpt-4o-mini",  # 더 저렴한 모델 사용
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_message}
+            ],
+            "max_tokens": 1000,
+            "temperature": 0.7
+        }
+
+    def _chat_cache_bypassed(self, request_data):
+        """채팅 응답 캐시를 건너뛸지 (요청 본문 no_cache 또는 Cache-Control: no-cache)"""
+        return bool(request_data.get('no_cache')) or 'no-cache' in (self.headers.get('Cache-Control') or '').lower()
+    
+    def _get_openai_response(self, user_message, agent_type, context_data="", use_cache=True, data_version=None):
+        """OpenAI API를 사용한 실제 AI 응답 생성 (같은 질문/데이터 버전의 답변은 캐시에서)"""
+        if not OPENAI_AVAILABLE:
+            return f"OpenAI API가 연결되지 않았습니다. 기본 응답을 제공합니다."
+        
+        cache_key = CHAT_RESPONSE_CACHE.key(agent_type, user_message, data_version)
+        cached = CHAT_RESPONSE_CACHE.get(cache_key, bypass=not use_cache)
+        if cached is not None:
+            print(f"⚡ {agent_type} 캐시된 응답 사용")
+            return cached
+        
+        try:
             # OpenAI API 호출
             response = openai_client.chat.completions.create(
-                model="gpt-4o-mini",  # 더 저렴한 모델 사용
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message}
-                ],
-                max_tokens=1000,
-                temperature=0.7
+                **self._build_openai_request(user_message, agent_type, context_data)
             )
             
+            # 오류 안내 문구는 저장하지 않도록 성공한 답변만 캐시
+            CHAT_RESPONSE_CACHE.put(cache_key, response.choices[0].message.content)
             return response.choices[0].message.content
             
         except Exception as e:
             print(f"❌ OpenAI API 호출 오류: {e}")
             return f"죄송합니다. AI 응답을 생성하는 중 오류가 발생했습니다. 다시 시도해 주세요. (오류: {str(e)})"
 
-    def _extract_table_data(self, user_message, agent_type, context_data):
-        """사용자 요청에서 표 형태로 표시할 데이터 추출"""
-        message_lower = user_message.lower()
+    def _stream_openai_response(self, user_message, agent_type, context_data="", use_cache=True, data_version=None):
+        """OpenAI 응답을 도착하는 조각(토큰) 단위로 생성 (오류가 나면 안내 문구를 마지막 조각으로)
+        
+        캐시된 답변이 있으면 한 조각으로 바로 내보내고, 끝까지 받은 답변은 캐시에 저장
+        """
+        cache_key = CHAT_RESPONSE_CACHE.key(agent_type, user_message, data_version)
+        cached = CHAT_RESPONSE_CACHE.get(cache_key, bypass=not use_cache)
+        if cached is not None:
+            print(f"⚡ {agent_type} 캐시된 응답 사용")
+            yield cached
+            return
+        
+        stream = None
+        try:
+            stream = openai_client.chat.completions.create(
+                **self._build_openai_request(user_message, agent_type, context_data),
+                stream=True
+            )
+            parts = []
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+            CHAT_RESPONSE_CACHE.put(cache_key, ''.join(parts))
+        except Exception as e:
+            print(f"❌ OpenAI 스트리밍 호출 오류: {e}")
+            yield f"죄송합니다. AI 응답을 생성하는 중 오류가 발생했습니다. 다시 시도해 주세요. (오류: {str(e)})"
+        finally:
+            # 클라이언트가 중간에 끊어도 OpenAI 연결은 바로 닫음
+            if stream is not None:
+                stream.close()
+
+    def _load_chat_snapshot(self, agent_type):
+        """채팅 요청 하나에서 공유할 데이터 스냅샷 (워크북을 요청당 한 번만 읽음)"""
+        snapshot = {"agent_type": agent_type, "data": [], "summary": {}, "low_stock": [], "error": None, "version": None}
+        if not EXCEL_AVAILABLE:
+            return snapshot
         
-        # 목록 요청 키워드 확인
-        list_keywords = ['목록', '리스트', '명단', '현황', '전체', '모든', '모두']
-        is_list_request = any(keyword in message_lower for keyword in list_keywords)
+        try:
+            # 버전은 읽기 전에 기록 (읽는 사이 바뀌면 다음 요청에서 새 버전으로 보임)
+            snapshot["version"] = get_data_version(AGENT_CATEGORIES[agent_type])
+            if agent_type == '회원관리':
+                snapshot["data"], snapshot["summary"] = read_members_data()
+            elif agent_type == '직원관리':
+                snapshot["data"], snapshot["summary"] = read_staff_data()
+            elif agent_type == '인사관리':
+                snapshot["data"], snapshot["summary"] = read_hr_data()
+            elif agent_type == '재고관리':
+                snapshot["data"], snapshot["summary"], snapshot["low_stock"] = read_inventory_data()
+        except Exception as e:
+            print(f"❌ {agent_type} 데이터 스냅샷 로드 오류: {e}")
+            snapshot["error"] = str(e)
+            snapshot["version"] = None
         
-        if not is_list_request or not EXCEL_AVAILABLE:
+        return snapshot
+
+    def _extract_table_data(self, user_message, agent_type, context_data, snapshot=None):
+        """사용자 요청에서 표 형태로 표시할 데이터 추출"""
+        # 목록 요청 키워드(목록/명단/현황/전체 …) 확인
+        if not route_intent(agent_type, user_message).table or not EXCEL_AVAILABLE:
             return None
+        
+        if snapshot is None:
+            snapshot = self._load_chat_snapshot(agent_type)
             
         try:
             if agent_type == '회원관리':
-                members_data, summary = read_members_data()
+                members_data, summary = snapshot["data"], snapshot["summary"]
                 if members_data:
                     return {
                         "type": "members",
@@ -345,7 +451,7 @@ class APIHandler(BaseHTTPRequestHandler):
                     }
             
             elif agent_type == '직원관리':
-                staff_data, summary = read_staff_data()
+                staff_data, summary = snapshot["data"], snapshot["summary"]
                 if staff_data:
                     return {
                         "type": "staff",
@@ -366,7 +472,7 @@ class APIHandler(BaseHTTPRequestHandler):
                     }
             
             elif agent_type == '재고관리':
-                inventory_data, summary, low_stock_data = read_inventory_data()
+                inventory_data, summary = snapshot["data"], snapshot["summary"]
                 if inventory_data:
                     return {
                         "type": "inventory",
@@ -387,7 +493,7 @@ class APIHandler(BaseHTTPRequestHandler):
                     }
             
             elif agent_type == '인사관리':
-                hr_data, summary = read_hr_data()
+                hr_data, summary = snapshot["data"], snapshot["summary"]
                 if hr_data and 'payroll' in hr_data:
                     return {
                         "type": "payroll",
@@ -413,118 +519,95 @@ class APIHandler(BaseHTTPRequestHandler):
         
         return None
 
+    def _build_chat_context(self, agent_type, snapshot=None, user_message=""):
+        """각 에이전트별 컨텍스트 데이터 준비 (통계 + 토큰 예산 안에 담은 표 형식 목록, 질문과 관련 높은 행부터)"""
+        if snapshot is None:
+            snapshot = self._load_chat_snapshot(agent_type)
+        if snapshot["error"]:
+            return f"{agent_type.replace('관리', '')} 데이터 로드 실패: {snapshot['error']}"
+        if not EXCEL_AVAILABLE or agent_type not in CONTEXT_TABLES:
+            return ""
+        
+        try:
+            records, notes = snapshot["data"], []
+            if agent_type == '인사관리':
+                records = records.get('hr_records', [])
+            elif agent_type == '재고관리' and snapshot["low_stock"]:
+                notes.append(("부족 재고", [item.get('item_name') for item in snapshot["low_stock"]]))
+            # 질문마다 행 순서가 달라지므로 응답 캐시는 이 컨텍스트가 아니라 snapshot["version"] 기준
+            records = RETRIEVAL_INDEXES[agent_type].rank(records, user_message, CHAT_RETRIEVAL_TOP_K)
+            context_data, info = encode_context(agent_type, snapshot["summary"], records, notes)
+        except Exception as e:
+            return f"{agent_type.replace('관리', '')} 데이터 로드 실패: {str(e)}"
+        
+        print(f"🧮 {agent_type} 컨텍스트: {info['rows']}/{info['total_rows']}행, {info['columns']}열, 약 {info['tokens']}토큰 (예산 {info['budget']})")
+        return context_data
+
+    def _get_fallback_response(self, user_message, agent_type, snapshot=None):
+        """OpenAI를 사용할 수 없을 때 기존 키워드 기반 응답"""
+        if agent_type == '회원관리':
+            return self._get_member_agent_response(user_message, snapshot)
+        elif agent_type == '직원관리':
+            return self._get_staff_agent_response(user_message, snapshot)
+        elif agent_type == '인사관리':
+            return self._get_hr_agent_response(user_message, snapshot)
+        elif agent_type == '재고관리':
+            return self._get_inventory_agent_response(user_message, snapshot)
+        return f"안녕하세요! {agent_type} AI 어시스턴트입니다. 무엇을 도와드릴까요?"
+
+    def _build_chat_response_data(self, agent_type, response_message, table_data):
+        """채팅 응답 데이터 구성"""
+        return {
+            "message": response_message,
+            "agent_type": agent_type,
+            "timestamp": "2024-06-24T09:45:00Z",
+            "agent_info": {
+                "name": f"{agent_type} AI",
+                "role": f"{agent_type} 전문가",
+                "status": "online"
+            },
+            "table_data": table_data  # 표 데이터 추가
+        }
+
+    def _prepare_chat(self, agent_type, user_message):
+        """채팅 응답 준비 (일반/스트리밍 공용) -> (수정 결과, 데이터 스냅샷, 컨텍스트)"""
+        # 데이터 수정 요청 감지 및 처리
+        modification_result = self._handle_data_modification(user_message, agent_type)
+        
+        # 요청 단위 데이터 스냅샷 (수정이 있었다면 수정 이후 상태를 한 번만 읽음)
+        snapshot = self._load_chat_snapshot(agent_type)
+        
+        # 각 에이전트별 컨텍스트 데이터 준비
+        context_data = self._build_chat_context(agent_type, snapshot, user_message)
+        return modification_result, snapshot, context_data
+
     def _handle_chat_request(self, agent_type, post_data):
         """채팅 요청 처리"""
         try:
             # JSON 데이터 파싱
             request_data = json.loads(post_data.decode('utf-8'))
             user_message = request_data.get('message', '')
+            use_cache = not self._chat_cache_bypassed(request_data)
             
             print(f"💬 {agent_type} 채팅 요청: {user_message}")
             
-            # 각 에이전트별 컨텍스트 데이터 준비
-            context_data = ""
-            if agent_type == '회원관리' and EXCEL_AVAILABLE:
-                try:
-                    members_data, summary = read_members_data()
-                    # 실제 회원 목록 데이터도 포함
-                    member_details = []
-                    for member in members_data[:10]:  # 최대 10명까지만 전달
-                        member_details.append({
-                            "이름": member.get('name'),
-                            "전화번호": member.get('phone'),
-                            "이메일": member.get('email'),
-                            "멤버십": member.get('membership_type'),
-                            "성별": member.get('gender'),
-                            "나이": member.get('age'),
-                            "월회비": member.get('monthly_fee'),
-                            "결제상태": member.get('payment_status'),
-                            "주소": member.get('address'),
-                            "직업": member.get('occupation')
-                        })
-                    context_data = f"회원 통계: {summary}\n실제 회원 목록: {member_details}"
-                except Exception as e:
-                    context_data = f"회원 데이터 로드 실패: {str(e)}"
-            elif agent_type == '직원관리' and EXCEL_AVAILABLE:
-                try:
-                    staff_data, summary = read_staff_data()
-                    # 실제 직원 목록 데이터도 포함
-                    staff_details = []
-                    for staff in staff_data:
-                        staff_details.append({
-                            "이름": staff.get('name'),
-                            "전화번호": staff.get('phone'),
-                            "이메일": staff.get('email'),
-                            "직책": staff.get('position'),
-                            "부서": staff.get('department'),
-                            "월급여": staff.get('monthly_salary'),
-                            "근무상태": staff.get('status'),
-                            "담당구역": staff.get('area'),
-                            "자격증": staff.get('certification')
-                        })
-                    context_data = f"직원 통계: {summary}\n실제 직원 목록: {staff_details}"
-                except Exception as e:
-                    context_data = f"직원 데이터 로드 실패: {str(e)}"
-            elif agent_type == '재고관리' and EXCEL_AVAILABLE:
-                try:
-                    inventory_data, summary, low_stock_data = read_inventory_data()
-                    # 실제 재고 목록 데이터도 포함
-                    inventory_details = []
-                    for item in inventory_data:
-                        inventory_details.append({
-                            "품목명": item.get('item_name'),
-                            "현재재고": item.get('current_stock'),
-                            "최소재고": item.get('min_stock_level'),
-                            "카테고리": item.get('category'),
-                            "상태": item.get('status'),
-                            "단가": item.get('unit_price')
-                        })
-                    context_data = f"재고 통계: {summary}\n실제 재고 목록: {inventory_details}\n부족 재고: {low_stock_data}"
-                except Exception as e:
-                    context_data = f"재고 데이터 로드 실패: {str(e)}"
-            elif agent_type == '인사관리' and EXCEL_AVAILABLE:
-                try:
-                    hr_data, summary = read_hr_data()
-                    context_data = f"인사 통계: {summary}\n인사 데이터: {hr_data}"
-                except Exception as e:
-                    context_data = f"인사 데이터 로드 실패: {str(e)}"
+            modification_result, snapshot, context_data = self._prepare_chat(agent_type, user_message)
             
-            # 데이터 수정 요청 감지 및 처리
-            modification_result = self._handle_data_modification(user_message, agent_type)
             if modification_result:
                 response_message = modification_result
             # OpenAI API를 사용한 응답 생성
             elif OPENAI_AVAILABLE:
                 print(f"🔍 OpenAI에게 전달되는 컨텍스트 데이터: {context_data[:500]}...")  # 디버깅용 로그
-                response_message = self._get_openai_response(user_message, agent_type, context_data)
+                response_message = self._get_openai_response(user_message, agent_type, context_data, use_cache, snapshot["version"])
             else:
                 # Fallback: 기존 키워드 기반 응답
-                if agent_type == '회원관리':
-                    response_message = self._get_member_agent_response(user_message)
-                elif agent_type == '직원관리':
-                    response_message = self._get_staff_agent_response(user_message)
-                elif agent_type == '인사관리':
-                    response_message = self._get_hr_agent_response(user_message)
-                elif agent_type == '재고관리':
-                    response_message = self._get_inventory_agent_response(user_message)
-                else:
-                    response_message = f"안녕하세요! {agent_type} AI 어시스턴트입니다. 무엇을 도와드릴까요?"
+                response_message = self._get_fallback_response(user_message, agent_type, snapshot)
             
             # 표 데이터 추출 시도
-            table_data = self._extract_table_data(user_message, agent_type, context_data)
+            table_data = self._extract_table_data(user_message, agent_type, context_data, snapshot)
             
             # 응답 데이터 구성
-            response_data = {
-                "message": response_message,
-                "agent_type": agent_type,
-                "timestamp": "2024-06-24T09:45:00Z",
-                "agent_info": {
-                    "name": f"{agent_type} AI",
-                    "role": f"{agent_type} 전문가",
-                    "status": "online"
-                },
-                "table_data": table_data  # 표 데이터 추가
-            }
+            response_data = self._build_chat_response_data(agent_type, response_message, table_data)
             
             print(f"✅ {agent_type} 응답 생성 완료 (OpenAI: {OPENAI_AVAILABLE})")
             self._send_json_response(response_data)
@@ -536,30 +619,78 @@ class APIHandler(BaseHTTPRequestHandler):
                 "details": str(e)
             }, 500)
     
-    def _get_member_agent_response(self, user_message):
-        """회원관리 AI 응답 생성"""
-        if EXCEL_AVAILABLE:
+    def _handle_chat_stream_request(self, agent_type, post_data):
+        """채팅 요청 스트리밍 처리 (SSE)
+        
+        응답 조각을 도착하는 대로 token 이벤트({"delta": ...})로 보내고, 마지막 done 이벤트로
+        일반 채팅 API 와 같은 응답 데이터(전체 message + table_data)를 보냄
+        (수정 결과/키워드 응답처럼 한 번에 만들어지는 응답은 token 이벤트 하나)
+        """
+        try:
+            request_data = json.loads(post_data.decode('utf-8'))
+            user_message = request_data.get('message', '')
+            use_cache = not self._chat_cache_bypassed(request_data)
+        except (ValueError, AttributeError) as e:
+            return self._send_json_response({
+                "error": "잘못된 채팅 요청 형식입니다",
+                "details": str(e)
+            }, 400)
+        
+        print(f"💬 {agent_type} 채팅 요청 (stream): {user_message}")
+        self._start_event_stream()
+        try:
+            modification_result, snapshot, context_data = self._prepare_chat(agent_type, user_message)
+            
+            if modification_result:
+                response_message = modification_result
+                self._send_event('token', {"delta": response_message})
+            elif OPENAI_AVAILABLE:
+                parts = []
+                with contextlib.closing(self._stream_openai_response(user_message, agent_type, context_data, use_cache, snapshot["version"])) as deltas:
+                    for delta in deltas:
+                        parts.append(delta)
+                        self._send_event('token', {"delta": delta})
+                response_message = ''.join(parts)
+            else:
+                response_message = self._get_fallback_response(user_message, agent_type, snapshot)
+                self._send_event('token', {"delta": response_message})
+            
+            table_data = self._extract_table_data(user_message, agent_type, context_data, snapshot)
+            self._send_event('done', self._build_chat_response_data(agent_type, response_message, table_data))
+            print(f"✅ {agent_type} 스트리밍 응답 완료 (OpenAI: {OPENAI_AVAILABLE})")
+        
+        except ConnectionError:
+            print(f"⚠️ {agent_type} 스트리밍 중 클라이언트 연결이 끊어졌습니다")
+        except Exception as e:
+            print(f"❌ 채팅 스트리밍 처리 오류: {e}")
             try:
-                members_data, summary = read_members_data()
-            except:
-                members_data, summary = [], {}
-        else:
-            members_data, summary = [], {}
+                self._send_event('error', {
+                    "error": "채팅 요청 처리 중 오류 발생",
+                    "details": str(e)
+                })
+            except ConnectionError:
+                pass
+    
+    def _get_member_agent_response(self, user_message, snapshot=None):
+        """회원관리 AI 응답 생성"""
+        if snapshot is None:
+            snapshot = self._load_chat_snapshot('회원관리')
+        members_data, summary = snapshot["data"], snapshot["summary"]
         
-        message_lower = user_message.lower()
+        intent = route_intent('회원관리', user_message).name
         
         # 인사말 처리
-        if any(word in message_lower for word in ['안녕', '안녕하세요', '하이', '헬로']):
+        if intent == GREETING:
             return f"안녕하세요! 회원관리 AI입니다. 현재 총 {summary.get('총회원수', 0)}명의 회원이 등록되어 있습니다."
         
         # 회원 수 문의
-        elif '회원' in message_lower and ('몇' in message_lower or '수' in message_lower):
+        elif intent == COUNT:
             active_count = summary.get('활성회원', 0)
             total_count = summary.get('총회원수', 0)
             return f"총 회원수: {total_count}명, 활성 회원: {active_count}명, 프리미엄: {summary.get('프리미엄', 0)}명, 일반: {summary.get('일반', 0)}명, VIP: {summary.get('VIP', 0)}명"
         
         # 회원 목록 요청
-        elif '목록' in message_lower or '리스트' in message_lower or '명단' in message_lower:
+        elif intent == LIST:
             if members_data:
                 member_list = "회원 목록:\n"
                 for i, member in enumerate(members_data[:5], 1):  # 최대 5명만 표시
@@ -574,54 +705,47 @@ class APIHandler(BaseHTTPRequestHandler):
                 return "회원 데이터를 불러올 수 없습니다."
         
         # 매출 문의
-        elif '매출' in message_lower or '수익' in message_lower or '수입' in message_lower:
+        elif intent == REVENUE:
             total_revenue = summary.get('총월매출', 0)
             return f"이번 달 총 매출: {total_revenue:,}원, 평균 회원당 매출: {total_revenue // max(summary.get('총회원수', 1), 1):,}원"
         
         # 등록 관련
-        elif '등록' in message_lower or '가입' in message_lower:
+        elif intent == REGISTER:
             return "새 회원 등록을 도와드릴게요. 필요한 정보: 이름, 연락처, 이메일, 희망 등급, 시작일"
         
         # 도움말
-        elif '도움' in message_lower or '기능' in message_lower or '사용법' in message_lower:
+        elif intent == HELP:
             return "회원관리 AI 기능: 회원 수 확인, 회원 목록 보기, 매출 현황, 새 회원 등록, 회원 정보 수정"
         
         # 기본 응답
         else:
             return f"회원관리 관련 문의에 답변드리겠습니다. 현재 {summary.get('총회원수', 0)}명의 회원이 등록되어 있습니다."
     
-    def _get_staff_agent_response(self, user_message):
+    def _get_staff_agent_response(self, user_message, snapshot=None):
         """직원관리 AI 응답 생성"""
-        if EXCEL_AVAILABLE:
-            try:
-                staff_data, summary = read_staff_data()
-                context = f"현재 직원 현황: {summary}"
-            except:
-                staff_data, summary = [], {}
-                context = "직원 데이터를 불러올 수 없습니다."
-        else:
-            staff_data, summary = [], {}
-            context = "샘플 직원 데이터 사용 중"
+        if snapshot is None:
+            snapshot = self._load_chat_snapshot('직원관리')
+        staff_data, summary = snapshot["data"], snapshot["summary"]
         
-        message_lower = user_message.lower()
+        intent = route_intent('직원관리', user_message).name
         
         # 인사말 처리
-        if any(word in message_lower for word in ['안녕', '안녕하세요', '하이', '헬로']):
+        if intent == GREETING:
             return f"안녕하세요! 직원관리 AI입니다. 현재 {summary.get('총직원수', 0)}명의 직원이 근무하고 있습니다."
         
         # 직원 수 문의
-        elif '직원' in message_lower and ('몇' in message_lower or '수' in message_lower):
+        elif intent == COUNT:
             total_staff = summary.get('총직원수', 0)
             active_staff = summary.get('활성직원', 0)
             return f"총 직원 수: {total_staff}명, 활성 직원: {active_staff}명, 총 인건비: {summary.get('총인건비', 0):,}원"
         
         # 직원 목록 요청
-        elif '목록' in message_lower or '리스트' in message_lower or '직원' in message_lower:
+        elif intent == LIST:
             if staff_data:
                 staff_list = "직원 목록:\n"
                 for i, staff in enumerate(staff_data, 1):
-                    status = "활성" if staff.get('근무상태') == '활성' else "비활성"
-                    staff_list += f"{i}. {staff.get('이름', 'N/A')} - {staff.get('직책', 'N/A')} ({staff.get('부서', 'N/A')}) - {staff.get('월급여', 0):,}원 - {status}\n"
+                    status = "활성" if staff.get('status') == '활성' else "비활성"
+                    staff_list += f"{i}. {staff.get('name', 'N/A')} - {staff.get('position', 'N/A')} ({staff.get('department', 'N/A')}) - {staff.get('monthly_salary', 0):,}원 - {status}\n"
                 
                 staff_list += f"총 {len(staff_data)}명 근무 중, 총 인건비: {summary.get('총인건비', 0):,}원"
                 
@@ -630,14 +754,14 @@ class APIHandler(BaseHTTPRequestHandler):
                 return "직원 데이터를 불러올 수 없습니다."
         
         # 급여 관련
-        elif '급여' in message_lower or '인건비' in message_lower or '월급' in message_lower:
+        elif intent == SALARY:
             if staff_data:
                 salary_info = "급여 현황:\n"
                 total_salary = 0
                 for staff in staff_data:
-                    salary = staff.get('월급여', 0)
+                    salary = staff.get('monthly_salary', 0)
                     total_salary += salary
-                    salary_info += f"{staff.get('이름', 'N/A')} ({staff.get('직책', 'N/A')}): {salary:,}원\n"
+                    salary_info += f"{staff.get('name', 'N/A')} ({staff.get('position', 'N/A')}): {salary:,}원\n"
                 
                 salary_info += f"총 인건비: {total_salary:,}원, 평균 급여: {total_salary // len(staff_data) if staff_data else 0:,}원"
                 
@@ -646,62 +770,58 @@ class APIHandler(BaseHTTPRequestHandler):
                 return f"이번 달 총 인건비는 {summary.get('총인건비', 0):,}원입니다."
         
         # 스케줄 관련
-        elif '스케줄' in message_lower or '근무' in message_lower:
+        elif intent == SCHEDULE:
             return "직원 근무 스케줄을 관리합니다. 근무 시간표, 교대 근무, 휴무일 스케줄을 확인할 수 있습니다."
         
         # 도움말
-        elif '도움' in message_lower or '기능' in message_lower or '사용법' in message_lower:
+        elif intent == HELP:
             return "직원관리 AI 기능: 직원 수 확인, 직원 목록 보기, 급여 현황 확인, 근무 스케줄 관리"
         
         # 기본 응답
         else:
             return f"직원관리 관련 문의에 답변드리겠습니다. 현재 {summary.get('총직원수', 0)}명의 직원이 근무하고 있습니다."
     
-    def _get_hr_agent_response(self, user_message):
+    def _get_hr_agent_response(self, user_message, snapshot=None):
         """인사관리 AI 응답 생성"""
-        if EXCEL_AVAILABLE:
-            try:
-                hr_data, summary = read_hr_data()
-                context = f"현재 인사 현황: {summary}"
-            except:
-                context = "인사 데이터를 불러올 수 없습니다."
-        else:
+        if snapshot is None:
+            snapshot = self._load_chat_snapshot('인사관리')
+        if not EXCEL_AVAILABLE:
             context = "샘플 인사 데이터 사용 중"
+        elif snapshot["error"]:
+            context = "인사 데이터를 불러올 수 없습니다."
+        else:
+            context = f"현재 인사 현황: {snapshot['summary']}"
         
-        message_lower = user_message.lower()
-        if '급여' in message_lower:
+        intent = route_intent('인사관리', user_message).name
+        if intent == SALARY:
             return "급여 관리 시스템을 통해 모든 직원의 급여를 체계적으로 관리하고 있습니다. 특정 직원의 급여 정보를 확인하시겠어요?"
-        elif '근태' in message_lower or '출근' in message_lower:
+        elif intent == ATTENDANCE:
             return "근태 관리 시스템으로 출근, 퇴근, 휴가 등을 관리합니다. 어떤 근태 정보를 확인하시겠어요?"
-        elif '휴가' in message_lower:
+        elif intent == VACATION:
             return "휴가 신청 및 승인 현황을 관리합니다. 휴가 관련 문의사항이 있으시면 말씀해 주세요."
         else:
             return f"인사관리 관련 문의에 답변드리겠습니다. 현재 {context}입니다. 급여, 근태, 휴가 등 어떤 업무를 도와드릴까요?"
     
-    def _get_inventory_agent_response(self, user_message):
+    def _get_inventory_agent_response(self, user_message, snapshot=None):
         """재고관리 AI 응답 생성"""
-        if EXCEL_AVAILABLE:
-            try:
-                inventory_data, summary, low_stock_data = read_inventory_data()
-            except:
-                inventory_data, summary, low_stock_data = [], {}, []
-        else:
-            inventory_data, summary, low_stock_data = [], {}, []
+        if snapshot is None:
+            snapshot = self._load_chat_snapshot('재고관리')
+        inventory_data, summary, low_stock_data = snapshot["data"], snapshot["summary"], snapshot["low_stock"]
         
-        message_lower = user_message.lower()
+        intent = route_intent('재고관리', user_message).name
         
         # 인사말 처리
-        if any(word in message_lower for word in ['안녕', '안녕하세요', '하이', '헬로']):
+        if intent == GREETING:
             return f"안녕하세요! 재고관리 AI입니다. 현재 {summary.get('총품목수', 0)}개 품목을 관리하고 있으며, {len(low_stock_data)}개 품목이 부족 상태입니다."
         
         # 재고 현황 문의
-        elif '재고' in message_lower and ('몇' in message_lower or '수' in message_lower or '현황' in message_lower):
+        elif intent == COUNT:
             total_items = summary.get('총품목수', 0)
             normal_items = summary.get('정상재고', 0)
             return f"총 관리 품목: {total_items}개, 정상 재고: {normal_items}개, 부족 재고: {len(low_stock_data)}개, 총 재고 가치: {summary.get('총재고가치', 0):,}원"
         
         # 부족 재고 문의
-        elif '부족' in message_lower or '부족재고' in message_lower or '알림' in message_lower:
+        elif intent == LOW_STOCK:
             if low_stock_data:
                 alert_msg = "부족 재고 알림:\n"
                 for item in low_stock_data:
@@ -714,7 +834,7 @@ class APIHandler(BaseHTTPRequestHandler):
                 return "현재 부족한 재고가 없습니다. 모든 품목이 최소 재고량 이상으로 유지되고 있습니다."
         
         # 품목 목록 요청
-        elif '목록' in message_lower or '리스트' in message_lower or '품목' in message_lower:
+        elif intent == LIST:
             if inventory_data:
                 item_list = "재고 품목 목록:\n"
                 for i, item in enumerate(inventory_data[:5], 1):
@@ -729,7 +849,7 @@ class APIHandler(BaseHTTPRequestHandler):
                 return "재고 데이터를 불러올 수 없습니다."
         
         # 주문 관련
-        elif '주문' in message_lower or '발주' in message_lower or '구매' in message_lower:
+        elif intent == ORDER:
             if low_stock_data:
                 order_msg = "주문 권장 품목:\n"
                 total_cost = 0
@@ -747,7 +867,7 @@ class APIHandler(BaseHTTPRequestHandler):
                 return "현재 주문이 필요한 품목이 없습니다. 모든 재고가 충분한 상태입니다."
         
         # 도움말
-        elif '도움' in message_lower or '기능' in message_lower or '사용법' in message_lower:
+        elif intent == HELP:
             return "재고관리 AI 기능: 재고 현황 확인, 품목 목록 보기, 부족 재고 알림, 주문 권장 품목, 발주 계획 수립"
         
         # 기본 응답
@@ -795,8 +915,84 @@ class APIHandler(BaseHTTPRequestHandler):
             print(f"❌ 파일 목록 조회 오류: {str(e)}")
             self._send_json_response({"error": f"파일 목록 조회 실패: {str(e)}"}, 500)
 
+    def _is_not_modified(self, etag, mtime):
+        """If-None-Match / If-Modified-Since 조건부 요청 확인"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match:
+            candidates = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+            return '*' in candidates or etag in candidates
+        
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            return since is not None and int(mtime) <= since.timestamp()
+        return False
+
+    def _parse_range(self, file_size, etag, last_modified):
+        """단일 bytes Range 헤더 해석 -> (start, end) / None(전체) / 'invalid'"""
+        range_header = self.headers.get('Range')
+        if not range_header or not range_header.startswith('bytes='):
+            return None
+        
+        # If-Range 가 현재 파일과 다르면 전체 전송
+        if_range = self.headers.get('If-Range')
+        if if_range and if_range.strip() not in (etag, last_modified):
+            return None
+        
+        spec = range_header[len('bytes='):].strip()
+        if ',' in spec:
+            return None  # 다중 범위는 지원하지 않으므로 전체 전송
+        
+        start_str, _, end_str = spec.partition('-')
+        try:
+            if start_str == '':
+                # 마지막 N 바이트
+                length = int(end_str)
+                if length <= 0:
+                    return 'invalid'
+                start, end = max(file_size - length, 0), file_size - 1
+            else:
+                start = int(start_str)
+                end = int(end_str) if end_str else file_size - 1
+        except ValueError:
+            return None
+        
+        if start >= file_size or start > end:
+            return 'invalid'
+        return start, min(end, file_size - 1)
+
+    def _send_file_body(self, f, offset, count):
+        """파일 내용을 메모리에 올리지 않고 전송 (가능하면 os.sendfile)"""
+        connection = getattr(self, 'connection', None)
+        if connection is not None and hasattr(os, 'sendfile'):
+            try:
+                self.wfile.flush()
+                while count > 0:
+                    sent = os.sendfile(connection.fileno(), f.fileno(), offset, count)
+                    if sent == 0:
+                        break
+                    offset += sent
+                    count -= sent
+                return
+            except (BrokenPipeError, ConnectionResetError):
+                raise
+            except (AttributeError, OSError, ValueError):
+                # sendfile을 지원하지 않는 소켓이면 남은 부분을 일반 청크 전송으로
+                pass
+        
+        f.seek(offset)
+        while count > 0:
+            chunk = f.read(min(DOWNLOAD_CHUNK_SIZE, count))
+            if not chunk:
+                break
+            self.wfile.write(chunk)
+            count -= len(chunk)
+
     def _handle_file_download(self, file_path):
-        """📥 파일 다운로드"""
+        """📥 파일 다운로드 (스트리밍 + Range + 조건부 요청)"""
         try:
             print(f"📥 파일 다운로드 요청: {file_path}")
             
@@ -805,69 +1001,95 @@ class APIHandler(BaseHTTPRequestHandler):
             excel_dir = os.path.join(script_dir, 'app', 'data', 'excel')
             full_path = os.path.join(excel_dir, file_path)
             
-            print(f"🔍 스크립트 디렉토리: {script_dir}")
-            print(f"🔍 Excel 디렉토리: {excel_dir}")
-            print(f"🔍 요청된 파일 경로: {file_path}")
-            print(f"🔍 전체 파일 경로: {full_path}")
-            print(f"🔍 파일 존재 여부: {os.path.exists(full_path)}")
-            
-            # 디렉토리 내용 확인
-            if '/' in file_path:
-                category = file_path.split('/')[0]
-                category_path = os.path.join(excel_dir, category)
-                if os.path.exists(category_path):
-                    print(f"🔍 {category} 디렉토리 내용: {os.listdir(category_path)}")
-            
-            if not os.path.exists(full_path):
+            # Excel 디렉토리 밖의 경로는 허용하지 않음
+            if not os.path.realpath(full_path).startswith(os.path.realpath(excel_dir) + os.sep) or not os.path.isfile(full_path):
                 self._send_json_response({"error": "파일을 찾을 수 없습니다", "path": full_path}, 404)
                 return
             
-            # 파일 읽기
+            self._flush_pending_changes(file_path.split('/')[0])
             with open(full_path, 'rb') as f:
-                file_content = f.read()
-            
-            # 응답 헤더 설정
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-            self.send_header('Content-Disposition', f'attachment; filename="{os.path.basename(file_path)}"')
-            self.send_header('Content-Length', str(len(file_content)))
-            self._set_cors_headers()
-            self.end_headers()
+                stat = os.fstat(f.fileno())
+                file_size = stat.st_size
+                etag = f'"{stat.st_mtime_ns:x}-{file_size:x}"'
+                last_modified = email.utils.formatdate(stat.st_mtime, usegmt=True)
+                
+                # 변경되지 않은 파일은 304
+                if self._is_not_modified(etag, stat.st_mtime):
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Last-Modified', last_modified)
+                    self._set_cors_headers()
+                    self.end_headers()
+                    return
+                
+                byte_range = self._parse_range(file_size, etag, last_modified)
+                if byte_range == 'invalid':
+                    self.send_response(416)
+                    self.send_header('Content-Range', f'bytes */{file_size}')
+                    self.send_header('Content-Length', '0')
+                    self._set_cors_headers()
+                    self.end_headers()
+                    return
+                
+                start, end = byte_range if byte_range else (0, file_size - 1)
+                length = max(end - start + 1, 0)
+                
+                # 응답 헤더 설정
+                filename = os.path.basename(file_path)
+                ascii_name = filename.encode('ascii', 'ignore').decode('ascii') or 'download.xlsx'
+                self.send_response(206 if byte_range else 200)
+                self.send_header('Content-Type', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+                self.send_header('Content-Disposition',
+                                 f'attachment; filename="{ascii_name}"; filename*=UTF-8\'\'{urllib.parse.quote(filename)}')
+                self.send_header('Content-Length', str(length))
+                self.send_header('Accept-Ranges', 'bytes')
+                self.send_header('ETag', etag)
+                self.send_header('Last-Modified', last_modified)
+                if byte_range:
+                    self.send_header('Content-Range', f'bytes {start}-{end}/{file_size}')
+                self._set_cors_headers()
+                self.end_headers()
+                
+                # 파일 내용 전송
+                self._send_file_body(f, start, length)
             
-            # 파일 내용 전송
-            self.wfile.write(file_content)
-            print(f"✅ 파일 다운로드 완료: {file_path}")
+            print(f"✅ 파일 다운로드 완료: {file_path} ({length} bytes)")
             
+        except (BrokenPipeError, ConnectionResetError):
+            print(f"⚠️ 파일 다운로드 중 연결 종료: {file_path}")
         except Exception as e:
             print(f"❌ 파일 다운로드 오류: {str(e)}")
             import traceback
             traceback.print_exc()
             self._send_json_response({"error": f"파일 다운로드 실패: {str(e)}"}, 500)
 
-    def _handle_file_preview(self, file_path):
-        """👀 파일 미리보기"""
+    def _get_int_param(self, query, name, default, minimum=0, maximum=None):
+        """쿼리 문자열의 정수 파라미터 (범위 밖이면 잘라냄)"""
+        try:
+            value = int(query.get(name, [default])[0])
+        except (TypeError, ValueError):
+            value = default
+        value = max(value, minimum)
+        if maximum is not None:
+            value = min(value, maximum)
+        return value
+
+    def _handle_file_preview(self, file_path, query=None):
+        """👀 파일 미리보기 (시트 선택 + 행/열 페이지 단위)"""
+        workbook = None
         try:
             print(f"👀 파일 미리보기 요청: {file_path}")
             
+            query = query or {}
+            sheet_param = query.get('sheet', [None])[0]
+            row_offset = self._get_int_param(query, 'row_offset', 0)
+            row_limit = self._get_int_param(query, 'row_limit', PREVIEW_DEFAULT_ROWS, 1, PREVIEW_MAX_ROWS)
+            col_offset = self._get_int_param(query, 'col_offset', 0)
+            col_limit = self._get_int_param(query, 'col_limit', PREVIEW_DEFAULT_COLS, 1, PREVIEW_MAX_COLS)
+            
             script_dir = os.path.dirname(os.path.abspath(__file__))
             full_path = os.path.join(script_dir, 'app', 'data', 'excel', file_path)
             
-            print(f"🔍 미리보기 파일 경로: {full_path}")
-            print(f"🔍 파일 존재 여부: {os.path.exists(full_path)}")
-            
-            # 디렉토리 구조 확인
-            excel_dir = os.path.join(script_dir, 'app', 'data', 'excel')
-            print(f"🔍 Excel 디렉토리: {excel_dir}")
-            if os.path.exists(excel_dir):
-                print(f"🔍 Excel 디렉토리 내용: {os.listdir(excel_dir)}")
-                
-                # 카테고리별 디렉토리 확인
-                if '/' in file_path:
-                    category = file_path.split('/')[0]
-                    category_path = os.path.join(excel_dir, category)
-                    if os.path.exists(category_path):
-                        print(f"🔍 {category} 디렉토리 내용: {os.listdir(category_path)}")
-            
             if not os.path.exists(full_path):
                 self._send_json_response({
                     "error": "파일을 찾을 수 없습니다",
@@ -876,35 +1098,43 @@ class APIHandler(BaseHTTPRequestHandler):
                 }, 404)
                 return
             
-            # Excel 파일 읽기
-            print("📖 Excel 파일 읽기 시작...")
-            workbook = openpyxl.load_workbook(full_path)
-            sheets_data = {}
+            self._flush_pending_changes(file_path.split('/')[0])
+            
+            # 읽기 전용 스트리밍 모드: 요청한 범위의 행만 읽음
+            workbook = openpyxl.load_workbook(full_path, read_only=True)
             
-            for sheet_name in workbook.sheetnames:
-                print(f"📄 시트 처리 중: {sheet_name}")
+            if sheet_param is not None and sheet_param not in workbook.sheetnames:
+                self._send_json_response({
+                    "error": f"시트를 찾을 수 없습니다: {sheet_param}",
+                    "sheet_names": workbook.sheetnames
+                }, 404)
+                return
+            
+            sheets_data = {}
+            for sheet_name in ([sheet_param] if sheet_param is not None else workbook.sheetnames):
                 sheet = workbook[sheet_name]
+                total_rows = sheet.max_row or 0
+                total_cols = sheet.max_column or 0
                 
-                # 시트 데이터를 리스트로 변환 (최대 100행까지만)
+                # 요청 범위를 시트 크기에 맞춤
+                min_col = col_offset + 1
+                max_col = min(total_cols, col_offset + col_limit) if total_cols else col_offset + col_limit
                 data = []
-                max_rows = min(sheet.max_row or 1, 100)
-                max_cols = min(sheet.max_column or 1, 20)
-                
-                for row in range(1, max_rows + 1):
-                    row_data = []
-                    for col in range(1, max_cols + 1):
-                        try:
-                            cell_value = sheet.cell(row=row, column=col).value
-                            row_data.append(str(cell_value) if cell_value is not None else "")
-                        except Exception as cell_error:
-                            print(f"⚠️ 셀 읽기 오류 ({row}, {col}): {cell_error}")
-                            row_data.append("")
-                    data.append(row_data)
+                if max_col >= min_col:
+                    for row in sheet.iter_rows(min_row=row_offset + 1, max_row=row_offset + row_limit,
+                                               min_col=min_col, max_col=max_col, values_only=True):
+                        data.append([str(value) if value is not None else "" for value in row])
                 
                 sheets_data[sheet_name] = {
                     'data': data,
-                    'total_rows': sheet.max_row or 0,
-                    'total_cols': sheet.max_column or 0
+                    'total_rows': total_rows,
+                    'total_cols': total_cols,
+                    'row_offset': row_offset,
+                    'row_limit': row_limit,
+                    'col_offset': col_offset,
+                    'col_limit': col_limit,
+                    'has_more_rows': row_offset + len(data) < total_rows,
+                    'has_more_cols': col_offset + col_limit < total_cols
                 }
             
             response_data = {
@@ -924,6 +1154,9 @@ class APIHandler(BaseHTTPRequestHandler):
                 "error": f"파일 미리보기 실패: {str(e)}",
                 "details": str(e)
             }, 500)
+        finally:
+            if workbook is not None:
+                workbook.close()
 
     def _handle_file_upload(self, post_data):
         """📤 파일 업로드"""
@@ -940,18 +1173,28 @@ class APIHandler(BaseHTTPRequestHandler):
             if not all([filename, category, file_content]):
                 self._send_json_response({"error": "필수 파라미터가 누락되었습니다"}, 400)
                 return
+            # 스트리밍 업로드와 같은 검사 (카테고리 디렉터리 밖이나 .xlsx 가 아닌 파일로 저장하지 않음)
+            if (category not in ('members', 'staff', 'hr', 'inventory') or not isinstance(filename, str)
+                    or os.path.basename(filename) != filename or not self._is_valid_excel_file(filename)):
+                self._send_json_response({"error": "유효하지 않은 파일 이름입니다"}, 400)
+                return
             
             # 파일 저장 경로
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            save_dir = os.path.join(script_dir, 'app', 'data', 'excel', category)
+            save_dir = os.path.join(EXCEL_DATA_DIR, category)
             os.makedirs(save_dir, exist_ok=True)
             
             save_path = os.path.join(save_dir, filename)
             
             # base64 디코딩 후 파일 저장
             file_bytes = base64.b64decode(file_content)
-            with open(save_path, 'wb') as f:
-                f.write(file_bytes)
+            with self._category_write_lock(category):
+                # 기존 워크북에 남은 수정분을 먼저 반영해야 덮어쓴 뒤 되살아나지 않음
+                self._flush_pending_changes(category)
+                # 임시 파일에 쓴 뒤 교체 (동시에 읽는 요청이 쓰다 만 파일을 보지 않도록)
+                write_bytes_atomically(save_path, file_bytes)
+            
+            if EXCEL_AVAILABLE:
+                invalidate_excel_cache(category)
             
             response_data = {
                 'success': True,
@@ -968,6 +1211,178 @@ class APIHandler(BaseHTTPRequestHandler):
             print(f"❌ 파일 업로드 오류: {str(e)}")
             self._send_json_response({"error": f"파일 업로드 실패: {str(e)}"}, 500)
 
+    def _handle_stream_upload(self, category, filename):
+        """📤 파일 업로드 (요청 본문을 그대로 임시 파일에 나눠 쓰고, 검증 후 원자적으로 교체)"""
+        # 본문을 읽지 않고 거절하는 경우 남은 본문이 다음 요청으로 읽히지 않도록 연결 종료
+        length_header = self.headers.get('Content-Length')
+        if length_header is None:
+            self.close_connection = True
+            self._send_json_response({"error": "Content-Length 헤더가 필요합니다"}, 411)
+            return
+        try:
+            content_length = int(length_header)
+        except ValueError:
+            content_length = -1
+        if content_length <= 0:
+            self.close_connection = True
+            self._send_json_response({"error": "업로드할 파일 내용이 없습니다"}, 400)
+            return
+        if content_length > UPLOAD_MAX_BYTES:
+            self.close_connection = True
+            self._send_json_response({"error": f"파일이 너무 큽니다 (최대 {UPLOAD_MAX_BYTES // (1024 * 1024)}MB)"}, 413)
+            return
+        if os.path.basename(filename) != filename or not self._is_valid_excel_file(filename):
+            self.close_connection = True
+            self._send_json_response({"error": "유효하지 않은 파일 이름입니다"}, 400)
+            return
+        
+        print(f"📤 스트리밍 업로드 요청: {category}/{filename} ({content_length} bytes)")
+        save_dir = os.path.join(EXCEL_DATA_DIR, category)
+        os.makedirs(save_dir, exist_ok=True)
+        save_path = os.path.join(save_dir, filename)
+        
+        tmp_path = create_temp_file(save_path, suffix='.xlsx')
+        try:
+            # 청크 단위로 받아 임시 파일에 기록 (본문 전체를 메모리에 올리지 않음)
+            remaining = content_length
+            with open(tmp_path, 'wb') as f:
+                while remaining > 0:
+                    chunk = self.rfile.read(min(UPLOAD_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    remaining -= len(chunk)
+            if remaining > 0:
+                self.close_connection = True
+                self._send_json_response({"error": "업로드가 중간에 끊겼습니다"}, 400)
+                return
+            
+            if not _is_xlsx_package(tmp_path):
+                self._send_json_response({"error": "올바른 Excel(xlsx) 파일이 아닙니다"}, 415)
+                return
+            
+            # 잠금은 교체하는 순간에만 (느린 업로드 동안 다른 쓰기를 막지 않음)
+            with self._category_write_lock(category):
+                self._flush_pending_changes(category)
+                commit_temp_file(tmp_path, save_path)
+            
+            if EXCEL_AVAILABLE:
+                invalidate_excel_cache(category)
+        except Exception as e:
+            print(f"❌ 파일 업로드 오류: {str(e)}")
+            self._send_json_response({"error": f"파일 업로드 실패: {str(e)}"}, 500)
+            return
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        
+        self._send_json_response({
+            'success': True,
+            'message': '파일이 성공적으로 업로드되었습니다',
+            'filename': filename,
+            'category': category,
+            'path': f"{category}/{filename}",
+            'size': content_length
+        })
+        print(f"✅ 파일 업로드 완료: {filename}")
+
+    def _handle_create_record(self, category, post_data):
+        """➕ 새 회원/직원/품목 추가 (번호는 서버에서 발급)"""
+        if not EXCEL_AVAILABLE:
+            self._send_json_response({"error": "Excel 모듈을 사용할 수 없습니다"}, 503)
+            return
+        
+        try:
+            fields = json.loads(post_data.decode('utf-8'))
+        except ValueError:
+            self._send_json_response({"error": "잘못된 JSON 형식입니다"}, 400)
+            return
+        if not isinstance(fields, dict) or not fields:
+            self._send_json_response({"error": "추가할 항목 값이 필요합니다"}, 400)
+            return
+        
+        success, message, new_id = add_new_record(category, fields)
+        if not success:
+            self._send_json_response({"success": False, "error": message}, 400)
+            return
+        self._send_json_response({"success": True, "message": message, "id": new_id}, 201)
+
+    def _handle_bulk_request(self, category, post_data):
+        """📦 일괄 수정/추가 (전체 검증 후 한 번의 로드-수정-저장)"""
+        if not EXCEL_AVAILABLE:
+            self._send_json_response({"error": "Excel 모듈을 사용할 수 없습니다"}, 503)
+            return
+        
+        try:
+            data = json.loads(post_data.decode('utf-8'))
+        except ValueError:
+            self._send_json_response({"error": "잘못된 JSON 형식입니다"}, 400)
+            return
+        
+        operations = data.get('operations') if isinstance(data, dict) else None
+        if not isinstance(operations, list) or not operations:
+            self._send_json_response({"error": "operations 목록이 필요합니다"}, 400)
+            return
+        if len(operations) > BULK_MAX_OPERATIONS:
+            self._send_json_response({"error": f"한 번에 최대 {BULK_MAX_OPERATIONS}건까지 처리할 수 있습니다"}, 413)
+            return
+        
+        print(f"📦 일괄 처리 요청: {category} {len(operations)}건")
+        result = apply_bulk_changes(category, operations, partial=bool(data.get('partial')))
+        
+        if result["success"]:
+            status = 200
+        elif result.get("error"):
+            status = 404
+        else:
+            status = 400
+        self._send_json_response(result, status)
+    
+    def _handle_backup_list(self, query):
+        """🗄️ 백업 목록 (file 파라미터로 파일별 조회)"""
+        file_path = query.get('file', [None])[0]
+        backups = BACKUP_STORE.list_backups(file_path)
+        self._send_json_response({
+            "backups": backups,
+            "total_count": len(backups),
+            "stored_bytes": sum(entry['stored_size'] for entry in {entry['sha256']: entry for entry in backups}.values())
+        })
+    
+    def _handle_backup_restore(self, backup_id):
+        """♻️ 백업으로 파일 복원 (복원 직전 상태도 백업)"""
+        try:
+            entry = BACKUP_STORE.find(backup_id)
+            if entry is None:
+                self._send_json_response({"error": "백업을 찾을 수 없습니다", "id": backup_id}, 404)
+                return
+            
+            full_path = os.path.join(EXCEL_DATA_DIR, entry['file'])
+            if not os.path.realpath(full_path).startswith(os.path.realpath(EXCEL_DATA_DIR) + os.sep):
+                self._send_json_response({"error": "잘못된 백업 경로입니다"}, 400)
+                return
+            
+            category = entry['file'].split('/')[0]
+            with self._category_write_lock(category):
+                self._flush_pending_changes(category)
+                previous = BACKUP_STORE.create(entry['file'], full_path, reason='pre-restore') if os.path.exists(full_path) else None
+                BACKUP_STORE.restore(entry, full_path)
+            
+            if EXCEL_AVAILABLE:
+                invalidate_excel_cache(category)
+            
+            self._send_json_response({
+                'success': True,
+                'message': '백업에서 복원되었습니다',
+                'restored': entry['id'],
+                'file': entry['file'],
+                'backup_created': previous['id'] if previous else None
+            })
+            print(f"♻️ 백업 복원 완료: {entry['file']} <- {entry['id']}")
+            
+        except Exception as e:
+            print(f"❌ 백업 복원 오류: {str(e)}")
+            self._send_json_response({"error": f"백업 복원 실패: {str(e)}"}, 500)
+    
     def _handle_file_save(self, file_path, post_data):
         """💾 파일 저장 (수정된 데이터)"""
         try:
@@ -983,33 +1398,38 @@ class APIHandler(BaseHTTPRequestHandler):
             script_dir = os.path.dirname(os.path.abspath(__file__))
             full_path = os.path.join(script_dir, 'app', 'data', 'excel', file_path)
             
-            # 기존 파일 백업
-            backup_path = full_path + f".backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            if os.path.exists(full_path):
-                shutil.copy2(full_path, backup_path)
+            with self._category_write_lock(file_path.split('/')[0]):
+                # 저장 대기 중인 수정분까지 백업에 포함되도록 먼저 반영
+                self._flush_pending_changes(file_path.split('/')[0])
+                
+                # 기존 파일 백업 (내용이 같은 백업은 중복 저장하지 않음)
+                backup = BACKUP_STORE.create(file_path, full_path) if os.path.exists(full_path) else None
             
-            # 새 워크북 생성
-            workbook = openpyxl.Workbook()
+                # 새 워크북 생성
+                workbook = openpyxl.Workbook()
             
-            # 기본 시트 제거
-            if 'Sheet' in workbook.sheetnames:
-                workbook.remove(workbook['Sheet'])
+                # 기본 시트 제거
+                if 'Sheet' in workbook.sheetnames:
+                    workbook.remove(workbook['Sheet'])
             
-            # 각 시트 데이터 저장
-            for sheet_name, sheet_data in sheets_data.items():
-                ws = workbook.create_sheet(title=sheet_name)
+                # 각 시트 데이터 저장
+                for sheet_name, sheet_data in sheets_data.items():
+                    ws = workbook.create_sheet(title=sheet_name)
                 
-                for row_idx, row_data in enumerate(sheet_data['data'], 1):
-                    for col_idx, cell_value in enumerate(row_data, 1):
-                        ws.cell(row=row_idx, column=col_idx, value=cell_value)
+                    for row_idx, row_data in enumerate(sheet_data['data'], 1):
+                        for col_idx, cell_value in enumerate(row_data, 1):
+                            ws.cell(row=row_idx, column=col_idx, value=cell_value)
+                
+                # 파일 저장 (임시 파일에 쓴 뒤 교체)
+                atomic_write(full_path, workbook.save, suffix='.xlsx')
             
-            # 파일 저장
-            workbook.save(full_path)
+            if EXCEL_AVAILABLE:
+                invalidate_excel_cache(file_path.split('/')[0])
             
             response_data = {
                 'success': True,
                 'message': '파일이 성공적으로 저장되었습니다',
-                'backup_created': os.path.basename(backup_path) if os.path.exists(full_path) else None
+                'backup_created': backup['id'] if backup else None
             }
             
             self._send_json_response(response_data)
@@ -1019,6 +1439,26 @@ class APIHandler(BaseHTTPRequestHandler):
             print(f"❌ 파일 저장 오류: {str(e)}")
             self._send_json_response({"error": f"파일 저장 실패: {str(e)}"}, 500)
 
+    def _send_static_asset(self, asset):
+        """캐시된 정적 파일 전송 (Accept-Encoding에 맞는 압축본, ETag 재검증)"""
+        encoding, body = asset.select(self.headers.get('Accept-Encoding'))
+        not_modified = asset.matches_etag(self.headers.get('If-None-Match'))
+        
+        self.send_response(304 if not_modified else 200)
+        if not not_modified:
+            self.send_header('Content-Type', asset.content_type)
+            self.send_header('Content-Length', str(len(body)))
+            if encoding:
+                self.send_header('Content-Encoding', encoding)
+        self.send_header('ETag', asset.etag(encoding))
+        self.send_header('Cache-Control', asset.cache_control)
+        self.send_header('Vary', 'Accept-Encoding')
+        self._set_cors_headers()
+        self.end_headers()
+        
+        if not not_modified:
+            self.wfile.write(body)
+    
     def do_OPTIONS(self):
         """OPTIONS 요청 처리 (CORS preflight)"""
         self.send_response(200)
@@ -1035,70 +1475,28 @@ class APIHandler(BaseHTTPRequestHandler):
         
         # 정적 파일 서빙 (프론트엔드)
         if path == '/' or path == '/index.html':
-            try:
-                script_dir = os.path.dirname(os.path.abspath(__file__))
-                static_dir = os.path.join(script_dir, 'static')
-                index_path = os.path.join(static_dir, 'index.html')
-                
-                if os.path.exists(index_path):
-                    with open(index_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'text/html; charset=utf-8')
-                    self._set_cors_headers()
-                    self.end_headers()
-                    self.wfile.write(content.encode('utf-8'))
-                    return
-                else:
-                    # static 폴더가 없으면 기본 JSON 응답
-                    self._send_json_response({
-                        "message": "🏋️ Gym AI 백엔드 서버 실행 중!",
-                        "status": "success",
-                        "version": "basic-http-1.0",
-                        "excel_available": EXCEL_AVAILABLE,
-                        "note": "프론트엔드 파일이 없습니다. 'npm run build' 후 static 폴더에 복사하세요."
-                    })
-                    return
-            except Exception as e:
-                print(f"정적 파일 서빙 오류: {e}")
-                self._send_json_response({"error": str(e)}, 500)
-                return
+            if STATIC_ASSETS.index is not None:
+                self._send_static_asset(STATIC_ASSETS.index)
+            else:
+                # static 폴더가 없으면 기본 JSON 응답
+                self._send_json_response({
+                    "message": "🏋️ Gym AI 백엔드 서버 실행 중!",
+                    "status": "success",
+                    "version": "basic-http-1.0",
+                    "excel_available": EXCEL_AVAILABLE,
+                    "note": "프론트엔드 파일이 없습니다. 'npm run build' 후 static 폴더에 복사하세요."
+                })
+            return
         
         # CSS, JS 파일 서빙
         if path.startswith('/assets/'):
-            try:
-                script_dir = os.path.dirname(os.path.abspath(__file__))
-                static_dir = os.path.join(script_dir, 'static')
-                file_path = os.path.join(static_dir, path[1:])  # '/' 제거
-                
-                if os.path.exists(file_path):
-                    with open(file_path, 'rb') as f:
-                        content = f.read()
-                    
-                    # 파일 확장자에 따른 Content-Type 설정
-                    if file_path.endswith('.css'):
-                        content_type = 'text/css'
-                    elif file_path.endswith('.js'):
-                        content_type = 'application/javascript'
-                    else:
-                        content_type = 'application/octet-stream'
-                    
-                    self.send_response(200)
-                    self.send_header('Content-Type', content_type)
-                    self._set_cors_headers()
-                    self.end_headers()
-                    self.wfile.write(content)
-                    return
-                else:
-                    self.send_response(404)
-                    self.end_headers()
-                    return
-            except Exception as e:
-                print(f"정적 파일 서빙 오류: {e}")
-                self.send_response(500)
+            asset = STATIC_ASSETS.get(path)
+            if asset is not None:
+                self._send_static_asset(asset)
+            else:
+                self.send_response(404)
                 self.end_headers()
-                return
+            return
         
         # 인증 관련
         if path == '/api/v1/auth/me':
@@ -1260,6 +1658,40 @@ class APIHandler(BaseHTTPRequestHandler):
                 })
                 return
         
+        # 단건 조회 API (번호 인덱스로 바로 찾음)
+        record_match = RECORD_ROUTE_PATTERN.match(path)
+        if record_match:
+            category, record_id = record_match.group(1), int(record_match.group(2))
+            if not EXCEL_AVAILABLE:
+                self._send_json_response({"error": "Excel 모듈을 사용할 수 없습니다"}, 503)
+                return
+            try:
+                record = get_record_by_id(category, record_id)
+            except Exception as e:
+                print(f"❌ 단건 조회 오류: {e}")
+                self._send_json_response({"error": "데이터 읽기 실패", "message": str(e)}, 500)
+                return
+            
+            if record is None:
+                self._send_json_response({"error": "데이터를 찾을 수 없습니다", "id": record_id}, 404)
+                return
+            self._send_json_response({
+                RECORD_RESPONSE_KEYS[category]: record,
+                "data_source": "Excel 파일 (분류형)",
+                "last_updated": "실시간"
+            })
+            return
+        
+        # 캐시 통계 API
+        if path == '/api/v1/cache/stats':
+            self._send_json_response({
+                "excel_cache": get_excel_cache_stats() if EXCEL_AVAILABLE else None,
+                "storage": get_storage_stats() if EXCEL_AVAILABLE else None,
+                "chat_responses": CHAT_RESPONSE_CACHE.stats(),
+                "retrieval": {agent_type: index.stats() for agent_type, index in RETRIEVAL_INDEXES.items()}
+            })
+            return
+        
         # 📁 파일 관리 API
         if path == '/api/v1/files':
             self._handle_files_list()
@@ -1280,6 +1712,9 @@ class APIHandler(BaseHTTPRequestHandler):
             }
             self._send_json_response(debug_info)
             return
+        elif path == '/api/v1/files/backups':
+            self._handle_backup_list(parse_qs(parsed_path.query))
+            return
         elif path.startswith('/api/v1/files/download/'):
             file_path = path.replace('/api/v1/files/download/', '')
             # URL 디코딩 추가 (한국어 파일명 지원)
@@ -1292,30 +1727,30 @@ class APIHandler(BaseHTTPRequestHandler):
             # URL 디코딩 추가 (한국어 파일명 지원)
             from urllib.parse import unquote
             file_path = unquote(file_path)
-            self._handle_file_preview(file_path)
+            self._handle_file_preview(file_path, parse_qs(parsed_path.query))
             return
         
         # API 요청이 아닌 경우 React 라우터를 위해 index.html 반환 (SPA 라우팅)
         if not path.startswith('/api/'):
-            try:
-                script_dir = os.path.dirname(os.path.abspath(__file__))
-                static_dir = os.path.join(script_dir, 'static')
-                index_path = os.path.join(static_dir, 'index.html')
-                
-                if os.path.exists(index_path):
-                    with open(index_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'text/html; charset=utf-8')
-                    self._set_cors_headers()
-                    self.end_headers()
-                    self.wfile.write(content.encode('utf-8'))
-                    return
-            except Exception as e:
-                print(f"SPA 라우팅 오류: {e}")
+            # static 루트의 다른 파일(아이콘 등)은 그대로, 나머지 경로는 index.html
+            asset = STATIC_ASSETS.get(path) or STATIC_ASSETS.index
+            if asset is not None:
+                self._send_static_asset(asset)
+                return
         
         # 대시보드 API
+        # 대시보드 요약 숫자만 (수정마다 증감으로 유지되는 통계라 전체 목록을 다시 읽지 않음)
+        if path == '/api/v1/dashboard/summary':
+            if not EXCEL_AVAILABLE:
+                self._send_json_response({"error": "Excel 모듈을 사용할 수 없습니다"}, 503)
+                return
+            self._send_json_response({
+                **get_dashboard_summary(),
+                "data_source": "Excel 파일 (분류형)",
+                "last_updated": "실시간"
+            })
+            return
+        
         if path == '/api/v1/dashboard':
             print("📊 대시보드 데이터 요청 처리 중...")
             if EXCEL_AVAILABLE:
@@ -1380,6 +1815,11 @@ class APIHandler(BaseHTTPRequestHandler):
         
         print(f"🔐 POST 요청: {path}")
         
+        # 스트리밍 업로드는 본문을 직접 나눠 읽으므로 미리 읽지 않음
+        upload_match = UPLOAD_ROUTE_PATTERN.match(path)
+        if upload_match:
+            return self._handle_stream_upload(upload_match.group(1), urllib.parse.unquote(upload_match.group(2)))
+        
         # 요청 본문 읽기
         content_length = int(self.headers.get('Content-Length', 0))
         post_data = self.rfile.read(content_length)
@@ -1404,17 +1844,35 @@ class APIHandler(BaseHTTPRequestHandler):
                 return
             
             # 채팅 API 엔드포인트들
-            if path == '/api/v1/members/chat':
-                return self._handle_chat_request('회원관리', post_data)
-            elif path == '/api/v1/staff/chat':
-                return self._handle_chat_request('직원관리', post_data)
-            elif path == '/api/v1/hr/chat':
-                return self._handle_chat_request('인사관리', post_data)
-            elif path == '/api/v1/inventory/chat':
-                return self._handle_chat_request('재고관리', post_data)
+            if path in CHAT_ROUTES:
+                return self._handle_chat_request(CHAT_ROUTES[path], post_data)
+            if path in CHAT_STREAM_ROUTES:
+                return self._handle_chat_stream_request(CHAT_STREAM_ROUTES[path], post_data)
+            
+            # 새 행 추가 API
+            create_match = CREATE_ROUTE_PATTERN.match(path)
+            if create_match:
+                return self._handle_create_record(create_match.group(1), post_data)
+            
+            # 일괄 수정/추가 API
+            bulk_match = BULK_ROUTE_PATTERN.match(path)
+            if bulk_match:
+                return self._handle_bulk_request(bulk_match.group(1), post_data)
+            
+            # 저장 대기 중인 변경분을 지금 바로 워크북에 반영 (SQLite 저장소 -> Excel 동기화 포함)
+            if path == '/api/v1/storage/sync':
+                if not EXCEL_AVAILABLE:
+                    self._send_json_response({"error": "Excel 모듈을 사용할 수 없습니다"}, 503)
+                    return
+                synced = flush_change_journals()
+                self._send_json_response({"success": True, "synced": synced, "storage": get_storage_stats()})
+                return
             
             # 📁 파일 관리 API
-            elif path == '/api/v1/files/upload':
+            backup_match = BACKUP_RESTORE_PATTERN.match(path)
+            if backup_match:
+                return self._handle_backup_restore(backup_match.group(1))
+            if path == '/api/v1/files/upload':
                 return self._handle_file_upload(post_data)
             elif path.startswith('/api/v1/files/save/'):
                 file_path = path.replace('/api/v1/files/save/', '')
@@ -1437,10 +1895,73 @@ class APIHandler(BaseHTTPRequestHandler):
                 "details": str(e)
             }, 500)
 
-def run_server(port=8000):
-    """서버 실행"""
+class PooledHTTPServer(HTTPServer):
+    """고정 크기 워커 풀에서 요청을 동시에 처리하는 HTTP 서버
+
+    처리 중이거나 대기 중인 요청이 max_workers + max_pending 개를 넘으면
+    accept 루프가 멈추고, 나머지 연결은 커널 listen 큐에서 기다립니다.
+    """
+    
+    def __init__(self, server_address, handler_class, max_workers=DEFAULT_SERVER_WORKERS, max_pending=None):
+        super().__init__(server_address, handler_class)
+        self.max_workers = max(int(max_workers), 1)
+        max_pending = self.max_workers * 4 if max_pending is None else max(int(max_pending), 0)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='http-worker')
+        self._slots = threading.BoundedSemaphore(self.max_workers + max_pending)
+    
+    def process_request(self, request, client_address):
+        """요청을 워커 풀에 넘기고 바로 다음 연결을 받음"""
+        self._slots.acquire()
+        try:
+            self._executor.submit(self._process_request_worker, request, client_address)
+        except Exception:
+            self._slots.release()
+            self.handle_error(request, client_address)
+            self.shutdown_request(request)
+    
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+    
+    def server_close(self):
+        super().server_close()
+        self._executor.shutdown(wait=True)
+
+def create_server(port=8000, workers=None):
+    """서버 인스턴스 생성 (workers가 1이면 단일 스레드 HTTPServer)"""
     server_address = ('', port)
-    httpd = HTTPServer(server_address, APIHandler)
+    workers = DEFAULT_SERVER_WORKERS if workers is None else workers
+    if workers <= 1:
+        return HTTPServer(server_address, APIHandler)
+    return PooledHTTPServer(server_address, APIHandler, max_workers=workers)
+
+def prepare_data_store():
+    """서버 시작 시 한 번: 저장되지 못한 수정분 복구, (BACKUP_MIGRATE_LEGACY=1 이면) 예전 백업 파일 가져오기"""
+    if EXCEL_AVAILABLE:
+        try:
+            recovered = recover_change_journals()
+            if recovered:
+                print(f"♻️ 저장되지 않았던 수정 {recovered}건을 워크북에 반영했습니다")
+        except Exception as e:
+            print(f"❌ 변경 저널 복구 실패: {e}")
+    
+    if not BACKUP_MIGRATE_LEGACY:
+        return
+    try:
+        BACKUP_STORE.migrate_legacy(EXCEL_DATA_DIR)
+    except Exception as e:
+        print(f"❌ 예전 백업 이전 실패: {e}")
+
+def run_server(port=8000, workers=None):
+    """서버 실행"""
+    prepare_data_store()
+    httpd = create_server(port, workers)
+    worker_count = getattr(httpd, 'max_workers', 1)
     
     print("=" * 60)
     print("🚀 Gym AI 기본 HTTP 백엔드 서버 시작!")
@@ -1448,13 +1969,15 @@ def run_server(port=8000):
     print(f"🔐 로그인 API: http://localhost:{port}/api/v1/auth/login")
     print("💡 모든 사용자명/비밀번호로 로그인 가능!")
     print(f"📊 Excel 모듈 상태: {'✅ 사용 가능' if EXCEL_AVAILABLE else '❌ 사용 불가'}")
+    print(f"🧵 동시 처리 워커: {worker_count}개")
     print("=" * 60)
     
     try:
         httpd.serve_forever()
     except KeyboardInterrupt:
         print("\n🛑 서버 종료 중...")
-        httpd.shutdown()
+    finally:
+        httpd.server_close()
 
 if __name__ == "__main__":
     run_server(8000) 
\ No newline at end of file
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Excel 수정 변경 저널 모듈
+채팅으로 들어오는 셀 수정을 매번 워크북 전체 다시 쓰기로 처리하지 않고,
+추가 전용 저널 파일에 먼저 기록(fsync)한 뒤 메모리 시트에 반영해 두었다가
+일정 시간/건수마다 워크북에 한 번에 저장함 (바뀐 셀만 고쳐 쓰고 서식/다른 시트는 유지)
+서버가 중간에 죽어도 저널에 남은 변경분은 다음 로드 때 다시 적용됨
+"""
+
+import json
+import math
+import os
+import threading
+from datetime import datetime
+
+import openpyxl
+import pandas as pd
+
+from atomic_io import atomic_write, replace_sheet_atomically
+
+# 0이면 저널 없이 수정마다 바로 워크북에 저장 (기존 동작)
+CHANGE_JOURNAL_ENABLED = os.environ.get("CHANGE_JOURNAL_ENABLED", "1") != "0"
+
+# 마지막 수정 후 워크북 저장까지 기다리는 시간(초)과 한 번에 모을 최대 변경 건수
+CHANGE_JOURNAL_FLUSH_INTERVAL = float(os.environ.get("CHANGE_JOURNAL_FLUSH_INTERVAL", "2"))
+CHANGE_JOURNAL_MAX_PENDING = int(os.environ.get("CHANGE_JOURNAL_MAX_PENDING", "50"))
+
+JOURNAL_SUFFIX = ".journal.jsonl"
+
+def journal_path(excel_file):
+    """워크북 옆 숨김 저널 파일 경로"""
+    directory, filename = os.path.split(excel_file)
+    return os.path.join(directory, f".{filename}{JOURNAL_SUFFIX}")
+
+def journal_signature(excel_file):
+    """캐시 키에 더할 저널 상태 (저널이 없으면 None)"""
+    try:
+        stat = os.stat(journal_path(excel_file))
+    except FileNotFoundError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _json_default(value):
+    """numpy 스칼라 등 json이 모르는 값 변환"""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+def read_entries(path):
+    """저널 항목 목록 (기록 도중 죽어서 잘린 마지막 줄은 무시)"""
+    entries = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    print(f"⚠️ 손상된 저널 항목 무시: {path}")
+    except FileNotFoundError:
+        pass
+    return entries
+
+def index_key(value):
+    """해시 인덱스 키 정규화 (1, 1.0, '1' 이 같은 키가 되도록)"""
+    if isinstance(value, str):
+        value = value.strip()
+        if value.isdigit():
+            return int(value)
+        return value
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+def apply_entry(frame, entry, labels=None):
+    """저널 항목 하나의 값을 기존 행에 덮어쓰기 (여러 번 적용해도 결과가 같음)
+
+    새 행 추가는 append_rows 로 따로 처리 (apply_entries 참고)
+    """
+    if labels is None:
+        labels = frame.index[frame[entry['key_column']] == entry['key']]
+    for column, value in entry['changes'].items():
+        frame.loc[labels, column] = value
+
+def append_rows(frame, entries):
+    """insert 항목들의 새 행을 시트 끝에 한 번에 덧붙임 -> (새 시트, 새 행 라벨)
+
+    행마다 시트 전체를 복사하지 않도록 pd.concat 은 한 번만 하고,
+    시트에 없는 열은 워크북 저장(WorkbookPatcher)처럼 열을 추가함 (기존 행은 빈 칸)
+    """
+    start = frame.index.max() + 1 if len(frame.index) else 0
+    labels = pd.RangeIndex(start, start + len(entries))
+    rows = pd.DataFrame([{entry['key_column']: entry['key'], **entry['changes']} for entry in entries], index=labels)
+    return pd.concat([frame, rows]), labels
+
+def insert_runs(entries, has_row):
+    """항목을 순서대로 나눔: 새 행을 추가하는 insert 가 이어지면 목록 하나로 묶고, 나머지는 항목 하나씩
+
+    insert 항목은 같은 키의 행이 없을 때만 새 행이 되므로 재적용해도 한 번만 추가됨
+    (같은 키가 묶음 안에 또 나오면 묶음을 먼저 내보내서 그 행의 수정으로 적용되게 함)
+    """
+    run, keys = [], set()
+    for entry in entries:
+        key = (entry['key_column'], index_key(entry['key']))
+        if entry.get('insert') and key not in keys and not has_row(entry):
+            run.append(entry)
+            keys.add(key)
+            continue
+        if run:
+            yield run
+            run = []
+        yield entry
+    if run:
+        yield run
+
+def apply_entries(frame, entries):
+    """저널 항목 목록을 순서대로 적용 -> 적용된 시트 (새 행이 있으면 새 DataFrame)"""
+    def has_row(entry):
+        return entry['key_column'] in frame.columns and bool((frame[entry['key_column']] == entry['key']).any())
+
+    for item in insert_runs(entries, has_row):
+        if isinstance(item, list):
+            frame, _ = append_rows(frame, item)
+        else:
+            apply_entry(frame, item)
+    return frame
+
+def replay_journal(excel_file, frame):
+    """디스크 저널에 남은 변경분을 시트에 적용 (읽기 전용, 워크북은 건드리지 않음)"""
+    return apply_entries(frame, read_entries(journal_path(excel_file)))
+
+def _cell_value(value):
+    """openpyxl 셀에 쓸 값 (numpy 스칼라 -> 파이썬 값, NaN -> 빈 칸)"""
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+class WorkbookPatcher:
+    """저널 항목이 바꾼 셀만 워크북에 고쳐 쓰기
+
+    openpyxl 워크북과 키 열 -> 행 번호 인덱스를 메모리에 유지해서, 파일이 그대로라면
+    다음 저장 때 다시 열지 않음. 시트 전체를 DataFrame 에서 다시 쓰지 않으므로
+    다른 셀의 서식과 다른 시트가 그대로 남음
+    """
+
+    def __init__(self, excel_file, sheet_name):
+        self.excel_file = excel_file
+        self.sheet_name = sheet_name
+        self.workbook = None
+        self.signature = None
+        self.header = {}
+        self.row_indexes = {}  # 키 열 -> {키: [행 번호]}
+
+    def _ensure_loaded(self):
+        signature = _file_signature(self.excel_file)
+        if self.workbook is None or signature != self.signature:
+            self.workbook = openpyxl.load_workbook(self.excel_file)
+            self.signature = signature
+            self.row_indexes = {}
+            if self.sheet_name in self.workbook.sheetnames:
+                ws = self.workbook[self.sheet_name]
+                self.header = {cell.value: cell.column for cell in ws[1] if cell.value is not None}
+        return self.sheet_name in self.workbook.sheetnames
+
+    def _rows_for(self, ws, key_column, key):
+        index = self.row_indexes.get(key_column)
+        if index is None:
+            index = self.row_indexes[key_column] = {}
+            column = self.header.get(key_column)
+            if column is not None:
+                values = ws.iter_rows(min_row=2, min_col=column, max_col=column, values_only=True)
+                for row_number, (value,) in enumerate(values, start=2):
+                    if value is not None:
+                        index.setdefault(index_key(value), []).append(row_number)
+        return index.setdefault(index_key(key), [])
+
+    def _column_for(self, ws, name):
+        # 시트에 없는 열(재고 총액 등)은 머리글을 추가
+        if name not in self.header:
+            self.header[name] = ws.max_column + 1
+            ws.cell(row=1, column=self.header[name], value=name)
+        return self.header[name]
+
+    def _apply(self, ws, entries):
+        for entry in entries:
+            key_column = entry['key_column']
+            rows = self._rows_for(ws, key_column, entry['key'])
+            if not rows:
+                if not entry.get('insert'):
+                    return False
+                rows.append(ws.max_row + 1)
+                ws.cell(row=rows[0], column=self._column_for(ws, key_column), value=_cell_value(entry['key']))
+                # 다른 열 인덱스에는 새 행이 없으므로 필요할 때 다시 만듦
+                self.row_indexes = {key_column: self.row_indexes[key_column]}
+
+            for column_name, value in entry['changes'].items():
+                column = self._column_for(ws, column_name)
+                for row_number in rows:
+                    ws.cell(row=row_number, column=column, value=_cell_value(value))
+                if column_name != key_column:
+                    self.row_indexes.pop(column_name, None)
+        return True
+
+    def save(self, entries):
+        """셀 패치 후 원자적으로 저장. 대상 행을 찾지 못하면 False (호출자가 시트 전체 쓰기로 대체)"""
+        try:
+            if not self._ensure_loaded() or not self._apply(self.workbook[self.sheet_name], entries):
+                self.workbook = None
+                return False
+            atomic_write(self.excel_file, self.workbook.save, suffix='.xlsx')
+        except Exception:
+            # 메모리 워크북이 일부만 패치됐을 수 있으므로 다음에 파일에서 다시 읽음
+            self.workbook = None
+            raise
+        self.signature = _file_signature(self.excel_file)
+        return True
+
+class ChangeJournal:
+    """워크북 시트 하나에 대한 변경 저널 + 작업용 메모리 시트"""
+
+    def __init__(self, category, excel_file, sheet_name, lock, aggregator=None):
+        self.category = category
+        self.excel_file = excel_file
+        self.sheet_name = sheet_name
+        self.path = journal_path(excel_file)
+        self.lock = lock  # 카테고리 쓰기 잠금 (워크북을 쓰는 다른 코드와 공유)
+        self.frame_lock = threading.Lock()  # 메모리 시트 변경/복사만 보호 (읽기는 워크북 저장을 기다리지 않음)
+        self.frame = None
+        self.signature = None
+        self.pending = 0
+        self.unflushed = []  # 워크북에 아직 반영되지 않은 저널 항목
+        self.patcher = WorkbookPatcher(excel_file, sheet_name)
+        self.timer = None
+        self.indexes = {}  # 열 이름 -> {값: [행 라벨]}
+        self.aggregator = aggregator  # 요약 통계 (있으면 변경마다 바뀐 행만큼 갱신)
+
+    def _read_base_frame(self):
+        """변경분을 적용하기 전 시트 (기본: 워크북)"""
+        return pd.read_excel(self.excel_file, sheet_name=self.sheet_name)
+
+    def _read_entries(self):
+        """아직 워크북에 반영되지 않은 항목 (기본: 디스크 저널 파일)"""
+        return read_entries(self.path)
+
+    def _persist_entries(self, entries):
+        """항목을 내구성 있게 기록 (기본: 저널 파일에 추가 후 fsync)"""
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(entry, ensure_ascii=False, default=_json_default) + '\n' for entry in entries))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _clear_entries(self, saved_over):
+        """워크북 저장이 끝난 항목 비우기 (기본: 저널 파일 비우기). saved_over 는 저장 직전 워크북 상태"""
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _load(self):
+        """워크북을 읽고 저널에 남은 변경분을 다시 적용 (크래시 복구 포함)"""
+        frame = self._read_base_frame()
+        entries = self._read_entries()
+        frame = apply_entries(frame, entries)
+
+        with self.frame_lock:
+            self.frame = frame
+            self.pending = len(entries)
+            self.unflushed = entries
+            if self.aggregator is not None:
+                self.aggregator.rebuild(frame)
+        self.indexes = {}
+        self.signature = _file_signature(self.excel_file)
+        if entries:
+            print(f"♻️ {self.category} 저널 변경 {len(entries)}건 복구")
+            self._schedule_flush()
+
+    def working_frame(self):
+        """수정에 사용할 현재 시트 (워크북 + 아직 저장되지 않은 변경분)"""
+        with self.lock:
+            # 반영할 변경이 없는 동안 워크북이 바뀌었으면 (업로드 등) 다시 읽음
+            if self.frame is None or (self.pending == 0 and _file_signature(self.excel_file) != self.signature):
+                self._load()
+            return self.frame
+
+    def lookup(self, column, value):
+        """열 값으로 행 라벨 목록 조회 (열마다 해시 인덱스를 한 번 만들고, 그 열이 바뀔 때만 다시 만듦)"""
+        with self.lock:
+            frame = self.working_frame()
+            index = self.indexes.get(column)
+            if index is None:
+                index = {}
+                for label, key in zip(frame.index, frame[column].tolist()):
+                    index.setdefault(index_key(key), []).append(label)
+                self.indexes[column] = index
+            return index.get(index_key(value), [])
+
+    def pending_frame(self):
+        """저장 대기 중인 변경이 있으면 그 시트의 복사본, 없으면 None (쓰기 잠금을 잡지 않음)"""
+        with self.frame_lock:
+            if self.pending and self.frame is not None:
+                return self.frame.copy()
+            return None
+
+    def summary(self):
+        """메모리 시트 기준 요약 통계 (시트를 아직 읽지 않았거나 워크북이 밖에서 바뀌었으면 None)"""
+        if self.aggregator is None:
+            return None
+        with self.frame_lock:
+            if self.frame is None or (not self.pending and _file_signature(self.excel_file) != self.signature):
+                return None
+            return self.aggregator.summary()
+
+    def _apply_tracked(self, frame, entry, labels):
+        """기존 행 수정 + 요약 통계 증감 (frame_lock 안에서 호출)"""
+        if self.aggregator is None:
+            apply_entry(frame, entry, labels)
+            return
+        before = self.aggregator.row_totals(frame, labels)
+        apply_entry(frame, entry, labels)
+        self.aggregator.replace_rows(before, self.aggregator.row_totals(frame, labels))
+
+    def _append_tracked(self, frame, entries):
+        """새 행 묶음을 덧붙이고 요약 통계와 이미 만든 인덱스에 새 행만 더함 -> 새 시트"""
+        frame, labels = append_rows(frame, entries)
+        with self.frame_lock:
+            self.frame = frame
+            self.pending += len(entries)
+            self.unflushed.extend(entries)
+            if self.aggregator is not None:
+                self.aggregator.replace_rows(self.aggregator.row_totals(frame, []), self.aggregator.row_totals(frame, labels))
+        for column, index in self.indexes.items():
+            for label, key in zip(labels, frame.loc[labels, column].tolist()):
+                index.setdefault(index_key(key), []).append(label)
+        return frame
+
+    def record(self, key_column, key, changes, insert=False):
+        """변경 기록: 저널에 fsync 한 뒤 메모리 시트에 반영하고 저장 예약"""
+        self.record_batch([(key_column, key, changes, insert)])
+
+    def record_batch(self, items):
+        """여러 변경을 순서대로 반영하고 저널에는 한 번의 fsync 로 기록
+
+        items: (키 열, 키 값, {열: 값}, 새 행 여부) 목록
+        """
+        with self.lock:
+            frame = self.working_frame()
+            ts = datetime.now().isoformat(timespec='seconds')
+            entries = []
+            for key_column, key, changes, insert in items:
+                entry = {'ts': ts, 'sheet': self.sheet_name, 'key_column': key_column, 'key': key, 'changes': changes}
+                if insert:
+                    entry['insert'] = True
+                entries.append(entry)
+
+            try:
+                has_row = lambda entry: bool(self.lookup(entry['key_column'], entry['key']))
+                for item in insert_runs(entries, has_row):
+                    if isinstance(item, list):
+                        frame = self._append_tracked(frame, item)
+                        continue
+                    labels = self.lookup(item['key_column'], item['key'])
+                    with self.frame_lock:
+                        self._apply_tracked(frame, item, labels)
+                        self.pending += 1
+                        self.unflushed.append(item)
+                    for column in item['changes']:
+                        self.indexes.pop(column, None)
+
+                self._persist_entries(entries)
+            except Exception:
+                # 메모리 시트가 저널과 어긋났을 수 있으므로 다음 접근 때 다시 로드
+                with self.frame_lock:
+                    self.frame = None
+                    self.pending = 0
+                    self.unflushed = []
+                raise
+
+            if not CHANGE_JOURNAL_ENABLED or self.pending >= CHANGE_JOURNAL_MAX_PENDING:
+                self.flush()
+            else:
+                self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self.timer is None:
+            self.timer = threading.Timer(CHANGE_JOURNAL_FLUSH_INTERVAL, self._flush_from_timer)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def _flush_from_timer(self):
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"❌ {self.category} 저널 반영 실패, 다시 시도 예정: {e}")
+            with self.lock:
+                self.timer = None
+                self._schedule_flush()
+
+    def flush(self):
+        """모인 변경분을 워크북에 한 번에 저장하고 저널 비우기"""
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            if not self.pending:
+                return 0
+
+            count = self.pending
+            saved_over = _file_signature(self.excel_file)
+            # 바뀐 셀만 패치하고, 행을 찾을 수 없을 때만 시트 전체를 다시 씀
+            # (쓰기 잠금 안에서는 메모리 시트가 바뀌지 않으므로 복사 없이 저장)
+            if not self.patcher.save(self.unflushed):
+                print(f"⚠️ {self.category} 셀 단위 저장 불가, 시트 전체 저장")
+                replace_sheet_atomically(self.excel_file, self.sheet_name, self.frame)
+
+            # 워크북 저장이 끝난 뒤에만 저널을 비움 (그 사이 죽으면 같은 값을 한 번 더 쓸 뿐)
+            self._clear_entries(saved_over)
+
+            with self.frame_lock:
+                self.pending = 0
+                self.unflushed = []
+                if saved_over != self.signature:
+                    # 그 사이 밖에서 바뀐 워크북 위에 저장했으므로 메모리 시트(요약 통계 포함)는 다음에 다시 읽음
+                    self.frame = None
+            self.signature = _file_signature(self.excel_file)
+            print(f"💾 {self.category} 변경 {count}건 워크북에 저장")
+            return count
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+채팅 컨텍스트 인코딩 모듈
+OpenAI 프롬프트에 넣는 데이터를 행마다 키 이름을 반복하는 dict 목록 대신
+머리글 한 줄 + 구분자로 나눈 값 줄(표 형식)로 만들고, 토큰 수를 추정해서
+에이전트별 토큰 예산 안에 들어가도록 열과 행을 골라 담음
+"""
+
+import math
+import os
+import re
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("o200k_base")  # gpt-4o 계열 토크나이저
+except Exception:
+    _ENCODING = None
+
+# 에이전트별 컨텍스트 토큰 예산 (통계 + 표 + 참고 줄 전체)
+CONTEXT_TOKEN_BUDGETS = {
+    '회원관리': int(os.environ.get("CHAT_CONTEXT_TOKENS_MEMBERS", "2000")),
+    '직원관리': int(os.environ.get("CHAT_CONTEXT_TOKENS_STAFF", "2000")),
+    '인사관리': int(os.environ.get("CHAT_CONTEXT_TOKENS_HR", "2000")),
+    '재고관리': int(os.environ.get("CHAT_CONTEXT_TOKENS_INVENTORY", "2000"))
+}
+# 예산이 모자랄 때 덜 중요한 열을 빼서라도 담으려는 최소 행 수
+CONTEXT_MIN_ROWS = int(os.environ.get("CHAT_CONTEXT_MIN_ROWS", "30"))
+# 열을 뺄지 정할 때 행 하나의 토큰 수를 재는 표본 행 수
+CONTEXT_SAMPLE_ROWS = 20
+# 참고 줄(부족 재고 목록 등)이 쓸 수 있는 예산 비율 (나머지는 표)
+CONTEXT_NOTES_SHARE = float(os.environ.get("CHAT_CONTEXT_NOTES_SHARE", "0.25"))
+CELL_SEPARATOR = '|'
+
+# 에이전트별 표 구성: 통계/목록 제목, 단위, 빼지 않는 앞쪽 열 수, 열 목록 (중요한 순서, (머리글, 레코드 키))
+CONTEXT_TABLES = {
+    '회원관리': {
+        'stats': '회원 통계', 'title': '회원 목록', 'unit': '명', 'required': 2,
+        'columns': (
+            ('번호', 'id'), ('이름', 'name'), ('멤버십', 'membership_type'), ('결제상태', 'payment_status'),
+            ('전화번호', 'phone'), ('월회비', 'monthly_fee'), ('성별', 'gender'), ('나이', 'age'),
+            ('시작일', 'start_date'), ('종료일', 'end_date'), ('이메일', 'email'), ('직업', 'occupation'),
+            ('주소', 'address')
+        )
+    },
+    '직원관리': {
+        'stats': '직원 통계', 'title': '직원 목록', 'unit': '명', 'required': 2,
+        'columns': (
+            ('번호', 'id'), ('이름', 'name'), ('직책', 'position'), ('부서', 'department'), ('근무상태', 'status'),
+            ('월급여', 'monthly_salary'), ('전화번호', 'phone'), ('이메일', 'email'), ('입사일', 'hire_date'),
+            ('자격증', 'certification'), ('비고', 'notes')
+        )
+    },
+    '인사관리': {
+        'stats': '인사 통계', 'title': '인사 기록', 'unit': '명', 'required': 2,
+        'columns': (
+            ('직원번호', 'employee_id'), ('이름', 'name'), ('부서', 'department'), ('연차사용', 'used_vacation'),
+            ('잔여연차', 'remaining_vacation'), ('총연차', 'total_vacation'), ('월근무시간', 'monthly_hours'),
+            ('초과근무', 'overtime_hours'), ('야간근무', 'night_hours'), ('평가점수', 'evaluation_score'),
+            ('상벌', 'rewards_penalties'), ('교육이수', 'training_completed')
+        )
+    },
+    '재고관리': {
+        'stats': '재고 통계', 'title': '재고 목록', 'unit': '개', 'required': 2,
+        'columns': (
+            ('번호', 'id'), ('품목명', 'item_name'), ('현재재고', 'current_stock'), ('최소재고', 'min_stock_level'),
+            ('상태', 'status'), ('단가', 'unit_price'), ('카테고리', 'category'), ('최대재고', 'max_stock_level'),
+            ('공급업체', 'supplier'), ('위치', 'location'), ('입고일', 'received_date'), ('유통기한', 'expiry_date')
+        )
+    }
+}
+
+# 토큰 근사 계산용 조각: 한글 음절 / 영문 단어 / 숫자열 / 그 밖의 문자 하나
+_TOKEN_PIECES = re.compile(r'[가-힣]|[A-Za-z]+|\d+|\S')
+
+def estimate_tokens(text):
+    """텍스트 토큰 수 (tiktoken 이 있으면 정확히, 없으면 넉넉하게 근사)"""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    total = text.count('\n')
+    for piece in _TOKEN_PIECES.findall(text):
+        if piece.isascii() and piece.isalnum():
+            total += math.ceil(len(piece) / (3 if piece.isdigit() else 4))
+        else:
+            total += 1
+    return total
+
+def _cell(value):
+    """표 칸 값 (빈 값은 빈 칸, 정수인 실수는 소수점 없이, 구분자/줄바꿈은 치환)"""
+    if value is None:
+        return ''
+    if isinstance(value, float):
+        if math.isnan(value):
+            return ''
+        if value.is_integer():
+            return str(int(value))
+    text = str(value)
+    if text in ('nan', 'NaT', 'None'):
+        return ''
+    return text.replace(CELL_SEPARATOR, '/').replace('\n', ' ')
+
+def _line(cells):
+    return CELL_SEPARATOR.join(cells)
+
+def encode_table(title, unit, columns, required, records, budget):
+    """레코드 목록을 예산 안의 표 텍스트로 -> (텍스트, 담은 행 수, 담은 열 수, 토큰 추정치)
+
+    최소 행 수(또는 전체 행)가 들어갈 때까지 뒤쪽(덜 중요한) 열부터 빼고,
+    남은 예산만큼 레코드를 순서대로 담음 (레코드는 중요한 순서로 넘겨야 함)
+    """
+    headers = [header for header, _ in columns]
+    # 제목 줄 비용은 가장 긴 경우(전체 행 수)로 잡아 둠
+    title_cost = estimate_tokens(f"{title} ({len(records)}{unit} 중 {len(records)}{unit}, 구분자 '{CELL_SEPARATOR}'):") + 1
+
+    sample = [[_cell(record.get(key)) for _, key in columns] for record in records[:CONTEXT_SAMPLE_ROWS]]
+    target_rows = min(len(records), CONTEXT_MIN_ROWS)
+    width = len(columns)
+    while width > required and sample:
+        header_cost = estimate_tokens(_line(headers[:width])) + 1
+        row_cost = sum(estimate_tokens(_line(cells[:width])) + 1 for cells in sample) / len(sample)
+        if title_cost + header_cost + row_cost * target_rows <= budget:
+            break
+        width -= 1
+
+    lines = [_line(headers[:width])]
+    used = title_cost + estimate_tokens(lines[0]) + 1
+    for record in records:
+        line = _line(_cell(record.get(key)) for _, key in columns[:width])
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            break
+        lines.append(line)
+        used += cost
+
+    included = len(lines) - 1
+    lines.insert(0, f"{title} ({len(records)}{unit} 중 {included}{unit}, 구분자 '{CELL_SEPARATOR}'):")
+    return '\n'.join(lines), included, width, used
+
+def encode_note(label, items, budget):
+    """참고 줄 '제목: 항목, 항목 외 N건' 을 예산 안에서 -> (텍스트, 토큰 추정치)
+
+    표 행처럼 항목을 앞에서부터 예산만큼 담고 나머지는 건수만 남김 (항목은 중요한 순서로 넘겨야 함)
+    """
+    items = [_cell(item) for item in items]
+
+    def render(shown):
+        if not shown and items:
+            return f"{label}: {len(items)}건"
+        text = f"{label}: " + ', '.join(items[:shown])
+        return text + (f" 외 {len(items) - shown}건" if shown < len(items) else '')
+
+    # 항목별 비용으로 담을 개수를 정한 뒤, 이어 붙인 줄의 실제 비용이 넘치면 하나씩 더 뺌
+    used = estimate_tokens(render(0)) + estimate_tokens(f" 외 {len(items)}건") + 1
+    shown = 0
+    for item in items:
+        cost = estimate_tokens(item + ', ')
+        if used + cost > budget:
+            break
+        used += cost
+        shown += 1
+    text = render(shown)
+    while shown and estimate_tokens(text) + 1 > budget:
+        shown -= 1
+        text = render(shown)
+    return text, estimate_tokens(text) + 1
+
+def encode_context(agent_type, summary, records, notes=(), budget=None):
+    """에이전트 컨텍스트 (통계 한 줄 + 참고 줄 + 표) -> (텍스트, 정보 dict)
+
+    notes: (제목, 항목 목록) 목록. 참고 줄은 예산의 CONTEXT_NOTES_SHARE 안에서 잘라 담고 표는 남은 예산을 씀
+    """
+    spec = CONTEXT_TABLES[agent_type]
+    budget = CONTEXT_TOKEN_BUDGETS.get(agent_type, 2000) if budget is None else budget
+
+    head = [f"{spec['stats']}: " + ', '.join(f"{name}={_cell(value)}" for name, value in (summary or {}).items())]
+    head_cost = estimate_tokens(head[0]) + 1
+    notes_budget = min(int(budget * CONTEXT_NOTES_SHARE), budget - head_cost)
+    for label, items in notes:
+        note, cost = encode_note(label, items, notes_budget)
+        if cost > notes_budget:
+            break
+        head.append(note)
+        head_cost += cost
+        notes_budget -= cost
+    head_text = '\n'.join(head)
+
+    table, rows, columns, table_cost = encode_table(
+        spec['title'], spec['unit'], spec['columns'], spec['required'], list(records), max(budget - head_cost, 0)
+    )
+    return f"{head_text}\n{table}", {
+        "budget": budget,
+        "tokens": head_cost + table_cost,
+        "rows": rows,
+        "total_rows": len(records),
+        "columns": columns
+    }
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Excel 시트 사이드카 캐시 모듈
+파싱한 시트를 서버 전용 디렉터리에 Arrow IPC(Feather) 파일로 저장해 두고,
+워크북이 바뀌지 않았다면 openpyxl XML 파싱 대신 사이드카에서 바로 읽음
+원본 워크북 정보(경로, 시트, 수정시각, 크기, 해시)는 같은 파일의 스키마 메타데이터에 함께 기록하므로
+데이터와 메타가 따로 어긋날 일이 없고, 역직렬화로 코드가 실행되는 형식(pickle)은 쓰지 않음
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from atomic_io import atomic_write
+
+# 사이드카 사용 여부 (0이면 항상 Excel 직접 파싱)
+EXCEL_SIDECAR_ENABLED = os.environ.get("EXCEL_SIDECAR_ENABLED", "1") != "0"
+# 사이드카 저장 위치 (업로드/저장 경로인 app/data/excel 밖의 서버 전용 디렉터리)
+EXCEL_SIDECAR_DIR = os.environ.get(
+    "EXCEL_SIDECAR_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app', 'data', 'sidecars')
+)
+
+# pyarrow가 없으면 사이드카 없이 항상 Excel 직접 파싱
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+SIDECAR_SUFFIX = ".feather"
+# 스키마 메타데이터 키와 형식 버전 (형식이 바뀌면 이전 사이드카는 쓰지 않음)
+SIDECAR_META_KEY = b"gym_sidecar"
+SIDECAR_FORMAT = 1
+
+def _sidecar_path(excel_file, sheet_name):
+    """워크북 절대 경로 + 시트 이름의 해시로 만든 사이드카 경로"""
+    source = f"{os.path.realpath(excel_file)}\0{sheet_name}"
+    digest = hashlib.sha256(source.encode('utf-8')).hexdigest()
+    return os.path.join(EXCEL_SIDECAR_DIR, digest + SIDECAR_SUFFIX)
+
+def _file_sha256(path):
+    """파일 내용 해시 (수정시각만 바뀐 경우 재생성을 피하기 위해)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _write_sidecar(path, table, meta):
+    """메타데이터를 스키마에 넣어 한 파일로 저장 (임시 파일에 쓴 뒤 rename 으로 교체)"""
+    metadata = dict(table.schema.metadata or {})
+    metadata[SIDECAR_META_KEY] = json.dumps(meta).encode('utf-8')
+    table = table.replace_schema_metadata(metadata)
+    os.makedirs(EXCEL_SIDECAR_DIR, exist_ok=True)
+    atomic_write(path, lambda tmp: feather.write_feather(table, tmp), suffix=".sidecar")
+
+def _read_sidecar(path):
+    """사이드카 -> (Arrow 테이블, 메타 dict), 없거나 형식이 다르면 (None, None)"""
+    try:
+        table = feather.read_table(path, memory_map=False)
+    except (OSError, pa.ArrowInvalid):
+        return None, None
+    try:
+        meta = json.loads((table.schema.metadata or {})[SIDECAR_META_KEY])
+    except (KeyError, ValueError):
+        return None, None
+    if not isinstance(meta, dict) or meta.get("format") != SIDECAR_FORMAT:
+        return None, None
+    return table, meta
+
+def _to_frame(table):
+    """Arrow 테이블 -> DataFrame (Excel 파싱 결과와 같게 빈 텍스트 칸은 NaN)
+
+    pandas 2.x 는 object 열의 빈 칸을 None 으로 돌려주므로 sqlite_store.read_frame 처럼 NaN 으로 맞춤
+    """
+    frame = table.to_pandas()
+    for position in np.flatnonzero((frame.dtypes == object).to_numpy()):
+        nulls = frame.iloc[:, position].isna().to_numpy()
+        if nulls.any():
+            frame.iloc[nulls, position] = np.nan
+    return frame
+
+def _build_table(df):
+    """DataFrame -> Arrow 테이블 (왕복 시 dtype 이나 빈 칸 위치가 달라지는 시트는 None: 캐시하지 않음)"""
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowException, TypeError, ValueError):
+        return None
+    restored = _to_frame(table)
+    if not restored.dtypes.equals(df.dtypes) or not restored.isna().equals(df.isna()):
+        return None
+    return table
+
+def read_sheet(excel_file, sheet_name):
+    """시트를 DataFrame으로 읽기 (신선한 사이드카가 있으면 사이드카에서)"""
+    if not EXCEL_SIDECAR_ENABLED or not ARROW_AVAILABLE:
+        return pd.read_excel(excel_file, sheet_name=sheet_name)
+
+    path = _sidecar_path(excel_file, sheet_name)
+    stat = os.stat(excel_file)
+    table, meta = _read_sidecar(path)
+
+    if meta is not None and meta.get("source") == os.path.realpath(excel_file) and meta.get("sheet") == sheet_name:
+        try:
+            if meta.get("mtime_ns") == stat.st_mtime_ns and meta.get("size") == stat.st_size:
+                return _to_frame(table)
+
+            # 수정시각만 바뀌고 내용이 같으면 메타만 갱신해서 다시 저장
+            if meta.get("size") == stat.st_size and meta.get("sha256") == _file_sha256(excel_file):
+                meta.update(mtime_ns=stat.st_mtime_ns)
+                _write_sidecar(path, table, meta)
+                return _to_frame(table)
+        except Exception as e:
+            print(f"⚠️ 사이드카 읽기 실패, Excel 다시 파싱: {e}")
+
+    # 파싱 도중 파일이 바뀌어도 메타가 어긋나도록 해시는 파싱 전에 계산
+    sha256 = _file_sha256(excel_file)
+    df = pd.read_excel(excel_file, sheet_name=sheet_name)
+
+    try:
+        table = _build_table(df)
+        if table is None:
+            print(f"⚠️ Arrow 로 그대로 저장할 수 없는 시트라 사이드카 생략: {os.path.basename(excel_file)}")
+        else:
+            _write_sidecar(path, table, {
+                "format": SIDECAR_FORMAT,
+                "source": os.path.realpath(excel_file),
+                "sheet": sheet_name,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "sha256": sha256
+            })
+    except Exception as e:
+        # 읽기 전용 파일시스템 등에서는 사이드카 없이 계속 동작
+        print(f"⚠️ 사이드카 저장 실패: {e}")
+
+    return df
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+번호 발급기 모듈
+새 회원/직원/품목 번호를 매번 시트 전체의 최댓값으로 계산하지 않고,
+카테고리별 다음 번호를 파일에 기록해 두고 이어서 발급함
+(발급한 번호는 행이 지워지거나 서버가 재시작돼도 다시 쓰지 않음)
+"""
+
+import json
+import os
+import threading
+
+from atomic_io import atomic_write
+
+class IdAllocator:
+    """카테고리별 단조 증가 번호 발급기"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.next_ids = None
+
+    def _load(self):
+        if self.next_ids is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.next_ids = {category: int(value) for category, value in json.load(f).items()}
+            except FileNotFoundError:
+                self.next_ids = {}
+        return self.next_ids
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        def write(tmp_path):
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.next_ids, f, ensure_ascii=False, indent=1)
+        atomic_write(self.path, write, suffix='.json')
+
+    def allocate(self, category, count, taken, initial):
+        """번호 count 개 발급
+        
+        taken(번호): 이미 시트에 있는 번호인지 (밖에서 추가된 행과 겹치지 않도록 건너뜀)
+        initial(): 기록이 없을 때 시작 번호 (기존 최댓값 + 1, 처음 한 번만 계산)
+        다음 번호를 파일에 먼저 기록한 뒤 반환하므로 중간에 죽어도 같은 번호가 두 번 나가지 않음
+        """
+        with self.lock:
+            next_ids = self._load()
+            candidate = next_ids.get(category)
+            if candidate is None:
+                candidate = initial()
+            
+            ids = []
+            while len(ids) < count:
+                if not taken(candidate):
+                    ids.append(candidate)
+                candidate += 1
+            
+            next_ids[category] = candidate
+            self._save()
+        return ids
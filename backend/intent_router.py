@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+채팅 의도 분류 모듈
+메시지를 키워드 자동자(Aho–Corasick)로 한 번만 훑어 어떤 키워드 묶음이 들어 있는지 찾고,
+에이전트별 규칙 순서대로 의도(항목 수정/목록/인원수/매출/부족재고 …)를 정한 뒤
+수정 요청이면 미리 컴파일한 패턴으로 대상/항목/새 값을 뽑아 냄
+데이터 수정 처리, 표 데이터 추출, 키워드 기반 응답이 모두 같은 분류 결과를 사용함
+"""
+
+import re
+from collections import deque
+from functools import lru_cache
+
+# 의도 이름
+UPDATE_FIELD = 'update_field'
+GREETING = 'greeting'
+COUNT = 'count'
+LIST = 'list'
+REVENUE = 'revenue'
+REGISTER = 'register'
+HELP = 'help'
+SALARY = 'salary'
+SCHEDULE = 'schedule'
+ATTENDANCE = 'attendance'
+VACATION = 'vacation'
+LOW_STOCK = 'low_stock'
+ORDER = 'order'
+UNKNOWN = 'unknown'
+
+# 키워드 묶음 (소문자 메시지에서 부분 문자열로 찾음)
+KEYWORD_GROUPS = {
+    'greeting': ('안녕', '하이', '헬로'),
+    'member': ('회원',),
+    'staff': ('직원',),
+    'stock': ('재고',),
+    # 이름 속 글자('김철수'의 '수')에 걸리지 않도록 '수' 는 대상과 붙은 형태로만
+    'quantity': ('몇', '인원', '숫자', '회원수', '회원 수', '직원수', '직원 수', '재고수', '재고 수', '품목수', '품목 수'),
+    'status': ('현황',),
+    'list': ('목록', '리스트', '명단'),
+    'item': ('품목',),
+    'table': ('목록', '리스트', '명단', '현황', '전체', '모든', '모두'),
+    'revenue': ('매출', '수익', '수입'),
+    'register': ('등록', '가입'),
+    'help': ('도움', '기능', '사용법'),
+    'salary': ('급여', '인건비', '월급'),
+    'schedule': ('스케줄', '근무'),
+    'attendance': ('근태', '출근'),
+    'vacation': ('휴가',),
+    'low_stock': ('부족', '알림'),
+    'order': ('주문', '발주', '구매'),
+    'modify': ('수정', '변경', '바꿔', '해줘', '조정'),
+    'fee_field': ('월회비',),
+    'member_field': ('전화번호', '이메일', '주소', '직업', '멤버십', '특이사항'),
+    'salary_field': ('월급여', '급여', '월급'),
+    'staff_field': ('전화번호', '이메일', '직책', '부서', '근무상태'),
+    'stock_field': ('재고', '수량'),
+    'price_field': ('가격', '단가')
+}
+
+# 에이전트별 수정 패턴 (앞에서부터 검사): (필요한 키워드 묶음, 고정 항목, 패턴, 값 종류)
+#   고정 항목이 None 이면 패턴의 두 번째 그룹이 항목 / 값 종류: amount(만원 단위 지원), int, text
+#   키워드 묶음은 패턴이 맞기 위한 필요조건이라 묶음이 없으면 정규식을 돌리지 않음
+# 열 이름 뒤 텍스트 값: 열 이름에 붙은 조사(을/를 등)는 건너뛰고, 수정 동사 앞까지 (값 끝의 로/으로는 _parse_value 에서 판단)
+_TEXT_VALUE = r'(?:[을를은는이가](?=\s))?\s*(.+?)\s*(?:수정|변경|바꿔|해줘)'
+
+UPDATE_PATTERNS = {
+    '회원관리': (
+        (('fee_field', 'modify'), '월회비',
+         re.compile(r'(\w+)(?:님|회원)?.*?월회비.*?(\d+(?:만원|원|\d+)).*?(?:수정|변경|바꿔|해줘)'), 'amount'),
+        (('member_field', 'modify'), None,
+         re.compile(r'(\w+)(?:님|회원)?.*?(전화번호|이메일|주소|직업|멤버십|특이사항)' + _TEXT_VALUE), 'text')
+    ),
+    '직원관리': (
+        (('salary_field', 'modify'), '월급여',
+         re.compile(r'(\w+)(?:님|직원)?.*?(?:월급여|급여|월급).*?(\d+(?:만원|원|\d+)).*?(?:수정|변경|바꿔|해줘)'), 'amount'),
+        (('staff_field', 'modify'), None,
+         re.compile(r'(\w+)(?:님|직원)?.*?(전화번호|이메일|직책|부서|근무상태)' + _TEXT_VALUE), 'text')
+    ),
+    '재고관리': (
+        (('stock_field', 'modify'), '현재재고',
+         re.compile(r'([가-힣\w\s]{2,}?)(?:\s+)?(?:재고|수량).*?(\d+).*?(?:수정|변경|바꿔|해줘|조정)'), 'int'),
+        (('price_field', 'modify'), '단가',
+         re.compile(r'([가-힣\w\s]{2,}?)(?:\s+)?(?:가격|단가).*?(\d+).*?(?:수정|변경|바꿔|해줘)'), 'int')
+    )
+}
+
+# 에이전트별 의도 규칙 (앞에서부터, 필요한 키워드 묶음이 모두 있으면 그 의도)
+INTENT_RULES = {
+    '회원관리': (
+        (GREETING, ('greeting',)),
+        (COUNT, ('member', 'quantity')),
+        (LIST, ('list',)),
+        (REVENUE, ('revenue',)),
+        (REGISTER, ('register',)),
+        (HELP, ('help',))
+    ),
+    '직원관리': (
+        (GREETING, ('greeting',)),
+        (COUNT, ('staff', 'quantity')),
+        (LIST, ('list',)),
+        (SALARY, ('salary',)),
+        (SCHEDULE, ('schedule',)),
+        (HELP, ('help',)),
+        # "직원 보여줘" 처럼 대상만 말한 경우 (급여/근무/도움말 질문을 가로채지 않도록 마지막)
+        (LIST, ('staff',))
+    ),
+    '인사관리': (
+        (SALARY, ('salary',)),
+        (ATTENDANCE, ('attendance',)),
+        (VACATION, ('vacation',))
+    ),
+    '재고관리': (
+        (GREETING, ('greeting',)),
+        (COUNT, ('stock', 'quantity')),
+        (COUNT, ('stock', 'status')),
+        (LOW_STOCK, ('low_stock',)),
+        (LIST, ('list',)),
+        (LIST, ('item',)),
+        (ORDER, ('order',)),
+        (HELP, ('help',))
+    )
+}
+
+class KeywordAutomaton:
+    """여러 키워드를 한 번의 훑기로 찾는 Aho–Corasick 자동자 (키워드 -> 묶음 이름)"""
+
+    def __init__(self, keyword_groups):
+        self.goto = [{}]
+        self.fail = [0]
+        outputs = [set()]
+        for group, keywords in keyword_groups.items():
+            for keyword in keywords:
+                state = 0
+                for char in keyword:
+                    next_state = self.goto[state].get(char)
+                    if next_state is None:
+                        next_state = len(self.goto)
+                        self.goto.append({})
+                        self.fail.append(0)
+                        outputs.append(set())
+                        self.goto[state][char] = next_state
+                    state = next_state
+                outputs[state].add(group)
+
+        # 실패 링크: 지금까지 읽은 글자의 가장 긴 접미사이면서 키워드 접두사인 상태 (너비 우선)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                outputs[next_state] |= outputs[self.fail[next_state]]
+        self.outputs = [frozenset(output) for output in outputs]
+
+    def groups(self, text):
+        """텍스트에 들어 있는 키워드의 묶음 이름 집합"""
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                found |= outputs[state]
+        return found
+
+class Intent:
+    """분류 결과: 의도 이름, 뽑아 낸 값, 표 데이터 요청 여부 (캐시와 공유되므로 읽기 전용)"""
+
+    __slots__ = ('name', 'slots', 'table')
+
+    def __init__(self, name, slots=None, table=False):
+        self.name = name
+        self.slots = slots or {}
+        self.table = table
+
+    def __repr__(self):
+        return f"Intent({self.name!r}, {self.slots!r}, table={self.table})"
+
+_AUTOMATON = KeywordAutomaton(KEYWORD_GROUPS)
+
+# 한글 음절의 받침 번호 (0: 받침 없음, 8: ㄹ)
+_HANGUL_FIRST, _HANGUL_LAST = ord('가'), ord('힣')
+_JONG_NONE, _JONG_RIEUL = 0, 8
+
+def _final_consonant(char):
+    """한글 음절의 받침 번호 (한글이 아니면 None)"""
+    code = ord(char)
+    if _HANGUL_FIRST <= code <= _HANGUL_LAST:
+        return (code - _HANGUL_FIRST) % 28
+    return None
+
+def _strip_particle(value, field):
+    """텍스트 값 끝의 조사 로/으로 제거 ("010-9999-8888로", "VIP로", "운영팀으로", "세종대로로")
+
+    값 자체가 로로 끝나는 경우("테헤란로", "세종대로", "프로")는 그대로 둠:
+    받침(ㄹ 제외) 뒤의 로는 조사가 아니고, 주소는 도로명이라 로가 겹칠 때만, 나머지는 두 글자 이상 남을 때만 뗌
+    """
+    for particle in (' 으로', ' 로'):
+        if value.endswith(particle) and len(value) > len(particle):
+            return value[:-len(particle)].rstrip()
+    if value.endswith('으로') and len(value) > 2:
+        final = _final_consonant(value[-3])
+        return value[:-2] if final not in (_JONG_NONE, _JONG_RIEUL) else value
+    if not value.endswith('로') or len(value) < 2:
+        return value
+    stem = value[:-1]
+    final = _final_consonant(stem[-1])
+    if final is None or stem.endswith('로'):
+        return stem
+    if final not in (_JONG_NONE, _JONG_RIEUL) or field == '주소' or len(stem) < 2:
+        return value
+    return stem
+
+def _parse_value(text, kind, field=None):
+    """수정할 값 정규화 (amount: "15만원" -> 150000, "150000원" -> 150000, text: 끝의 조사 로/으로 제거)"""
+    if kind == 'amount':
+        if '만원' in text:
+            return int(text.replace('만원', '')) * 10000
+        return int(re.sub(r'[^\d]', '', text))
+    if kind == 'int':
+        return int(text)
+    return _strip_particle(text, field)
+
+def _route(agent_type, message):
+    text = message.lower()
+    groups = _AUTOMATON.groups(text)
+    table = 'table' in groups
+    # 값은 대소문자를 살려 원문에서 잘라냄 (소문자로 바꿔 길이가 달라지는 드문 문자가 있으면 소문자 그대로)
+    original = message if len(message) == len(text) else text
+
+    for required, field, pattern, kind in UPDATE_PATTERNS.get(agent_type, ()):
+        if not groups.issuperset(required):
+            continue
+        match = pattern.search(text)
+        if match:
+            captured = [original[start:end] for start, end in (match.span(i) for i in range(1, pattern.groups + 1))]
+            if field is None:
+                target, field, value = captured
+            else:
+                target, value = captured
+            slots = {'target': target.strip(), 'field': field, 'value': _parse_value(value, kind, field)}
+            return Intent(UPDATE_FIELD, slots, table)
+
+    for name, required in INTENT_RULES.get(agent_type, ()):
+        if groups.issuperset(required):
+            return Intent(name, table=table)
+    return Intent(UNKNOWN, table=table)
+
+@lru_cache(maxsize=1024)
+def route_intent(agent_type, message):
+    """메시지 의도 분류 (한 요청 안에서 수정 처리/표 추출/키워드 응답이 다시 물어도 한 번만 계산)"""
+    return _route(agent_type, message)
@@ -8,5 +8,13 @@ from basic_server import run_server
 if __name__ == "__main__":
     # Railway에서 제공하는 PORT 환경변수 사용
     port = int(os.environ.get("PORT", 8000))
-    print(f"🚀 Railway 환경에서 서버 시작: 포트 {port}")
-    run_server(port)
+    # 동시 처리 워커 수 (SERVER_WORKERS, 기본 8)
+    workers = int(os.environ.get("SERVER_WORKERS", 8))
+    # 서버 모드 (SERVER_MODE=async 이면 asyncio 서버)
+    mode = os.environ.get("SERVER_MODE", "threaded").lower()
+    print(f"🚀 Railway 환경에서 서버 시작: 포트 {port} (모드 {mode}, 워커 {workers}개)")
+    if mode == "async":
+        from async_server import run_async_server
+        run_async_server(port, workers=workers)
+    else:
+        run_server(port, workers=workers)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+채팅 응답 캐시 모듈
+같은 에이전트에 같은 질문(정규화 후)이 같은 데이터로 다시 들어오면 OpenAI 를 다시 부르지 않고
+저장해 둔 답변을 돌려줌 (LRU + TTL)
+워크북 데이터 버전(all_excel_reader.get_data_version)을 키에 넣으므로, 워크북이나 저장 대기 중인
+변경분이 바뀌면 이전 답변은 쓰이지 않고 그 에이전트의 답변은 모두 지워짐
+(질문마다 달라지는 프롬프트 컨텍스트가 아니라 데이터 자체의 버전이라 다른 질문이 서로의 답변을 지우지 않음)
+"""
+
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+_WHITESPACE = re.compile(r'\s+')
+
+def normalize_message(message):
+    """캐시 키용 질문 정규화 (NFKC, 소문자, 연속 공백, 끝의 물음표/마침표 등)"""
+    text = unicodedata.normalize('NFKC', message or '').lower()
+    text = _WHITESPACE.sub(' ', text).strip()
+    return text.rstrip('?!.~ ')
+
+class ResponseCache:
+    """(에이전트, 정규화한 질문, 데이터 버전) -> 답변 LRU/TTL 캐시"""
+
+    def __init__(self, max_entries, ttl_seconds):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = max_entries > 0 and ttl_seconds > 0
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # 키 -> (저장 시각, 답변)
+        self.versions = {}  # 에이전트 -> 마지막으로 본 데이터 버전
+        self.counters = dict.fromkeys(('hits', 'misses', 'expired', 'evictions', 'invalidations', 'bypassed', 'stores'), 0)
+
+    def key(self, agent_type, message, data_version):
+        """캐시 키 (데이터 버전을 알 수 없으면 None: 저장/조회하지 않음)"""
+        if data_version is None:
+            return None
+        return (agent_type, normalize_message(message), data_version)
+
+    def _observe_version(self, agent_type, version):
+        """에이전트의 데이터 버전이 바뀌었으면 그 에이전트의 이전 답변을 모두 삭제 (잠금 안에서 호출)"""
+        if self.versions.get(agent_type) == version:
+            return
+        self.versions[agent_type] = version
+        stale = [key for key in self.entries if key[0] == agent_type and key[2] != version]
+        for key in stale:
+            del self.entries[key]
+        self.counters['invalidations'] += len(stale)
+
+    def get(self, key, bypass=False):
+        """저장된 답변 (없거나 만료됐거나 bypass 면 None)"""
+        if not self.enabled or key is None:
+            return None
+        with self.lock:
+            self._observe_version(key[0], key[2])
+            if bypass:
+                self.counters['bypassed'] += 1
+                return None
+            entry = self.entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self.entries[key]
+                self.counters['expired'] += 1
+                entry = None
+            if entry is None:
+                self.counters['misses'] += 1
+                return None
+            self.entries.move_to_end(key)
+            self.counters['hits'] += 1
+            return entry[1]
+
+    def put(self, key, response):
+        """답변 저장 (빈 답변은 저장하지 않음)"""
+        if not self.enabled or key is None or not response:
+            return
+        with self.lock:
+            self._observe_version(key[0], key[2])
+            self.entries[key] = (time.monotonic(), response)
+            self.entries.move_to_end(key)
+            self.counters['stores'] += 1
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.counters['evictions'] += 1
+
+    def clear(self):
+        with self.lock:
+            self.counters['invalidations'] += len(self.entries)
+            self.entries.clear()
+            self.versions.clear()
+
+    def stats(self):
+        """적중/미스 통계"""
+        with self.lock:
+            stats = dict(self.counters)
+            stats['entries'] = len(self.entries)
+        stats['enabled'] = self.enabled
+        stats['max_entries'] = self.max_entries
+        stats['ttl_seconds'] = self.ttl_seconds
+        total = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / total, 4) if total else 0.0
+        return stats
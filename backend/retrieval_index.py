@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+채팅 컨텍스트용 레코드 검색 모듈
+카테고리 레코드마다 값을 한글 음절 2-gram / 단어 / 숫자 토큰으로 색인해 두고(BM25),
+질문과 관련 있는 행을 골라 컨텍스트 표 맨 앞에 담음 (행이 많아도 프롬프트 크기는 예산으로 고정)
+레코드 내용 자체를 문서 키로 쓰므로, 워크북이 바뀌면 새로 생기거나 바뀐 행만 다시 색인함
+"""
+
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter
+
+# BM25 매개변수
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_WORDS = re.compile(r'[가-힣]+|[a-z]+|\d+')
+# 겹치는 한글 음절 2-gram (정규식 엔진 안에서 한 번에 추출)
+_HANGUL_BIGRAMS = re.compile(r'(?=([가-힣]{2}))')
+
+def tokenize(text):
+    """검색 토큰 (한글은 음절 2-gram + 단어 전체, 영문 단어, 숫자열)
+
+    조사가 붙은 이름("김철수의")이나 띄어 쓴 용어도 2-gram 으로 맞춤
+    (두 음절 단어는 2-gram 과 같으므로 한 번만 셈)
+    """
+    text = unicodedata.normalize('NFKC', text).lower()
+    tokens = _HANGUL_BIGRAMS.findall(text)
+    tokens.extend(word for word in _WORDS.findall(text) if len(word) != 2 or not '가' <= word[0] <= '힣')
+    return tokens
+
+def _query_tokens(query):
+    """질문 토큰 (숫자는 번호 열 토큰 '#번호' 도 함께 찾음: "500번 회원")"""
+    tokens = tokenize(query)
+    return set(tokens) | {'#' + token for token in tokens if token.isdigit()}
+
+class RecordIndex:
+    """레코드 목록 하나(카테고리)의 BM25 역색인"""
+
+    def __init__(self, id_field=None):
+        self.id_field = id_field  # 번호 열 ('#번호' 토큰으로 따로 색인)
+        self.lock = threading.Lock()
+        self.source = None  # 마지막으로 맞춘 레코드 목록 (같은 스냅샷이면 다시 맞추지 않음)
+        self.fingerprints = []
+        self.doc_ids = {}  # 레코드 내용 -> 문서 번호
+        self.docs = {}  # 문서 번호 -> [같은 내용 행 수, 토큰 빈도, 토큰 수, 레코드 내용]
+        self.postings = {}  # 토큰 -> {문서 번호: 빈도}
+        self.next_doc_id = 0
+        self.total_length = 0
+        self.counters = {'syncs': 0, 'indexed': 0, 'removed': 0, 'searches': 0}
+
+    def _fingerprint(self, record):
+        return tuple(str(value) for value in record.values())
+
+    def _document_tokens(self, record):
+        tokens = tokenize(' '.join(str(value) for value in record.values() if value is not None))
+        if self.id_field and record.get(self.id_field) is not None:
+            tokens.append('#' + str(record[self.id_field]).split('.')[0])
+        return tokens
+
+    def _add(self, fingerprint, record):
+        doc_id = self.doc_ids.get(fingerprint)
+        if doc_id is not None:
+            self.docs[doc_id][0] += 1
+            return
+        doc_id = self.next_doc_id
+        self.next_doc_id += 1
+        frequencies = Counter(self._document_tokens(record))
+        length = sum(frequencies.values())
+        self.doc_ids[fingerprint] = doc_id
+        self.docs[doc_id] = [1, frequencies, length, fingerprint]
+        for token, count in frequencies.items():
+            self.postings.setdefault(token, {})[doc_id] = count
+        self.total_length += length
+        self.counters['indexed'] += 1
+
+    def _remove(self, fingerprint):
+        doc_id = self.doc_ids[fingerprint]
+        doc = self.docs[doc_id]
+        doc[0] -= 1
+        if doc[0] > 0:
+            return
+        del self.docs[doc_id], self.doc_ids[fingerprint]
+        for token in doc[1]:
+            posting = self.postings[token]
+            del posting[doc_id]
+            if not posting:
+                del self.postings[token]
+        self.total_length -= doc[2]
+        self.counters['removed'] += 1
+
+    def _sync(self, records):
+        """색인을 레코드 목록에 맞춤 (잠금 안에서 호출, 바뀐 행만 빼고 더함)"""
+        if records is self.source:
+            return
+        fingerprints = [self._fingerprint(record) for record in records]
+        previous = {}
+        for fingerprint in self.fingerprints:
+            previous[fingerprint] = previous.get(fingerprint, 0) + 1
+        for fingerprint, record in zip(fingerprints, records):
+            if previous.get(fingerprint, 0) > 0:
+                previous[fingerprint] -= 1
+            else:
+                self._add(fingerprint, record)
+        for fingerprint, count in previous.items():
+            for _ in range(count):
+                self._remove(fingerprint)
+        self.source, self.fingerprints = records, fingerprints
+        self.counters['syncs'] += 1
+
+    def _scores(self, query):
+        """질문과 겹치는 레코드별 BM25 점수"""
+        doc_count = len(self.docs)
+        if not doc_count:
+            return {}
+        average_length = self.total_length / doc_count or 1
+        scores = {}
+        for token in _query_tokens(query):
+            posting = self.postings.get(token)
+            if not posting:
+                continue
+            idf = math.log(1 + (doc_count - len(posting) + 0.5) / (len(posting) + 0.5))
+            for doc_id, count in posting.items():
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.docs[doc_id][2] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * count * (BM25_K1 + 1) / (count + norm)
+        return {self.docs[doc_id][3]: score for doc_id, score in scores.items()}
+
+    def rank(self, records, query, top_k):
+        """질문과 관련 높은 행 top_k 개를 앞으로, 나머지는 원래 순서대로 뒤에 둔 목록"""
+        if not records or not query or top_k <= 0:
+            return records
+        with self.lock:
+            self._sync(records)
+            scores = self._scores(query)
+            fingerprints = self.fingerprints
+            self.counters['searches'] += 1
+        if not scores:
+            return records
+
+        matched = sorted(
+            (position for position, fingerprint in enumerate(fingerprints) if fingerprint in scores),
+            key=lambda position: -scores[fingerprints[position]]
+        )[:top_k]
+        chosen = set(matched)
+        return [records[position] for position in matched] + [
+            record for position, record in enumerate(records) if position not in chosen
+        ]
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.counters)
+            stats['documents'] = len(self.docs)
+            stats['tokens'] = len(self.postings)
+        return stats
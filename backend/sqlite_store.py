@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+SQLite 저장소 모듈
+카테고리 워크북을 색인된 로컬 SQLite DB 로 가져와 두고 읽기/수정을 DB 에서 처리함
+수정은 DB 반영과 미반영 목록(pending) 기록을 한 트랜잭션으로 커밋하고,
+워크북에는 변경 저널과 같은 주기(또는 요청 시)로 바뀐 셀만 다시 저장함
+워크북이 밖에서 바뀌면(수정시각/크기 변경) 다음 읽기 때 다시 가져옴
+"""
+
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+from change_journal import ChangeJournal, _json_default
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    category TEXT PRIMARY KEY,
+    excel_file TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    columns TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS pending (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    category TEXT NOT NULL,
+    entry TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pending_category ON pending (category, seq);
+"""
+
+def _quote(name):
+    """SQL 식별자 (한글/공백 열 이름 그대로 사용)"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+def _table(category):
+    return _quote(f"data_{category}")
+
+def _db_value(value):
+    """SQLite 에 넣을 값 (numpy 스칼라 -> 파이썬 값, NaN/NA -> NULL)"""
+    if hasattr(value, 'item'):
+        value = value.item()
+    if value is None or (not isinstance(value, (str, bytes)) and pd.isna(value)):
+        return None
+    if isinstance(value, (int, float, str, bytes)):
+        return value
+    return str(value)
+
+class SqliteStore:
+    """카테고리별 시트 테이블 + 원본 워크북 상태 + 워크북 미반영 변경 목록"""
+
+    def __init__(self, db_path, key_columns):
+        self.db_path = db_path
+        self.key_columns = key_columns  # 카테고리 -> 색인할 열 (기본키, 이름)
+        self.lock = threading.RLock()
+        self._conn = None
+        self._pid = None
+
+    def _connection(self):
+        # 대시보드 프로세스 풀 워커는 부모에서 물려받은 연결 대신 자기 연결을 엶
+        if self._conn is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=FULL')
+            conn.executescript(SCHEMA)
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        with self.lock:
+            conn = self._connection()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+
+    def _source(self, conn, category):
+        return conn.execute(
+            'SELECT excel_file, mtime_ns, size, columns, version FROM sources WHERE category = ?', (category,)
+        ).fetchone()
+
+    def version(self, category):
+        """카테고리 데이터 버전 (가져오기/수정마다 증가, 파싱 캐시 키에 사용)"""
+        with self.lock:
+            row = self._connection().execute('SELECT version FROM sources WHERE category = ?', (category,)).fetchone()
+        return row[0] if row else 0
+
+    def is_current(self, category, excel_file):
+        """DB 가 이 워크북의 현재 내용을 가져온 상태인지"""
+        stat = os.stat(excel_file)
+        with self.lock:
+            source = self._source(self._connection(), category)
+        return source is not None and source[:3] == (excel_file, stat.st_mtime_ns, stat.st_size)
+
+    def import_workbook(self, category, excel_file, reader):
+        """워크북 시트를 테이블로 다시 가져오기 (남아 있는 미반영 변경분은 다시 적용)"""
+        # 읽는 도중 파일이 바뀌면 다음 읽기 때 다시 가져오도록 상태는 읽기 전에 기록
+        stat = os.stat(excel_file)
+        frame = reader()
+        columns = [str(column) for column in frame.columns]
+        table = _table(category)
+        
+        with self._transaction() as conn:
+            source = self._source(conn, category)
+            conn.execute(f'DROP TABLE IF EXISTS {table}')
+            conn.execute(f'CREATE TABLE {table} (_row INTEGER PRIMARY KEY, {", ".join(map(_quote, columns))})')
+            placeholders = ', '.join('?' * (len(columns) + 1))
+            conn.executemany(
+                f'INSERT INTO {table} VALUES ({placeholders})',
+                ([label] + [_db_value(value) for value in values]
+                 for label, values in enumerate(frame.itertuples(index=False, name=None)))
+            )
+            for column in self.key_columns.get(category, ()):
+                if column in columns:
+                    conn.execute(f'CREATE INDEX {_quote(f"data_{category}_{column}")} ON {table} ({_quote(column)})')
+            
+            conn.execute(
+                'INSERT OR REPLACE INTO sources (category, excel_file, mtime_ns, size, columns, version) VALUES (?, ?, ?, ?, ?, ?)',
+                (category, excel_file, stat.st_mtime_ns, stat.st_size, json.dumps(columns, ensure_ascii=False), (source[4] if source else 0) + 1)
+            )
+            pending = self._pending_entries(conn, category)
+            for entry in pending:
+                self._apply_entry(conn, category, entry)
+        
+        print(f"🗃️ {category} 워크북을 SQLite 로 가져옴 ({len(frame)}행, 미반영 변경 {len(pending)}건 재적용)")
+
+    def read_frame(self, category, excel_file, reader):
+        """카테고리 시트 (워크북이 바뀌었으면 먼저 다시 가져옴)"""
+        with self.lock:
+            if not self.is_current(category, excel_file):
+                self.import_workbook(category, excel_file, reader)
+            conn = self._connection()
+            columns = json.loads(self._source(conn, category)[3])
+            frame = pd.read_sql_query(
+                f'SELECT _row, {", ".join(map(_quote, columns))} FROM {_table(category)} ORDER BY _row',
+                conn, index_col='_row'
+            )
+        frame.index.name = None
+        # 워크북에서 읽은 시트와 같게 빈 칸은 NaN
+        return frame.replace({None: float('nan')})
+
+    def _pending_entries(self, conn, category):
+        rows = conn.execute('SELECT entry FROM pending WHERE category = ? ORDER BY seq', (category,))
+        return [json.loads(entry) for (entry,) in rows]
+
+    def pending_entries(self, category):
+        """워크북에 아직 반영되지 않은 변경 항목"""
+        with self.lock:
+            return self._pending_entries(self._connection(), category)
+
+    def has_pending(self, category):
+        with self.lock:
+            row = self._connection().execute('SELECT 1 FROM pending WHERE category = ? LIMIT 1', (category,)).fetchone()
+        return row is not None
+
+    def _ensure_columns(self, conn, category, names):
+        """시트에 없던 열(재고 총액 등)은 테이블에도 추가"""
+        source = self._source(conn, category)
+        columns = json.loads(source[3])
+        missing = [str(name) for name in names if str(name) not in columns]
+        for name in missing:
+            conn.execute(f'ALTER TABLE {_table(category)} ADD COLUMN {_quote(name)}')
+        if missing:
+            conn.execute('UPDATE sources SET columns = ? WHERE category = ?',
+                         (json.dumps(columns + missing, ensure_ascii=False), category))
+
+    def _apply_entry(self, conn, category, entry):
+        """저널 항목 하나를 테이블에 적용 (change_journal.apply_entries 와 같은 규칙)"""
+        table = _table(category)
+        key_column, changes = entry['key_column'], entry['changes']
+        self._ensure_columns(conn, category, [key_column, *changes])
+        
+        updated = 0
+        if changes:
+            assignments = ', '.join(f'{_quote(column)} = ?' for column in changes)
+            updated = conn.execute(
+                f'UPDATE {table} SET {assignments} WHERE {_quote(key_column)} = ?',
+                [_db_value(value) for value in changes.values()] + [_db_value(entry['key'])]
+            ).rowcount
+        if entry.get('insert') and not updated:
+            exists = conn.execute(f'SELECT 1 FROM {table} WHERE {_quote(key_column)} = ? LIMIT 1', (_db_value(entry['key']),)).fetchone()
+            if exists is None:
+                row = {key_column: entry['key'], **changes}
+                conn.execute(
+                    f'INSERT INTO {table} (_row, {", ".join(map(_quote, row))}) '
+                    f'VALUES ((SELECT COALESCE(MAX(_row), -1) + 1 FROM {table}), {", ".join("?" * len(row))})',
+                    [_db_value(value) for value in row.values()]
+                )
+
+    def apply_entries(self, category, entries):
+        """변경 항목을 테이블에 반영하고 미반영 목록에 추가 (한 트랜잭션)"""
+        with self._transaction() as conn:
+            for entry in entries:
+                self._apply_entry(conn, category, entry)
+            conn.executemany(
+                'INSERT INTO pending (category, entry) VALUES (?, ?)',
+                ((category, json.dumps(entry, ensure_ascii=False, default=_json_default)) for entry in entries)
+            )
+            conn.execute('UPDATE sources SET version = version + 1 WHERE category = ?', (category,))
+
+    def mark_synced(self, category, excel_file, saved_over):
+        """워크북 저장이 끝난 뒤 호출: 미반영 목록을 비우고 저장된 워크북 상태를 기록
+        
+        saved_over 는 저장 직전 워크북의 (수정시각, 크기). DB 가 가져온 워크북 위에 저장했을 때만
+        새 상태를 기록해서 다시 가져오지 않게 하고, 그 사이 밖에서 바뀐 워크북에 저장했다면
+        다음 읽기 때 (밖의 수정 + 이번 변경이 모두 담긴) 워크북을 다시 가져옴
+        """
+        stat = os.stat(excel_file)
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM pending WHERE category = ?', (category,))
+            conn.execute(
+                'UPDATE sources SET mtime_ns = ?, size = ? WHERE category = ? AND excel_file = ? AND mtime_ns = ? AND size = ?',
+                (stat.st_mtime_ns, stat.st_size, category, excel_file, *saved_over)
+            )
+
+    def stats(self):
+        """카테고리별 행 수 / 버전 / 미반영 변경 수"""
+        with self.lock:
+            conn = self._connection()
+            sources = conn.execute('SELECT category, excel_file, version FROM sources ORDER BY category').fetchall()
+            result = {}
+            for category, excel_file, version in sources:
+                rows = conn.execute(f'SELECT COUNT(*) FROM {_table(category)}').fetchone()[0]
+                pending = conn.execute('SELECT COUNT(*) FROM pending WHERE category = ?', (category,)).fetchone()[0]
+                result[category] = {
+                    'file': os.path.basename(excel_file),
+                    'rows': rows,
+                    'version': version,
+                    'pending': pending
+                }
+        return {'db_path': self.db_path, 'categories': result}
+
+class SqliteJournal(ChangeJournal):
+    """변경 저널의 SQLite 버전: 작업 시트를 DB 에서 읽고, 미반영 항목을 저널 파일 대신 DB 에 기록"""
+
+    def __init__(self, category, excel_file, sheet_name, lock, store, reader, aggregator=None):
+        super().__init__(category, excel_file, sheet_name, lock, aggregator)
+        self.store = store
+        self.reader = reader  # 워크북 시트 읽기 함수 (다시 가져올 때 사용)
+
+    def _read_base_frame(self):
+        return self.store.read_frame(self.category, self.excel_file, self.reader)
+
+    def _read_entries(self):
+        return self.store.pending_entries(self.category)
+
+    def _persist_entries(self, entries):
+        self.store.apply_entries(self.category, entries)
+
+    def _clear_entries(self, saved_over):
+        self.store.mark_synced(self.category, self.excel_file, saved_over)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+정적 파일(프론트엔드 빌드 결과물) 메모리 캐시 모듈
+서버 시작 시 static 폴더를 한 번 읽어 원본과 압축본(gzip, brotli)을 미리 만들어 두고,
+요청마다 디스크를 읽거나 압축하지 않고 바로 응답함
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+
+# brotli 모듈이 설치되어 있을 때만 br 압축본 생성
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# 이 크기보다 작은 파일은 압축하지 않음 (헤더 오버헤드가 더 큼)
+MIN_COMPRESS_SIZE = 512
+
+# 압축 효과가 있는 텍스트 계열 Content-Type
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+
+# 빌드 시 파일명에 내용 해시가 붙은 파일 (예: index-610ec960.js) 은 내용이 바뀌지 않음
+HASHED_NAME_PATTERN = re.compile(r'-[0-9a-f]{8,}\.[A-Za-z0-9]+$')
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+# 기존 서버 응답과 같은 Content-Type 유지
+CONTENT_TYPES = {
+    '.html': 'text/html; charset=utf-8',
+    '.css': 'text/css',
+    '.js': 'application/javascript'
+}
+
+def _content_type(filename):
+    ext = os.path.splitext(filename)[1].lower()
+    if ext in CONTENT_TYPES:
+        return CONTENT_TYPES[ext]
+    guessed, _ = mimetypes.guess_type(filename)
+    return guessed or 'application/octet-stream'
+
+def _parse_accept_encoding(header):
+    """Accept-Encoding 헤더에서 허용된(q > 0) 인코딩 이름 집합"""
+    accepted = set()
+    for part in (header or '').split(','):
+        pieces = part.strip().split(';')
+        name = pieces[0].strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in pieces[1:]:
+            key, _, value = param.strip().partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            accepted.add(name)
+    return accepted
+
+class StaticAsset:
+    """메모리에 올려둔 정적 파일 하나 (원본 + 압축본)"""
+
+    def __init__(self, url_path, content):
+        self.url_path = url_path
+        self.content_type = _content_type(url_path)
+        self.digest = hashlib.sha1(content).hexdigest()[:20]
+        self.cache_control = IMMUTABLE_CACHE_CONTROL if HASHED_NAME_PATTERN.search(url_path) else REVALIDATE_CACHE_CONTROL
+        self.variants = {'identity': content}
+        
+        if len(content) >= MIN_COMPRESS_SIZE and self.content_type.startswith(COMPRESSIBLE_TYPES):
+            # mtime=0 으로 고정해야 재시작해도 같은 바이트가 나옴
+            gzipped = gzip.compress(content, compresslevel=9, mtime=0)
+            if len(gzipped) < len(content):
+                self.variants['gzip'] = gzipped
+            if BROTLI_AVAILABLE:
+                compressed = brotli.compress(content, quality=11)
+                if len(compressed) < len(content):
+                    self.variants['br'] = compressed
+
+    def etag(self, encoding=None):
+        """인코딩별 ETag (압축본과 원본은 바이트가 달라 서로 다른 태그 사용)"""
+        if encoding:
+            return f'"{self.digest}-{encoding}"'
+        return f'"{self.digest}"'
+
+    def select(self, accept_encoding):
+        """클라이언트가 받을 수 있는 가장 작은 본문 선택 -> (인코딩 또는 None, 바이트)"""
+        accepted = _parse_accept_encoding(accept_encoding)
+        for encoding in ('br', 'gzip'):
+            if encoding in self.variants and encoding in accepted:
+                return encoding, self.variants[encoding]
+        return None, self.variants['identity']
+
+    def matches_etag(self, if_none_match):
+        """If-None-Match 헤더가 현재 내용의 ETag(어느 인코딩이든)와 일치하는지"""
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(','):
+            tag = tag.strip()
+            if tag.startswith('W/'):
+                tag = tag[2:]
+            if tag == '*' or tag.strip('"').split('-')[0] == self.digest:
+                return True
+        return False
+
+class StaticAssetCache:
+    """static 폴더 전체를 URL 경로 기준으로 보관"""
+
+    def __init__(self, static_dir):
+        self.static_dir = static_dir
+        self.assets = {}
+        self.load()
+
+    def load(self):
+        """static 폴더를 다시 읽어 캐시 교체 (새 빌드를 복사한 뒤 호출)"""
+        assets = {}
+        total_bytes = 0
+        
+        if os.path.isdir(self.static_dir):
+            for root, _, files in os.walk(self.static_dir):
+                for filename in files:
+                    # 빌드 도구가 미리 만든 압축본은 원본에서 다시 만들기 때문에 건너뜀
+                    if filename.startswith('.') or filename.endswith(('.gz', '.br')):
+                        continue
+                    
+                    full_path = os.path.join(root, filename)
+                    relative = os.path.relpath(full_path, self.static_dir).replace(os.sep, '/')
+                    try:
+                        with open(full_path, 'rb') as f:
+                            content = f.read()
+                    except OSError as e:
+                        print(f"⚠️ 정적 파일 읽기 실패: {relative} ({e})")
+                        continue
+                    
+                    assets['/' + relative] = StaticAsset('/' + relative, content)
+                    total_bytes += len(content)
+        
+        self.assets = assets
+        if assets:
+            print(f"📦 정적 파일 {len(assets)}개 캐시 완료 ({total_bytes / 1024:.0f}KB, brotli: {BROTLI_AVAILABLE})")
+
+    def get(self, url_path):
+        """URL 경로에 해당하는 파일 (없으면 None)"""
+        return self.assets.get(url_path)
+
+    @property
+    def index(self):
+        return self.assets.get('/index.html')
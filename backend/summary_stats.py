@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+카테고리 요약 통계 모듈
+요약 값(총회원수, 총월매출, 부족품목수 …)을 행별 기여분의 합으로 정의해 두고,
+시트를 읽을 때 한 번 전체 계산한 뒤 수정/추가는 바뀐 행의 이전 기여분을 빼고
+새 기여분을 더해서 갱신함 (요약 조회 때 전체 행을 다시 훑지 않음)
+"""
+
+import pandas as pd
+
+# 카테고리별 요약 항목 (출력 순서대로): (이름, 종류, 열, 기준값)
+#   rows: 행 수 / eq: 열 값이 기준값과 같은 행 수 / in: 열 값이 기준값 목록에 있는 행 수
+#   int_eq: 정수로 바꾼 값(빈 칸은 0)이 기준값과 같은 행 수 / ne_str: 문자열로 바꾼 값이 기준값과 다른 행 수
+#   int_sum: 정수 합계 (빈 칸은 0) / product_sum: 두 열(정수) 곱의 합계 / avg: 실수 평균 (소수점 둘째 자리)
+SUMMARY_SPECS = {
+    'members': (
+        ('총회원수', 'rows', None, None),
+        ('활성회원', 'eq', '결제상태', '완료'),
+        ('프리미엄', 'eq', '멤버십타입', '프리미엄'),
+        ('일반', 'eq', '멤버십타입', '일반'),
+        ('VIP', 'eq', '멤버십타입', 'VIP'),
+        ('남성', 'eq', '성별', '남'),
+        ('여성', 'eq', '성별', '여'),
+        ('총월매출', 'int_sum', '월회비', None)
+    ),
+    'staff': (
+        ('총직원수', 'rows', None, None),
+        ('트레이너', 'eq', '직책', '트레이너'),
+        ('매니저', 'eq', '직책', '매니저'),
+        ('청소원', 'eq', '직책', '청소원'),
+        ('수영강사', 'eq', '직책', '수영강사'),
+        ('활성직원', 'eq', '근무상태', '활성'),
+        ('총인건비', 'int_sum', '월급여', None)
+    ),
+    'hr': (
+        ('총직원수', 'rows', None, None),
+        ('총사용연차', 'int_sum', '연차사용', None),
+        ('총초과근무', 'int_sum', '초과근무', None),
+        ('평균평가점수', 'avg', '평가점수', None),
+        ('연차완전사용자', 'int_eq', '잔여연차', 0),
+        ('교육완료자', 'ne_str', '교육이수', '')
+    ),
+    'inventory': (
+        ('총품목수', 'rows', None, None),
+        ('정상재고', 'eq', '상태', '정상'),
+        ('부족재고', 'eq', '상태', '부족'),
+        ('긴급부족', 'eq', '상태', '긴급부족'),
+        ('총재고가치', 'product_sum', ('단가', '현재재고'), None),
+        ('부족품목수', 'in', '상태', ('부족', '긴급부족'))
+    )
+}
+
+def _int(value):
+    """셀 값을 정수로 (빈 칸은 0, 기존 fillna(0).astype('int64') 와 같은 결과)"""
+    return 0 if pd.isna(value) else int(value)
+
+def _float(value):
+    return 0.0 if pd.isna(value) else float(value)
+
+def _present(value):
+    """빈 칸(NaN/NA)이 아닌지 (NA 와의 비교는 참/거짓이 아니므로 먼저 확인)"""
+    return not pd.isna(value)
+
+def _int_column(frame, column):
+    return frame[column].fillna(0).astype('int64')
+
+def _column_total(frame, kind, column, target):
+    """요약 항목 하나의 전체 합계 (열 단위 계산)"""
+    if kind == 'rows':
+        return len(frame)
+    if kind == 'eq':
+        return int((frame[column] == target).sum())
+    if kind == 'in':
+        return int(frame[column].isin(target).sum())
+    if kind == 'int_eq':
+        return int((_int_column(frame, column) == target).sum())
+    if kind == 'ne_str':
+        return sum(1 for value in frame[column].tolist() if str(value) != target)
+    if kind == 'int_sum':
+        return int(_int_column(frame, column).sum())
+    if kind == 'product_sum':
+        first, second = column
+        return int((_int_column(frame, first) * _int_column(frame, second)).sum())
+    if kind == 'avg':
+        return float(frame[column].astype('float64').fillna(0).sum())
+    raise ValueError(f"알 수 없는 요약 종류: {kind}")
+
+def _cell_total(kind, column, target, cell):
+    """요약 항목 하나에 대한 행 하나의 기여분 (cell(열 이름) -> 값)"""
+    if kind == 'rows':
+        return 1
+    if kind == 'eq':
+        value = cell(column)
+        return 1 if _present(value) and value == target else 0
+    if kind == 'in':
+        value = cell(column)
+        return 1 if _present(value) and value in target else 0
+    if kind == 'int_eq':
+        return 1 if _int(cell(column)) == target else 0
+    if kind == 'ne_str':
+        return 1 if str(cell(column)) != target else 0
+    if kind == 'int_sum':
+        return _int(cell(column))
+    if kind == 'product_sum':
+        first, second = column
+        return _int(cell(first)) * _int(cell(second))
+    if kind == 'avg':
+        return _float(cell(column))
+    raise ValueError(f"알 수 없는 요약 종류: {kind}")
+
+class SummaryAggregator:
+    """카테고리 요약 값의 누적 합계 (전체 계산 1회 + 행 단위 증감)"""
+
+    def __init__(self, category):
+        self.specs = SUMMARY_SPECS[category]
+        self.totals = None
+
+    def rebuild(self, frame):
+        """시트 전체로 다시 계산 (처음 읽을 때, 워크북이 통째로 바뀌었을 때)"""
+        columns = set(frame.columns)
+        self.totals = {
+            name: _column_total(frame, kind, column, target) if self._has_columns(columns, column) else 0
+            for name, kind, column, target in self.specs
+        }
+
+    @staticmethod
+    def _has_columns(columns, column):
+        if column is None:
+            return True
+        if isinstance(column, tuple):
+            return all(name in columns for name in column)
+        return column in columns
+
+    def row_totals(self, frame, labels):
+        """지정한 행들의 기여분 합계"""
+        columns = set(frame.columns)
+        totals = dict.fromkeys((name for name, _, _, _ in self.specs), 0)
+        for label in labels:
+            cell = lambda column: frame.at[label, column]
+            for name, kind, column, target in self.specs:
+                if self._has_columns(columns, column):
+                    totals[name] += _cell_total(kind, column, target, cell)
+        return totals
+
+    def replace_rows(self, before, after):
+        """행 변경 반영: 이전 기여분을 빼고 새 기여분을 더함"""
+        if self.totals is None:
+            return
+        for name in self.totals:
+            self.totals[name] += after[name] - before[name]
+
+    def summary(self):
+        """API 에 내보낼 요약 dict (평균 같은 파생 값 계산 포함)"""
+        if self.totals is None:
+            return None
+        count = self.totals[self.specs[0][0]]
+        result = {}
+        for name, kind, _, _ in self.specs:
+            value = self.totals[name]
+            if kind == 'avg':
+                value = round(value / count, 2) if count > 0 else 0
+            result[name] = value
+        return result
+
+def compute_summary(category, frame):
+    """시트 전체로 요약 dict 계산"""
+    aggregator = SummaryAggregator(category)
+    aggregator.rebuild(frame)
+    return aggregator.summary()
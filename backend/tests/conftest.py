@@ -0,0 +1,39 @@
+"""
+백엔드 테스트 공통 설정
+backend/ 의 모듈(all_excel_reader, change_journal 등)은 패키지가 아니라 평면 모듈이므로
+어느 디렉터리에서 pytest 를 실행해도 가져올 수 있게 경로에 추가함
+"""
+
+import os
+import sys
+
+import openpyxl
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+MEMBER_SHEET = '회원목록'
+MEMBER_ROWS = [
+    (1, '김철수', '010-1111-2222', '일반'),
+    (2, '이영희', '010-3333-4444', '프리미엄'),
+    (3, '박민수', '010-5555-6666', 'VIP'),
+]
+
+@pytest.fixture
+def member_workbook(tmp_path):
+    """회원 시트 + 서식 있는 머리글 + 건드리면 안 되는 다른 시트가 있는 작은 워크북"""
+    path = tmp_path / 'members' / '회원관리_20250101.xlsx'
+    path.parent.mkdir()
+    workbook = openpyxl.Workbook()
+    ws = workbook.active
+    ws.title = MEMBER_SHEET
+    ws.append(['회원번호', '이름', '전화번호', '회원권'])
+    for row in MEMBER_ROWS:
+        ws.append(row)
+    ws['A1'].font = openpyxl.styles.Font(bold=True)
+    notes = workbook.create_sheet('메모')
+    notes['A1'] = '수정 금지'
+    workbook.save(path)
+    return str(path)
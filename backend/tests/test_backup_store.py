@@ -0,0 +1,79 @@
+"""
+백업 저장소 테스트 (보관 정책, 예전 백업 파일 가져오기)
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+import backup_store
+from backup_store import BackupStore
+
+@pytest.fixture
+def store(tmp_path):
+    return BackupStore(str(tmp_path / 'backups'))
+
+@pytest.fixture
+def excel_dir(tmp_path):
+    """워크북 하나와 예전 방식 백업 파일 세 개"""
+    directory = tmp_path / 'excel' / 'members'
+    directory.mkdir(parents=True)
+    (directory / '회원관리_20250624.xlsx').write_bytes(b'current')
+    for day in (1, 2, 3):
+        (directory / f'회원관리_20250624.xlsx.backup_2025070{day}_120000').write_bytes(f'old-{day}'.encode())
+    return str(tmp_path / 'excel')
+
+def _legacy_files(excel_dir):
+    return sorted(name for name in os.listdir(os.path.join(excel_dir, 'members')) if '.backup_' in name)
+
+def test_create_deduplicates_and_restores(store, tmp_path):
+    workbook = tmp_path / 'a.xlsx'
+    workbook.write_bytes(b'v1')
+    first = store.create('members/a.xlsx', str(workbook))
+    assert store.create('members/a.xlsx', str(workbook)) == first
+
+    workbook.write_bytes(b'v2')
+    store.create('members/a.xlsx', str(workbook))
+    store.restore(first, str(workbook))
+    assert workbook.read_bytes() == b'v1'
+    assert len(store.list_backups('members/a.xlsx')) == 2
+
+def test_migrate_legacy_keeps_originals_and_is_idempotent(store, excel_dir):
+    before = _legacy_files(excel_dir)
+    assert store.migrate_legacy(excel_dir) == 3
+    assert _legacy_files(excel_dir) == before
+
+    backups = store.list_backups('members/회원관리_20250624.xlsx')
+    assert [store.read(entry) for entry in backups] == [b'old-3', b'old-2', b'old-1']
+    assert store.migrate_legacy(excel_dir) == 0
+    assert len(store.list_backups()) == 3
+
+def test_retention_never_prunes_imported_backups(store, excel_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(backup_store, 'BACKUP_KEEP_LAST', 1)
+    monkeypatch.setattr(backup_store, 'BACKUP_KEEP_DAILY', 0)
+    monkeypatch.setattr(backup_store, 'BACKUP_KEEP_WEEKLY', 0)
+    store.migrate_legacy(excel_dir)
+
+    workbook = os.path.join(excel_dir, 'members', '회원관리_20250624.xlsx')
+    for version in (b'v1', b'v2', b'v3'):
+        with open(workbook, 'wb') as f:
+            f.write(version)
+        store.create('members/회원관리_20250624.xlsx', workbook)
+
+    reasons = [entry['reason'] for entry in store.list_backups()]
+    assert reasons.count('legacy') == 3
+    assert reasons.count('save') == 1
+
+def test_retention_keeps_recent_and_daily(store, monkeypatch):
+    monkeypatch.setattr(backup_store, 'BACKUP_KEEP_LAST', 2)
+    monkeypatch.setattr(backup_store, 'BACKUP_KEEP_DAILY', 3)
+    monkeypatch.setattr(backup_store, 'BACKUP_KEEP_WEEKLY', 0)
+    now = datetime(2025, 7, 10, 12)
+    entries = [
+        {'id': f'e{hours}', 'file': 'f.xlsx', 'created_at': (now - timedelta(hours=hours)).isoformat(), 'reason': 'save'}
+        for hours in (1, 2, 3, 30, 31, 200)
+    ]
+    kept = {entry['id'] for entry in store._apply_retention(entries, 'f.xlsx', now)}
+    # 최근 2개 + 최근 3일 안에서 하루 1개 (200시간 전은 정리)
+    assert kept == {'e1', 'e2', 'e30'}
@@ -0,0 +1,165 @@
+"""
+변경 저널 / 셀 단위 워크북 패치 테스트
+"""
+
+import json
+import threading
+
+import openpyxl
+import pandas as pd
+import pytest
+
+import change_journal
+from change_journal import ChangeJournal, WorkbookPatcher, journal_path, read_entries
+from conftest import MEMBER_SHEET
+
+@pytest.fixture(autouse=True)
+def no_background_flush(monkeypatch):
+    """타이머 저장이 테스트 도중 끼어들지 않도록 저장 주기를 길게"""
+    monkeypatch.setattr(change_journal, 'CHANGE_JOURNAL_FLUSH_INTERVAL', 3600)
+    monkeypatch.setattr(change_journal, 'CHANGE_JOURNAL_ENABLED', True)
+
+def _open_journal(excel_file):
+    return ChangeJournal('members', excel_file, MEMBER_SHEET, threading.RLock())
+
+def _abandon(journal):
+    """저장하지 않고 프로세스가 죽은 것처럼 버림"""
+    if journal.timer is not None:
+        journal.timer.cancel()
+
+def _sheet(excel_file):
+    return pd.read_excel(excel_file, sheet_name=MEMBER_SHEET)
+
+def test_record_is_journaled_before_workbook_is_saved(member_workbook):
+    journal = _open_journal(member_workbook)
+    journal.record('회원번호', 2, {'전화번호': '010-9999-8888'})
+
+    assert journal.working_frame().loc[1, '전화번호'] == '010-9999-8888'
+    assert _sheet(member_workbook).loc[1, '전화번호'] == '010-3333-4444'
+    assert len(read_entries(journal_path(member_workbook))) == 1
+    _abandon(journal)
+
+def test_journal_replays_after_crash(member_workbook):
+    crashed = _open_journal(member_workbook)
+    crashed.record('회원번호', 2, {'전화번호': '010-9999-8888'})
+    crashed.record('회원번호', 4, {'이름': '최신규', '회원권': '일반'}, insert=True)
+    _abandon(crashed)
+
+    # 다음 실행: 워크북에는 없는 변경분이 저널에서 복구됨
+    restarted = _open_journal(member_workbook)
+    frame = restarted.working_frame()
+    assert frame.loc[frame['회원번호'] == 2, '전화번호'].tolist() == ['010-9999-8888']
+    assert frame['회원번호'].tolist() == [1, 2, 3, 4]
+    assert restarted.pending == 2
+
+    assert restarted.flush() == 2
+    saved = _sheet(member_workbook)
+    assert saved.loc[saved['회원번호'] == 2, '전화번호'].tolist() == ['010-9999-8888']
+    assert saved.loc[saved['회원번호'] == 4, '이름'].tolist() == ['최신규']
+    assert read_entries(journal_path(member_workbook)) == []
+
+def test_replay_is_idempotent_when_crash_follows_save(member_workbook):
+    journal = _open_journal(member_workbook)
+    journal.record('회원번호', 4, {'이름': '최신규'}, insert=True)
+    entries = read_entries(journal_path(member_workbook))
+    journal.flush()
+
+    # 워크북 저장 후 저널을 비우기 전에 죽은 경우: 같은 항목이 다시 적용돼도 행은 하나
+    with open(journal_path(member_workbook), 'w', encoding='utf-8') as f:
+        f.write(''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries))
+    frame = _open_journal(member_workbook).working_frame()
+    assert frame['회원번호'].tolist() == [1, 2, 3, 4]
+
+def test_truncated_journal_line_is_ignored(member_workbook):
+    journal = _open_journal(member_workbook)
+    journal.record('회원번호', 1, {'회원권': 'VIP'})
+    _abandon(journal)
+    with open(journal_path(member_workbook), 'a', encoding='utf-8') as f:
+        f.write('{"key_column": "회원번호", "key": 3, "chan')
+
+    frame = _open_journal(member_workbook).working_frame()
+    assert frame.loc[frame['회원번호'] == 1, '회원권'].tolist() == ['VIP']
+    assert frame.loc[frame['회원번호'] == 3, '회원권'].tolist() == ['VIP']
+
+def test_batch_inserts_append_once_and_extend_indexes(member_workbook, monkeypatch):
+    journal = _open_journal(member_workbook)
+    assert journal.lookup('이름', '김철수') == [0]
+    name_index = journal.indexes['이름']
+
+    concats = []
+    real_concat = pd.concat
+    monkeypatch.setattr(change_journal.pd, 'concat', lambda *args, **kwargs: concats.append(1) or real_concat(*args, **kwargs))
+    journal.record_batch([
+        ('회원번호', 4, {'이름': '최신규', '메모': '신규'}, True),
+        ('회원번호', 5, {'이름': '정가입'}, True),
+        ('회원번호', 6, {'이름': '한등록'}, True),
+    ])
+
+    # 새 행은 한 번에 덧붙이고, 이미 만든 인덱스는 버리지 않고 새 행만 더함
+    assert len(concats) == 1
+    assert journal.indexes['이름'] is name_index
+    assert journal.lookup('이름', '정가입') == [4]
+    assert journal.lookup('이름', '김철수') == [0]
+    frame = journal.working_frame()
+    assert frame['회원번호'].tolist() == [1, 2, 3, 4, 5, 6]
+    # 시트에 없던 열은 메모리 시트와 워크북 양쪽에 추가됨
+    assert frame.loc[3, '메모'] == '신규' and frame['메모'].isna().sum() == 5
+
+    journal.flush()
+    saved = _sheet(member_workbook)
+    assert saved['회원번호'].tolist() == [1, 2, 3, 4, 5, 6]
+    assert saved.loc[3, '메모'] == '신규'
+
+def test_insert_then_update_in_one_batch(member_workbook):
+    journal = _open_journal(member_workbook)
+    journal.record_batch([
+        ('회원번호', 4, {'이름': '최신규'}, True),
+        ('회원번호', 4, {'회원권': 'VIP'}, False),
+        ('회원번호', 4, {'이름': '최신규2'}, True),
+    ])
+    frame = journal.working_frame()
+    assert frame['회원번호'].tolist() == [1, 2, 3, 4]
+    assert frame.loc[3, ['이름', '회원권']].tolist() == ['최신규2', 'VIP']
+    _abandon(journal)
+
+    # 같은 저널을 다시 적용해도 행은 하나만 추가됨
+    replayed = _open_journal(member_workbook).working_frame()
+    assert replayed['회원번호'].tolist() == [1, 2, 3, 4]
+    assert replayed.loc[3, ['이름', '회원권']].tolist() == ['최신규2', 'VIP']
+
+def test_patcher_rewrites_only_changed_cells(member_workbook):
+    patcher = WorkbookPatcher(member_workbook, MEMBER_SHEET)
+    assert patcher.save([
+        {'key_column': '회원번호', 'key': 3, 'changes': {'전화번호': '010-0000-0000'}},
+        {'key_column': '이름', 'key': '김철수', 'changes': {'회원권': '프리미엄'}},
+        {'key_column': '회원번호', 'key': 4, 'changes': {'이름': '최신규', '메모': '신규'}, 'insert': True},
+    ])
+
+    workbook = openpyxl.load_workbook(member_workbook)
+    ws = workbook[MEMBER_SHEET]
+    assert [cell.value for cell in ws[4]] == [3, '박민수', '010-0000-0000', 'VIP', None]
+    assert ws['D2'].value == '프리미엄'
+    assert [ws.cell(row=5, column=column).value for column in (1, 2, 5)] == [4, '최신규', '신규']
+    assert ws['E1'].value == '메모'
+    # 다른 셀의 서식과 다른 시트는 그대로
+    assert ws['A1'].font.bold
+    assert workbook['메모']['A1'].value == '수정 금지'
+
+def test_patcher_reports_missing_rows(member_workbook):
+    patcher = WorkbookPatcher(member_workbook, MEMBER_SHEET)
+    before = open(member_workbook, 'rb').read()
+    assert not patcher.save([{'key_column': '회원번호', 'key': 99, 'changes': {'이름': '없음'}}])
+    assert open(member_workbook, 'rb').read() == before
+
+def test_patcher_reloads_after_external_change(member_workbook):
+    patcher = WorkbookPatcher(member_workbook, MEMBER_SHEET)
+    patcher.save([{'key_column': '회원번호', 'key': 1, 'changes': {'회원권': 'VIP'}}])
+
+    workbook = openpyxl.load_workbook(member_workbook)
+    workbook[MEMBER_SHEET]['B3'] = '이영희(수정)'
+    workbook.save(member_workbook)
+
+    patcher.save([{'key_column': '회원번호', 'key': 3, 'changes': {'회원권': '일반'}}])
+    saved = _sheet(member_workbook)
+    assert saved['이름'].tolist() == ['김철수', '이영희(수정)', '박민수']
+    assert saved['회원권'].tolist() == ['VIP', '프리미엄', '일반']
@@ -0,0 +1,34 @@
+"""
+채팅 컨텍스트 인코딩 테스트
+"""
+
+from context_encoder import encode_context, encode_note, estimate_tokens
+
+def _inventory(count):
+    return [
+        {'id': number, 'item_name': f'단백질 보충제 {number}호', 'current_stock': 1, 'min_stock_level': 10,
+         'status': '부족', 'unit_price': 35000, 'category': '보충제', 'supplier': '헬스유통'}
+        for number in range(1, count + 1)
+    ]
+
+def test_low_stock_note_is_trimmed_within_budget():
+    records = _inventory(3000)
+    low_stock = [record['item_name'] for record in records]
+    text, info = encode_context('재고관리', {'총품목': 3000}, records, [('부족 재고', low_stock)], budget=2000)
+
+    assert info['tokens'] <= 2000
+    assert estimate_tokens(text) <= 2000
+    note = text.split('\n')[1]
+    assert note.startswith('부족 재고: 단백질 보충제 1호, ')
+    assert note.endswith('건') and ' 외 ' in note
+    # 참고 줄이 길어도 표는 남은 예산으로 담김
+    assert info['rows'] > 0
+
+def test_short_note_is_kept_whole():
+    text, cost = encode_note('부족 재고', ['수건', '요가매트'], 100)
+    assert text == '부족 재고: 수건, 요가매트'
+    assert cost == estimate_tokens(text) + 1
+
+def test_note_without_room_keeps_only_count():
+    text, _ = encode_note('부족 재고', [f'품목{number}' for number in range(50)], 8)
+    assert text == '부족 재고: 50건'
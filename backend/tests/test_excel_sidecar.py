@@ -0,0 +1,52 @@
+"""
+Excel 시트 사이드카 테스트 (사이드카에서 읽은 시트가 첫 파싱과 같은지)
+"""
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+import excel_sidecar
+
+SHEET = '회원목록'
+
+@pytest.fixture
+def sidecar_dir(tmp_path, monkeypatch):
+    directory = tmp_path / 'sidecars'
+    monkeypatch.setattr(excel_sidecar, 'EXCEL_SIDECAR_DIR', str(directory))
+    monkeypatch.setattr(excel_sidecar, 'EXCEL_SIDECAR_ENABLED', True)
+    return directory
+
+@pytest.fixture
+def blank_cell_workbook(tmp_path):
+    """텍스트 열 중간중간이 빈 칸인 워크북"""
+    path = tmp_path / '회원관리_20250101.xlsx'
+    workbook = openpyxl.Workbook()
+    ws = workbook.active
+    ws.title = SHEET
+    ws.append(['회원번호', '이름', '주소', 'medical_notes', '월회비'])
+    ws.append([1, '김철수', '서울시 강남구', None, 120000])
+    ws.append([2, '이영희', None, '무릎 수술 이력', None])
+    ws.append([3, '박민수', None, None, 80000])
+    workbook.save(path)
+    return str(path)
+
+def test_sidecar_read_matches_first_parse(sidecar_dir, blank_cell_workbook, monkeypatch):
+    first = excel_sidecar.read_sheet(blank_cell_workbook, SHEET)
+    assert len(list(sidecar_dir.iterdir())) == 1
+
+    # 두 번째 읽기는 Excel 을 파싱하지 않고 사이드카에서
+    def fail(*args, **kwargs):
+        raise AssertionError('사이드카 대신 Excel 을 다시 파싱함')
+    monkeypatch.setattr(excel_sidecar.pd, 'read_excel', fail)
+    second = excel_sidecar.read_sheet(blank_cell_workbook, SHEET)
+
+    pd.testing.assert_frame_equal(first, second)
+    assert second.isna().equals(first.isna())
+    # 빈 칸이 None('None')이 아니라 첫 파싱과 같은 NaN('nan')
+    for column in ('주소', 'medical_notes'):
+        assert [str(value) for value in second[column]] == [str(value) for value in first[column]]
+    assert [str(value) for value in second['medical_notes']] == ['nan', '무릎 수술 이력', 'nan']
@@ -0,0 +1,44 @@
+"""
+파일 업로드 파일 이름 검증 테스트 (JSON 업로드 / 스트리밍 업로드)
+"""
+
+import base64
+import json
+
+import pytest
+
+from async_server import BufferedAPIHandler
+
+def _dispatch(path, body, content_type='application/json'):
+    head = (
+        f"POST {path} HTTP/1.1\r\nHost: test\r\nContent-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    ).encode('utf-8')
+    handler = BufferedAPIHandler(head + body, ('127.0.0.1', 0))
+    assert handler.parse()
+    response = handler.dispatch()
+    status_line, _, rest = response.partition(b'\r\n')
+    return int(status_line.split()[1]), json.loads(rest.split(b'\r\n\r\n', 1)[1])
+
+@pytest.mark.parametrize('filename, category', [
+    ('../../x.xlsx', 'members'),
+    ('sub/x.xlsx', 'members'),
+    ('.hidden.xlsx', 'members'),
+    ('payload.pkl', 'members'),
+    ('x.xlsx', '../..'),
+    ('x.xlsx', 'unknown'),
+])
+def test_json_upload_rejects_unsafe_names(filename, category):
+    body = json.dumps({
+        'filename': filename,
+        'category': category,
+        'content': base64.b64encode(b'PK\x03\x04').decode('ascii')
+    }).encode('utf-8')
+    status, data = _dispatch('/api/v1/files/upload', body)
+    assert status == 400
+    assert data['error'] == '유효하지 않은 파일 이름입니다'
+
+@pytest.mark.parametrize('encoded_name', ['..%2Fx.xlsx', 'payload.pkl', '.hidden.xlsx'])
+def test_stream_upload_rejects_unsafe_names(encoded_name):
+    status, data = _dispatch(f'/api/v1/files/upload/members/{encoded_name}', b'PK\x03\x04', 'application/octet-stream')
+    assert status == 400
@@ -0,0 +1,90 @@
+"""
+채팅 의도 분류 테스트 (분류 예시 + 처리량)
+"""
+
+import time
+
+import pytest
+
+from intent_router import (
+    ATTENDANCE, COUNT, GREETING, HELP, LIST, LOW_STOCK, ORDER, REGISTER, REVENUE, SALARY, SCHEDULE,
+    UNKNOWN, UPDATE_FIELD, VACATION, _route, route_intent
+)
+
+# 캐시 없이 분류만 했을 때 메시지 하나에 허용하는 평균 시간 (CI 머신 편차를 감안해 넉넉하게)
+MAX_MICROSECONDS_PER_MESSAGE = 200
+
+# 분류 예시 (에이전트, 메시지, 기대 의도, 기대 값, 표 요청 여부)
+LABELED_CORPUS = (
+    ('회원관리', '안녕하세요', GREETING, None, False),
+    ('회원관리', '회원 몇 명이야?', COUNT, None, False),
+    ('회원관리', '총 회원수 알려줘', COUNT, None, False),
+    ('회원관리', '회원 목록 보여줘', LIST, None, True),
+    ('회원관리', '회원 명단 좀', LIST, None, True),
+    ('회원관리', '이번 달 매출 얼마야', REVENUE, None, False),
+    ('회원관리', '신규 회원 등록하려고', REGISTER, None, False),
+    ('회원관리', '사용법 알려줘', HELP, None, False),
+    ('회원관리', '김철수 회원 정보', UNKNOWN, None, False),
+    ('회원관리', '전체 회원 현황', UNKNOWN, None, True),
+    ('회원관리', '김철수 월회비 15만원으로 수정해줘', UPDATE_FIELD, {'target': '김철수', 'field': '월회비', 'value': 150000}, False),
+    ('회원관리', '이영희님 월회비를 90000원으로 변경', UPDATE_FIELD, {'target': '이영희님', 'field': '월회비', 'value': 90000}, False),
+    ('회원관리', '박민수 전화번호 010-9999-8888로 바꿔줘', UPDATE_FIELD, {'target': '박민수', 'field': '전화번호', 'value': '010-9999-8888'}, False),
+    ('회원관리', '최수진 멤버십 vip로 변경해줘', UPDATE_FIELD, {'target': '최수진', 'field': '멤버십', 'value': 'vip'}, False),
+    ('회원관리', '최수진 멤버십 VIP로 변경해줘', UPDATE_FIELD, {'target': '최수진', 'field': '멤버십', 'value': 'VIP'}, False),
+    ('회원관리', '김철수 주소 세종대로로 변경', UPDATE_FIELD, {'target': '김철수', 'field': '주소', 'value': '세종대로'}, False),
+    # 값 자체가 로로 끝나면 조사로 보고 떼지 않음, 열 이름 뒤 조사(을/를)는 값이 아님
+    ('회원관리', '김철수 주소 테헤란로 변경해줘', UPDATE_FIELD, {'target': '김철수', 'field': '주소', 'value': '테헤란로'}, False),
+    ('회원관리', '김철수 주소 세종대로 변경', UPDATE_FIELD, {'target': '김철수', 'field': '주소', 'value': '세종대로'}, False),
+    ('회원관리', '김철수 직업 프로 변경', UPDATE_FIELD, {'target': '김철수', 'field': '직업', 'value': '프로'}, False),
+    ('회원관리', '김철수 직업을 트레이너로 바꿔줘', UPDATE_FIELD, {'target': '김철수', 'field': '직업', 'value': '트레이너'}, False),
+    ('회원관리', '김철수 전화번호를 010-9999-8888로 수정해줘', UPDATE_FIELD, {'target': '김철수', 'field': '전화번호', 'value': '010-9999-8888'}, False),
+    ('회원관리', '김철수 주소를 서울시 강남구 테헤란로 123으로 변경해줘', UPDATE_FIELD, {'target': '김철수', 'field': '주소', 'value': '서울시 강남구 테헤란로 123'}, False),
+    ('직원관리', '하이', GREETING, None, False),
+    ('직원관리', '직원 몇 명 있어', COUNT, None, False),
+    ('직원관리', '직원 목록', LIST, None, True),
+    ('직원관리', '직원 급여 알려줘', SALARY, None, False),
+    ('직원관리', '이번 달 인건비', SALARY, None, False),
+    ('직원관리', '직원 근무 스케줄', SCHEDULE, None, False),
+    ('직원관리', '직원 기능 뭐 있어', HELP, None, False),
+    ('직원관리', '직원 보여줘', LIST, None, False),
+    ('직원관리', '김트레이너 월급 400만원으로 수정', UPDATE_FIELD, {'target': '김트레이너', 'field': '월급여', 'value': 4000000}, False),
+    ('직원관리', '이매니저 부서 운영팀으로 변경해줘', UPDATE_FIELD, {'target': '이매니저', 'field': '부서', 'value': '운영팀'}, False),
+    ('인사관리', '급여 명세 보여줘', SALARY, None, False),
+    ('인사관리', '오늘 출근 기록', ATTENDANCE, None, False),
+    ('인사관리', '휴가 신청 현황', VACATION, None, True),
+    ('인사관리', '평가 점수 알려줘', UNKNOWN, None, False),
+    ('재고관리', '안녕', GREETING, None, False),
+    ('재고관리', '재고 현황 알려줘', COUNT, None, True),
+    ('재고관리', '재고 몇 개 남았어', COUNT, None, False),
+    ('재고관리', '부족 재고 알려줘', LOW_STOCK, None, False),
+    ('재고관리', '재고 알림 있어?', LOW_STOCK, None, False),
+    ('재고관리', '품목 리스트', LIST, None, True),
+    ('재고관리', '발주 필요한 거', ORDER, None, False),
+    ('재고관리', '도움말', HELP, None, False),
+    ('재고관리', '프로틴 파우더 재고 80개로 수정해줘', UPDATE_FIELD, {'target': '프로틴 파우더', 'field': '현재재고', 'value': 80}, False),
+    ('재고관리', '운동타올 수량 120으로 조정', UPDATE_FIELD, {'target': '운동타올', 'field': '현재재고', 'value': 120}, False),
+    ('재고관리', '물통 단가 15000원으로 변경', UPDATE_FIELD, {'target': '물통', 'field': '단가', 'value': 15000}, False),
+    ('재고관리', '전체 품목 보여줘', LIST, None, True)
+)
+
+
+@pytest.mark.parametrize('agent_type, message, expected, expected_slots, expected_table', LABELED_CORPUS)
+def test_labeled_corpus(agent_type, message, expected, expected_slots, expected_table):
+    intent = _route(agent_type, message)
+    assert intent.name == expected
+    assert intent.table == expected_table
+    if expected_slots is not None:
+        assert intent.slots == expected_slots
+
+def test_route_intent_is_memoized():
+    assert route_intent('회원관리', '회원 목록 보여줘') is route_intent('회원관리', '회원 목록 보여줘')
+
+def test_routing_throughput():
+    messages = [(agent_type, message) for agent_type, message, _, _, _ in LABELED_CORPUS]
+    rounds = 200
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for agent_type, message in messages:
+            _route(agent_type, message)
+    elapsed = time.perf_counter() - started
+    assert elapsed / (rounds * len(messages)) * 1e6 < MAX_MICROSECONDS_PER_MESSAGE
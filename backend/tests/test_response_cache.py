@@ -0,0 +1,60 @@
+"""
+채팅 응답 캐시 테스트 (질문마다 다른 검색 컨텍스트 + 같은 데이터 버전)
+"""
+
+from context_encoder import encode_context
+from response_cache import ResponseCache, normalize_message
+from retrieval_index import RecordIndex
+
+RECORDS = [
+    {'id': 1, 'name': '김철수', 'membership_type': '프리미엄', 'phone': '010-1111-2222'},
+    {'id': 2, 'name': '이영희', 'membership_type': '일반', 'phone': '010-3333-4444'},
+    {'id': 3, 'name': '박민수', 'membership_type': 'VIP', 'phone': '010-5555-6666'},
+]
+VERSION = ('회원관리_20250101.xlsx', 1, 100, None)
+
+def _context(index, question):
+    ranked = index.rank(RECORDS, question, 1)
+    return encode_context('회원관리', {'총회원수': len(RECORDS)}, ranked)[0]
+
+def test_other_questions_do_not_invalidate_answers():
+    cache = ResponseCache(16, 60)
+    index = RecordIndex(id_field='id')
+    question_a, question_b = '김철수 회원 정보', '박민수 전화번호'
+    # 질문마다 관련 행이 앞에 오므로 프롬프트 컨텍스트는 달라짐
+    assert _context(index, question_a) != _context(index, question_b)
+
+    for question in (question_a, question_b):
+        key = cache.key('회원관리', question, VERSION)
+        assert cache.get(key) is None
+        cache.put(key, f'{question} 답변')
+
+    assert cache.get(cache.key('회원관리', question_a + '?', VERSION)) == '김철수 회원 정보 답변'
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['invalidations'], stats['entries']) == (1, 2, 0, 2)
+
+def test_new_data_version_drops_agent_answers():
+    cache = ResponseCache(16, 60)
+    cache.put(cache.key('회원관리', '회원 수', VERSION), '3명')
+    cache.put(cache.key('재고관리', '부족 재고', VERSION), '없음')
+
+    edited = VERSION[:3] + ((120, 5),)
+    assert cache.get(cache.key('회원관리', '회원 수', edited)) is None
+    assert cache.stats()['invalidations'] == 1
+    assert cache.get(cache.key('재고관리', '부족 재고', VERSION)) == '없음'
+
+def test_unknown_version_and_bypass_are_not_cached():
+    cache = ResponseCache(16, 60)
+    assert cache.key('회원관리', '회원 수', None) is None
+    cache.put(None, '저장 안 됨')
+    assert cache.get(None) is None
+    assert cache.stats()['entries'] == 0
+
+    key = cache.key('회원관리', '회원 수', VERSION)
+    cache.put(key, '3명')
+    assert cache.get(key, bypass=True) is None
+    assert cache.get(key) == '3명'
+
+def test_normalize_message():
+    assert normalize_message('  김철수   회원 정보?? ') == normalize_message('김철수 회원 정보')
+    assert normalize_message('ＶＩＰ 회원') == 'vip 회원'
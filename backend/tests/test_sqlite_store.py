@@ -0,0 +1,96 @@
+"""
+SQLite 저장소 테스트 (가져오기, 미반영 변경 재적용, 워크북 동기화 후 재가져오기)
+"""
+
+import functools
+import os
+import threading
+
+import openpyxl
+import pandas as pd
+import pytest
+
+import change_journal
+from change_journal import WorkbookPatcher
+from conftest import MEMBER_SHEET
+from sqlite_store import SqliteJournal, SqliteStore
+
+@pytest.fixture
+def store(tmp_path):
+    return SqliteStore(str(tmp_path / 'gym.sqlite3'), {'members': ('회원번호', '이름')})
+
+def _reader(excel_file):
+    return functools.partial(pd.read_excel, excel_file, sheet_name=MEMBER_SHEET)
+
+def _signature(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _edit_externally(excel_file, cell, value):
+    workbook = openpyxl.load_workbook(excel_file)
+    workbook[MEMBER_SHEET][cell] = value
+    workbook.save(excel_file)
+
+def _phone(frame, member_id):
+    return frame.loc[frame['회원번호'] == member_id, '전화번호'].tolist()
+
+def test_import_and_read(store, member_workbook):
+    frame = store.read_frame('members', member_workbook, _reader(member_workbook))
+    assert frame['이름'].tolist() == ['김철수', '이영희', '박민수']
+    assert store.is_current('members', member_workbook)
+    assert store.version('members') == 1
+
+def test_pending_entries_survive_reimport(store, member_workbook):
+    store.read_frame('members', member_workbook, _reader(member_workbook))
+    store.apply_entries('members', [{'key_column': '회원번호', 'key': 2, 'changes': {'전화번호': '010-9999-8888'}}])
+    assert store.version('members') == 2
+
+    # 워크북에 반영하기 전에 밖에서 워크북이 바뀌면 다시 가져오면서 미반영 변경을 재적용
+    _edit_externally(member_workbook, 'B4', '박민수(수정)')
+    frame = store.read_frame('members', member_workbook, _reader(member_workbook))
+    assert _phone(frame, 2) == ['010-9999-8888']
+    assert frame['이름'].tolist()[2] == '박민수(수정)'
+    assert store.has_pending('members')
+
+def test_mark_synced_keeps_import_when_saved_over_own_workbook(store, member_workbook):
+    store.read_frame('members', member_workbook, _reader(member_workbook))
+    entries = [{'key_column': '회원번호', 'key': 2, 'changes': {'전화번호': '010-9999-8888'}}]
+    store.apply_entries('members', entries)
+
+    saved_over = _signature(member_workbook)
+    assert WorkbookPatcher(member_workbook, MEMBER_SHEET).save(entries)
+    store.mark_synced('members', member_workbook, saved_over)
+
+    assert not store.has_pending('members')
+    assert store.is_current('members', member_workbook)
+    version = store.version('members')
+    store.read_frame('members', member_workbook, _reader(member_workbook))
+    assert store.version('members') == version  # 다시 가져오지 않음
+
+def test_mark_synced_reimports_when_workbook_changed_underneath(store, member_workbook):
+    store.read_frame('members', member_workbook, _reader(member_workbook))
+    entries = [{'key_column': '회원번호', 'key': 2, 'changes': {'전화번호': '010-9999-8888'}}]
+    store.apply_entries('members', entries)
+
+    # 저장 직전에 밖에서 바뀐 워크북 위에 저장한 경우
+    _edit_externally(member_workbook, 'B2', '김철수(수정)')
+    saved_over = _signature(member_workbook)
+    assert WorkbookPatcher(member_workbook, MEMBER_SHEET).save(entries)
+    store.mark_synced('members', member_workbook, saved_over)
+
+    assert not store.is_current('members', member_workbook)
+    frame = store.read_frame('members', member_workbook, _reader(member_workbook))
+    assert frame['이름'].tolist()[0] == '김철수(수정)'
+    assert _phone(frame, 2) == ['010-9999-8888']
+    assert store.is_current('members', member_workbook)
+
+def test_sqlite_journal_flushes_cells_and_syncs(store, member_workbook, monkeypatch):
+    monkeypatch.setattr(change_journal, 'CHANGE_JOURNAL_FLUSH_INTERVAL', 3600)
+    journal = SqliteJournal('members', member_workbook, MEMBER_SHEET, threading.RLock(), store, _reader(member_workbook))
+    journal.record('회원번호', 3, {'회원권': '일반'})
+    assert store.has_pending('members')
+
+    assert journal.flush() == 1
+    assert not store.has_pending('members')
+    assert store.is_current('members', member_workbook)
+    assert pd.read_excel(member_workbook, sheet_name=MEMBER_SHEET)['회원권'].tolist() == ['일반', '프리미엄', '일반']
@@ -68,9 +68,10 @@ const TableComponent: React.FC<{ tableData: TableData }> = ({ tableData }) => {
 };
 
 const ChatWindow: React.FC<ChatWindowProps> = ({ agentType, agentName }) => {
-  const { messages, addMessage, initializeAgent, clearMessages } = useChatStore();
+  const { messages, addMessage, updateMessage, initializeAgent, clearMessages } = useChatStore();
   const [input, setInput] = useState('');
   const [isLoading, setIsLoading] = useState(false);
+  const [isStreaming, setIsStreaming] = useState(false);
   const messagesEndRef = useRef<HTMLDivElement>(null);
   
   const currentAgentType = agentType as AgentType;
@@ -106,22 +107,43 @@ const ChatWindow: React.FC<ChatWindowProps> = ({ agentType, agentName }) => {
     setInput('');
     setIsLoading(true);
 
+    const aiMessageId = (Date.now() + 1).toString();
+    let streamedText = '';
+
     try {
-      const response = await chatApi.sendMessage(agentType, {
+      // 응답 조각이 도착하는 대로 AI 메시지에 이어 붙임
+      const response = await chatApi.streamMessage(agentType, {
         message: input,
         agent_type: agentType
+      }, (delta) => {
+        if (!streamedText) {
+          setIsStreaming(true);
+          addMessage(currentAgentType, {
+            id: aiMessageId,
+            text: '',
+            sender: 'ai',
+            timestamp: new Date()
+          });
+        }
+        streamedText += delta;
+        updateMessage(currentAgentType, aiMessageId, { text: streamedText });
       });
 
-      const aiMessage: Message = {
-        id: (Date.now() + 1).toString(),
-        text: response.message,
-        sender: 'ai',
-        timestamp: new Date(),
-        tableData: response.table_data
-      };
-
-      // AI 응답 메시지 추가
-      addMessage(currentAgentType, aiMessage);
+      // 완료 이벤트의 전체 응답과 표 데이터로 마무리
+      if (streamedText) {
+        updateMessage(currentAgentType, aiMessageId, {
+          text: response.message,
+          tableData: response.table_data
+        });
+      } else {
+        addMessage(currentAgentType, {
+          id: aiMessageId,
+          text: response.message,
+          sender: 'ai',
+          timestamp: new Date(),
+          tableData: response.table_data
+        });
+      }
     } catch (error: unknown) {
       
       const errorText = error instanceof Error && 'response' in error
@@ -130,17 +152,23 @@ const ChatWindow: React.FC<ChatWindowProps> = ({ agentType, agentName }) => {
         ? error.message
         : '죄송합니다. 일시적인 오류가 발생했습니다. 다시 시도해 주세요.';
       
-      const errorMessage: Message = {
-        id: (Date.now() + 1).toString(),
-        text: errorText,
-        sender: 'ai',
-        timestamp: new Date()
-      };
+      if (streamedText) {
+        // 받은 부분은 남기고 오류 안내를 덧붙임
+        updateMessage(currentAgentType, aiMessageId, { text: `${streamedText}\n\n⚠️ ${errorText}` });
+      } else {
+        const errorMessage: Message = {
+          id: aiMessageId,
+          text: errorText,
+          sender: 'ai',
+          timestamp: new Date()
+        };
 
-      // 오류 메시지 추가
-      addMessage(currentAgentType, errorMessage);
+        // 오류 메시지 추가
+        addMessage(currentAgentType, errorMessage);
+      }
     } finally {
       setIsLoading(false);
+      setIsStreaming(false);
     }
   };
 
@@ -312,8 +340,8 @@ const ChatWindow: React.FC<ChatWindowProps> = ({ agentType, agentName }) => {
           </div>
         ))}
         
-        {/* 로딩 표시 */}
-        {isLoading && (
+        {/* 로딩 표시 (응답 조각이 오기 시작하면 메시지 자체가 보이므로 숨김) */}
+        {isLoading && !isStreaming && (
           <div className="flex justify-start animate-slide-up">
             <div className="message-ai max-w-[70%]">
               <div className="chat-typing-indicator">
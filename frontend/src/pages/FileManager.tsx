@@ -1,7 +1,8 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { Link } from 'react-router-dom';
 import { Card, CardHeader, CardBody, Button, Badge, Modal, ModalHeader, ModalBody } from '../components/ui';
 import api from '../services/api';
+import { fileManagerApi } from '../services/fileManager';
 
 interface FileData {
   id: string;
@@ -35,6 +36,9 @@ const FileManager: React.FC = () => {
   const [loading, setLoading] = useState(false);
   const [viewMode, setViewMode] = useState<'grid' | 'table'>('grid');
   const [selectedSheet, setSelectedSheet] = useState<string>('');
+  const [uploadTarget, setUploadTarget] = useState<FileData | null>(null);
+  const [uploading, setUploading] = useState(false);
+  const uploadInputRef = useRef<HTMLInputElement>(null);
   
   // Undo/Redo 히스토리 관리
   const [history, setHistory] = useState<ExcelData[]>([]);
@@ -485,6 +489,35 @@ const FileManager: React.FC = () => {
     }
   };
 
+  // 파일 업로드 (선택한 카테고리의 워크북을 교체)
+  const handleUploadClick = (file: FileData) => {
+    setUploadTarget(file);
+    uploadInputRef.current?.click();
+  };
+
+  const handleUploadChange = async (e: React.ChangeEvent<HTMLInputElement>) => {
+    const selected = e.target.files?.[0];
+    e.target.value = '';
+    if (!selected || !uploadTarget) return;
+    if (!selected.name.endsWith('.xlsx')) {
+      alert('.xlsx 파일만 업로드할 수 있습니다.');
+      return;
+    }
+
+    setUploading(true);
+    try {
+      // base64 변환 없이 파일 내용을 그대로 전송 (큰 파일도 메모리에 두 번 올리지 않음)
+      const result = await fileManagerApi.uploadFileStream(selected, uploadTarget.id);
+      alert(result.message);
+    } catch (error) {
+      console.error('업로드 실패:', error);
+      alert('업로드에 실패했습니다.');
+    } finally {
+      setUploading(false);
+      setUploadTarget(null);
+    }
+  };
+
   const getStatusColor = (status: string) => {
     switch (status) {
       case 'active': return 'success';
@@ -498,6 +531,14 @@ const FileManager: React.FC = () => {
     <div className="min-h-screen bg-gradient-to-br from-gray-50 via-white to-blue-50">
       <div className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-8">
         
+        <input
+          ref={uploadInputRef}
+          type="file"
+          accept=".xlsx"
+          className="hidden"
+          onChange={handleUploadChange}
+        />
+
         {/* 상단 헤더 */}
         <div className="mb-8">
           <div className="flex items-center justify-between mb-6">
@@ -622,6 +663,13 @@ const FileManager: React.FC = () => {
                       >
                         📥
                       </Button>
+                      <Button
+                        onClick={() => handleUploadClick(file)}
+                        className="btn-secondary"
+                        disabled={uploading}
+                      >
+                        📤
+                      </Button>
                       <Link to={`/chat/${file.agent}`}>
                         <Button className="btn-gym">
                           🤖
@@ -696,6 +744,13 @@ const FileManager: React.FC = () => {
                             >
                               📥
                             </Button>
+                            <Button
+                              onClick={() => handleUploadClick(file)}
+                              className="btn-ghost btn-sm"
+                              disabled={uploading}
+                            >
+                              📤
+                            </Button>
                             <Link to={`/chat/${file.agent}`}>
                               <Button className="btn-ghost btn-sm">
                                 🤖
@@ -78,6 +78,68 @@ export const chatApi = {
     const response = await api.post(`/${endpoint}/chat`, request);
     return response.data;
   },
+
+  // 스트리밍 채팅 (SSE): 응답 조각마다 onDelta 호출, 마지막에 전체 응답(table_data 포함) 반환
+  streamMessage: async (
+    agentType: string,
+    request: ChatRequest,
+    onDelta: (delta: string) => void
+  ): Promise<ChatResponse> => {
+    const agentTypeMap: { [key: string]: string } = {
+      'member': 'members',
+      'staff': 'staff',
+      'hr': 'hr',
+      'inventory': 'inventory'
+    };
+
+    const endpoint = agentTypeMap[agentType] || agentType;
+    const token = localStorage.getItem('access_token');
+    // EventSource 는 POST 를 보낼 수 없으므로 fetch 로 응답 본문을 직접 읽음
+    const response = await fetch(`${getApiBaseUrl()}/${endpoint}/chat/stream`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        ...(token ? { Authorization: `Bearer ${token}` } : {}),
+      },
+      body: JSON.stringify(request),
+    });
+    if (!response.ok || !response.body) {
+      throw new Error(`채팅 스트리밍 요청 실패 (${response.status})`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      // 이벤트는 빈 줄로 구분 ("event: ...\ndata: {...}\n\n")
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) >= 0) {
+        const block = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        const event = block.match(/^event: (.*)$/m)?.[1];
+        // 깨진 데이터 줄(프록시가 자른 경우 등)은 그 이벤트만 건너뜀
+        let data: any;
+        try {
+          data = JSON.parse(block.match(/^data: (.*)$/m)?.[1] || '{}');
+        } catch {
+          console.warn('채팅 스트리밍 이벤트 파싱 실패:', block);
+          continue;
+        }
+        if (event === 'token') {
+          onDelta(data.delta);
+        } else if (event === 'done') {
+          return data as ChatResponse;
+        } else if (event === 'error') {
+          throw new Error(data.details || data.error);
+        }
+      }
+    }
+    throw new Error('채팅 스트리밍 응답이 완료되지 않았습니다');
+  },
 };
 
 // 회원 관리 API
@@ -17,23 +17,14 @@ export interface RecentActivity {
 export const dashboardApi = {
   getStats: async (): Promise<DashboardStats> => {
     try {
-      // 실제 API 호출 (Excel 데이터 기반)
-      const [members, staff, inventory] = await Promise.all([
-        api.get('/members/').catch(() => {
-          return { data: { members: [], summary: {} } };
-        }),
-        api.get('/staff/').catch(() => {
-          return { data: { staff: [], summary: {} } };
-        }),
-        api.get('/inventory/low-stock').catch(() => {
-          return { data: { low_stock_items: [] } };
-        })
-      ]);
+      // 요약 숫자만 받음 (전체 회원/직원/재고 목록을 내려받지 않음)
+      const response = await api.get('/dashboard/summary');
+      const summary = response.data?.summary || {};
+      const stats = response.data?.stats || {};
 
-      // Excel 데이터 구조에 맞게 수정
-      const totalMembers = members.data?.members?.length || members.data?.summary?.총회원수 || 0;
-      const activeStaff = staff.data?.staff?.filter((s: { status?: string }) => s.status === 'active' || s.status === '활성')?.length || staff.data?.summary?.활성직원 || 0;
-      const lowStockItems = inventory.data?.low_stock_items?.length || inventory.data?.alert_count || 0;
+      const totalMembers = summary.총회원수 || 0;
+      const activeStaff = stats.staff?.활성직원 || 0;
+      const lowStockItems = summary.부족재고 || 0;
 
       return {
         totalMembers,
@@ -15,10 +15,24 @@ export interface FilePreview {
     data: string[][];
     total_rows: number;
     total_cols: number;
+    row_offset?: number;
+    row_limit?: number;
+    col_offset?: number;
+    col_limit?: number;
+    has_more_rows?: boolean;
+    has_more_cols?: boolean;
   }>;
   sheet_names: string[];
 }
 
+export interface FilePreviewOptions {
+  sheet?: string;
+  row_offset?: number;
+  row_limit?: number;
+  col_offset?: number;
+  col_limit?: number;
+}
+
 export interface FileUploadData {
   filename: string;
   category: string;
@@ -59,11 +73,11 @@ export const fileManagerApi = {
     return response.blob();
   },
 
-  // 파일 미리보기
-  async previewFile(filePath: string): Promise<FilePreview> {
+  // 파일 미리보기 (sheet/row_offset/row_limit 등으로 페이지 단위 조회)
+  async previewFile(filePath: string, options?: FilePreviewOptions): Promise<FilePreview> {
     // 파일 경로 인코딩
     const encodedPath = encodeURIComponent(filePath);
-    const response = await api.get(`/files/preview/${encodedPath}`);
+    const response = await api.get(`/files/preview/${encodedPath}`, { params: options });
     return response.data;
   },
 
@@ -73,6 +87,15 @@ export const fileManagerApi = {
     return response.data;
   },
 
+  // 파일 업로드 (base64 변환 없이 파일 내용을 그대로 전송)
+  async uploadFileStream(file: File, category: string): Promise<{ success: boolean; message: string }> {
+    const encodedName = encodeURIComponent(file.name);
+    const response = await api.post(`/files/upload/${category}/${encodedName}`, file, {
+      headers: { 'Content-Type': 'application/octet-stream' },
+    });
+    return response.data;
+  },
+
   // 파일 저장 (수정된 데이터)
   async saveFile(filePath: string, data: FileSaveData): Promise<{ success: boolean; message: string }> {
     const encodedPath = encodeURIComponent(filePath);
@@ -17,6 +17,7 @@ interface ChatState {
   
   // Actions
   addMessage: (agentType: AgentType, message: Message) => void;
+  updateMessage: (agentType: AgentType, messageId: string, changes: Partial<Message>) => void;
   clearMessages: (agentType: AgentType) => void;
   initializeAgent: (agentType: AgentType, agentName: string) => void;
 }
@@ -46,6 +47,18 @@ export const useChatStore = create<ChatState>((set, get) => ({
     }));
   },
 
+  // 스트리밍 중인 응답처럼 이미 추가된 메시지 내용 갱신
+  updateMessage: (agentType: AgentType, messageId: string, changes: Partial<Message>) => {
+    set((state) => ({
+      messages: {
+        ...state.messages,
+        [agentType]: state.messages[agentType].map((message) =>
+          message.id === messageId ? { ...message, ...changes } : message
+        )
+      }
+    }));
+  },
+
   clearMessages: (agentType: AgentType) => {
     set((state) => ({
       messages: {